@@ -8,10 +8,17 @@ Scrape job listings from any careers page using:
 
 __version__ = "0.1.0"
 
-from .processor import enhance_job_output, process_job, process_jobs
+from .batch_enrichment import iter_batch_enrichment
+from .job_details import fetch_job_details
+from .job_store import JobStore
+from .pipeline import run_careers_pipeline
+from .processor import enhance_job_output, enhance_jobs_batch, process_job, process_jobs
+from .scrape_result import ScrapeResult
 from .scraper import (
     discover_careers_url,
     extract_jobs_from_markdown,
+    iter_careers_page,
+    iter_jobs_from_markdown,
     scrape_careers_page,
     scrape_with_firecrawl,
 )
@@ -19,11 +26,19 @@ from .utils import create_slug
 
 __all__ = [
     "scrape_careers_page",
+    "iter_careers_page",
     "scrape_with_firecrawl",
     "extract_jobs_from_markdown",
+    "iter_jobs_from_markdown",
     "discover_careers_url",
+    "ScrapeResult",
     "process_job",
     "process_jobs",
+    "fetch_job_details",
+    "JobStore",
+    "run_careers_pipeline",
     "enhance_job_output",
+    "enhance_jobs_batch",
+    "iter_batch_enrichment",
     "create_slug",
 ]
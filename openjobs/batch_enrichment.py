@@ -0,0 +1,375 @@
+"""
+OpenJobs Batch Enrichment - Offline bulk enrichment with the Gemini Batch API
+
+Interactive enrichment is bounded by the 60 requests/minute rate limiter, so
+a nightly backfill of hundreds of thousands of jobs takes days. Batch mode
+writes the classification and enhancement requests of every uncached job to
+a JSONL file, uploads it, submits it as one Gemini batch job, polls until the
+batch finishes and streams the results file back through process_job.
+Progress is kept in a JSON state file: running again with the same state
+path and jobs resumes polling or downloading instead of resubmitting.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from .enrichment_cache import EnrichmentCache, default_cache, enrichment_key
+from .gemini_client import parse_json
+from .http_utils import fetch_json_with_retry, post_json_with_retry
+from .key_pool import gemini_keys
+from .logger import logger
+from .processor import (
+    CLASSIFY_INSTRUCTIONS,
+    ENHANCE_INSTRUCTIONS,
+    MAX_TOKENS,
+    MODEL_NAME,
+    TEMPERATURE,
+    _classify_text,
+    _enhance_fallback,
+    _enhance_field_names,
+    _enhance_fields,
+    _enhance_instructions,
+    _enhance_schema,
+    _enrichment_plan,
+    _posting_text,
+    _requested_fields,
+    _validate_classification,
+    _validate_enhanced,
+    process_job,
+)
+
+# Root of the Gemini API (point at a local stub in tests)
+GEMINI_API_ROOT = os.getenv("OPENJOBS_GEMINI_API_ROOT", "https://generativelanguage.googleapis.com")
+
+# Seconds between batch status checks
+BATCH_POLL_INTERVAL = float(os.getenv("OPENJOBS_BATCH_POLL_INTERVAL", "60"))
+
+STATE_SUCCEEDED = "BATCH_STATE_SUCCEEDED"
+FAILED_STATES = {"BATCH_STATE_FAILED", "BATCH_STATE_CANCELLED", "BATCH_STATE_EXPIRED"}
+
+_CLASSIFY = "classify"
+_ENHANCE = "enhance"
+
+
+@dataclass
+class BatchState:
+    """Progress of one batch enrichment run, persisted between runs."""
+
+    jobs_hash: str
+    input_file: str = ""
+    batch_name: str = ""
+    state: str = ""
+    results_path: str = ""
+
+    @classmethod
+    def load(cls, path: str) -> Optional["BatchState"]:
+        """Read the state file, or None if there is none."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(**json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Could not read batch state from {path}: {e}")
+            return None
+
+    def save(self, path: str) -> None:
+        """Write the state file atomically."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f)
+        os.replace(tmp_path, path)
+
+
+def _jobs_hash(jobs: List[Dict]) -> str:
+    identity = [(job.get("job_url", ""), job.get("title", ""), job.get("description", "")) for job in jobs]
+    return hashlib.sha1(json.dumps(identity).encode("utf-8")).hexdigest()
+
+
+def _request_line(key: str, prefix: str, text: str, schema: Optional[Dict] = None) -> str:
+    config: Dict[str, Any] = {"maxOutputTokens": MAX_TOKENS, "temperature": TEMPERATURE}
+    if schema:
+        config["responseMimeType"] = "application/json"
+        config["responseSchema"] = schema
+    request = {
+        "contents": [{"role": "user", "parts": [{"text": f"{prefix}\n\n{text}"}]}],
+        "generationConfig": config,
+    }
+    return json.dumps({"key": key, "request": request})
+
+
+def write_requests(
+    jobs: List[Dict],
+    path: str,
+    fields: Optional[Iterable[str]] = None,
+    cache: Optional[EnrichmentCache] = None
+) -> Dict[int, Tuple[str, ...]]:
+    """
+    Write the Gemini requests of jobs that are not cached to a JSONL file.
+
+    Request keys are "<job index>:classify" and "<job index>:enhance".
+
+    Args:
+        jobs: Raw job dicts (as for process_jobs)
+        path: JSONL file to write
+        fields: Output fields to enrich (default: all)
+        cache: Enrichment cache (default: module cache)
+
+    Returns:
+        Job index -> kinds of request written for it
+    """
+    cache = default_cache if cache is None else cache
+    wanted = None if fields is None else _requested_fields(fields)
+    pending: Dict[int, Tuple[str, ...]] = {}
+    with open(path, "w", encoding="utf-8") as f:
+        for index, job in enumerate(jobs):
+            title, description = job.get("title", ""), job.get("description", "")
+            if not title:
+                continue
+            plan = _enrichment_plan(title, job.get("location"), description, wanted)
+            if not (plan.classify or plan.enhance):
+                continue
+            if enrichment_key(job.get("job_url", ""), title, description, plan.taxonomy_version) in cache:
+                continue
+
+            kinds = []
+            if plan.classify:
+                f.write(_request_line(f"{index}:{_CLASSIFY}", CLASSIFY_INSTRUCTIONS, _classify_text(title)) + "\n")
+                kinds.append(_CLASSIFY)
+            if plan.enhance:
+                enhance_fields = _enhance_fields(plan.enhance, wanted)
+                if enhance_fields is None:
+                    prefix, schema = ENHANCE_INSTRUCTIONS, None
+                else:
+                    prefix, schema = _enhance_instructions(enhance_fields), _enhance_schema(enhance_fields)
+                f.write(_request_line(f"{index}:{_ENHANCE}", prefix, _posting_text(title, description, ""), schema) + "\n")
+                kinds.append(_ENHANCE)
+            pending[index] = tuple(kinds)
+    return pending
+
+
+def _upload(path: str, api_key: str) -> str:
+    """Upload a JSONL file through the resumable Files API; returns the file name."""
+    size = os.path.getsize(path)
+    start = requests.post(
+        f"{GEMINI_API_ROOT}/upload/v1beta/files?key={api_key}",
+        headers={
+            "X-Goog-Upload-Protocol": "resumable",
+            "X-Goog-Upload-Command": "start",
+            "X-Goog-Upload-Header-Content-Length": str(size),
+            "X-Goog-Upload-Header-Content-Type": "application/jsonl",
+        },
+        json={"file": {"display_name": os.path.basename(path)}},
+        timeout=60
+    )
+    start.raise_for_status()
+    with open(path, "rb") as f:
+        response = requests.post(
+            start.headers["X-Goog-Upload-URL"],
+            headers={
+                "Content-Length": str(size),
+                "X-Goog-Upload-Offset": "0",
+                "X-Goog-Upload-Command": "upload, finalize",
+            },
+            data=f,
+            timeout=600
+        )
+    response.raise_for_status()
+    return response.json()["file"]["name"]
+
+
+def _submit(input_file: str, api_key: str, display_name: str) -> str:
+    """Create a batch job for an uploaded requests file; returns the batch name."""
+    result = post_json_with_retry(
+        f"{GEMINI_API_ROOT}/v1beta/models/{MODEL_NAME}:batchGenerateContent?key={api_key}",
+        json_body={"batch": {"display_name": display_name, "input_config": {"file_name": input_file}}},
+        headers={"Content-Type": "application/json"}
+    )
+    name = result.get("name")
+    if not name:
+        raise RuntimeError(f"Gemini did not accept the batch for {input_file}: {result}")
+    return name
+
+
+def _batch_status(batch_name: str, api_key: str) -> Tuple[str, str]:
+    """Return (state, responses file name) of a batch job."""
+    batch = fetch_json_with_retry(f"{GEMINI_API_ROOT}/v1beta/{batch_name}?key={api_key}")
+    metadata = batch.get("metadata") or {}
+    output = batch.get("response") or metadata.get("output") or {}
+    return metadata.get("state", ""), output.get("responsesFile", "")
+
+
+def _download(file_name: str, path: str, api_key: str) -> None:
+    """Stream a results file to disk."""
+    tmp_path = f"{path}.tmp"
+    with requests.get(
+        f"{GEMINI_API_ROOT}/download/v1beta/{file_name}:download?alt=media&key={api_key}",
+        stream=True,
+        timeout=600
+    ) as response:
+        response.raise_for_status()
+        with open(tmp_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                f.write(chunk)
+    os.replace(tmp_path, path)
+
+
+def _response_value(line: Dict) -> Optional[Dict]:
+    """Parsed JSON answer of one results line, or None on an error."""
+    candidates = (line.get("response") or {}).get("candidates") or []
+    if not candidates:
+        return None
+    text = "".join(part.get("text", "") for part in candidates[0].get("content", {}).get("parts", []))
+    try:
+        value = parse_json(text).value
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def _processed(
+    job: Dict,
+    answer: Dict[str, Optional[Dict]],
+    api_key: str,
+    cache: EnrichmentCache,
+    fields: Optional[Iterable[str]]
+) -> Dict[str, Any]:
+    """Build the processed job from its batch answers."""
+    title = job["title"]
+    wanted = None if fields is None else _requested_fields(fields)
+    plan = _enrichment_plan(title, job.get("location"), job.get("description", ""), wanted)
+    enhance_fields = _enhance_fields(plan.enhance, wanted)
+    names = _enhance_field_names(enhance_fields)
+
+    value = answer.get(_ENHANCE)
+    if value:
+        enhanced = _validate_enhanced(value, names, subset=enhance_fields is not None)
+    else:
+        enhanced = _enhance_fallback(title, names)
+    classification = _validate_classification(answer.get(_CLASSIFY), title)
+    return process_job(job, api_key=api_key, cache=cache, fields=fields, enhanced=enhanced,
+                       classification=classification)
+
+
+def _wait_for_results(state: BatchState, state_path: str, api_key: str, poll_interval: float,
+                      max_wait: Optional[float]) -> None:
+    """Poll a submitted batch and download its results."""
+    deadline = None if max_wait is None else time.monotonic() + max_wait
+    while True:
+        batch_state, responses_file = _batch_status(state.batch_name, api_key)
+        if batch_state != state.state:
+            logger.info(f"Batch {state.batch_name}: {batch_state or 'unknown'}")
+            state.state = batch_state
+            state.save(state_path)
+        if batch_state == STATE_SUCCEEDED and responses_file:
+            break
+        if batch_state in FAILED_STATES:
+            batch_name = state.batch_name
+            state.batch_name = state.state = ""
+            state.save(state_path)
+            raise RuntimeError(f"Batch {batch_name} ended in {batch_state}; run again to resubmit")
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(
+                f"Batch {state.batch_name} is still {batch_state or 'pending'}; "
+                f"run again with state path {state_path} to resume"
+            )
+        time.sleep(poll_interval)
+
+    results_path = f"{state_path}.results.jsonl"
+    _download(responses_file, results_path, api_key)
+    state.results_path = results_path
+    state.save(state_path)
+
+
+def iter_batch_enrichment(
+    jobs: List[Dict],
+    state_path: str,
+    api_key: Optional[str] = None,
+    fields: Optional[Iterable[str]] = None,
+    cache: Optional[EnrichmentCache] = None,
+    poll_interval: float = BATCH_POLL_INTERVAL,
+    max_wait: Optional[float] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Enrich jobs through one Gemini batch job, yielding processed jobs.
+
+    Cached jobs and jobs that need no API call are yielded first; the rest
+    are yielded as their results are read from the downloaded results file.
+    Results are stored in the enrichment cache like interactive ones.
+
+    Args:
+        jobs: Raw job dicts (as for process_jobs)
+        state_path: JSON file holding the batch progress; requests and
+                    results are written next to it
+        api_key: Optional Google API key (default: a key from the pool;
+                 pass the same key when resuming with several keys set)
+        fields: Output fields to enrich (default: all)
+        cache: Enrichment cache (default: module cache)
+        poll_interval: Seconds between status checks
+        max_wait: Give up polling after this many seconds (default: wait)
+
+    Yields:
+        Processed job dicts, as process_job returns them
+
+    Raises:
+        TimeoutError: If the batch has not finished within max_wait; run
+                      again with the same state_path to resume
+        RuntimeError: If Gemini rejects the batch or it fails
+    """
+    # The uploaded file and the batch belong to one key's project, so one key runs all of it
+    google_api_key = api_key or gemini_keys.select()
+    if not google_api_key:
+        raise RuntimeError("GOOGLE_API_KEY not set")
+    cache = default_cache if cache is None else cache
+
+    jobs_hash = _jobs_hash(jobs)
+    state = BatchState.load(state_path)
+    if state is not None and state.jobs_hash != jobs_hash:
+        logger.warning(f"Jobs differ from the batch in {state_path}, starting a new batch")
+        state = None
+    state = state or BatchState(jobs_hash)
+
+    # Once uploaded, only the request kinds per job are needed again
+    requests_path = os.devnull if state.input_file else f"{state_path}.requests.jsonl"
+    pending = write_requests(jobs, requests_path, fields, cache)
+
+    for index, job in enumerate(jobs):
+        if index not in pending and job.get("title"):
+            yield process_job(job, api_key=google_api_key, cache=cache, fields=fields)
+    if not pending:
+        return
+
+    if not state.results_path or not os.path.exists(state.results_path):
+        if not state.batch_name:
+            if not state.input_file:
+                state.input_file = _upload(requests_path, google_api_key)
+                state.save(state_path)
+            state.batch_name = _submit(state.input_file, google_api_key, os.path.basename(state_path))
+            state.save(state_path)
+            logger.info(f"Submitted {len(pending)} jobs as batch {state.batch_name}")
+        _wait_for_results(state, state_path, google_api_key, poll_interval, max_wait)
+
+    answers: Dict[int, Dict[str, Optional[Dict]]] = {}
+    with open(state.results_path, encoding="utf-8") as f:
+        for raw in f:
+            if not raw.strip():
+                continue
+            line = json.loads(raw)
+            index_text, _, kind = str(line.get("key", "")).partition(":")
+            if not index_text.isdigit() or int(index_text) not in pending:
+                continue
+            index = int(index_text)
+            answers.setdefault(index, {})[kind] = _response_value(line)
+            if set(answers[index]) >= set(pending[index]):
+                del pending[index]
+                yield _processed(jobs[index], answers.pop(index), google_api_key, cache, fields)
+
+    # Jobs whose lines are missing get the fallback values, which are not cached
+    for index in sorted(pending):
+        yield _processed(jobs[index], answers.get(index, {}), google_api_key, cache, fields)
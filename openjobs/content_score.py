@@ -0,0 +1,92 @@
+"""
+OpenJobs Content Score - Single-pass job keyword scoring for scraped pages
+
+Scores a page once with a precompiled whole-word matcher instead of lowercasing
+the page and running one str.count scan per keyword.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, NamedTuple
+
+# Job-related keywords for content validation
+# Used to detect if scraped content contains actual job listings
+JOB_KEYWORDS = [
+    'engineer', 'manager', 'designer', 'analyst', 'developer', 'director',
+    'coordinator', 'specialist', 'lead', 'senior', 'junior', 'associate',
+    'account executive', 'product manager', 'software engineer',
+    'recruiter', 'scientist', 'representative', 'intern', 'consultant',
+    'architect', 'administrator', 'head of',
+]
+
+# Department headings that group listings ("## Engineering")
+# Whole-word matching no longer catches these inside "engineer"-style substrings,
+# so they are counted explicitly to keep listing pages above the threshold
+DEPARTMENT_KEYWORDS = [
+    'engineering', 'design', 'marketing', 'sales', 'operations', 'finance', 'legal',
+]
+
+# Minimum keyword matches required to consider content as having job listings
+MIN_JOB_KEYWORD_MATCHES = 5
+
+# Minimum content length (chars) for a page to be worth extracting from
+MIN_CONTENT_LENGTH = 2000
+
+
+def _compile_keywords(keywords) -> "re.Pattern":
+    # Longest first so "software engineer" wins over "engineer"; optional plural
+    alternatives = [
+        r'\s+'.join(re.escape(word) for word in kw.split())
+        for kw in sorted(keywords, key=len, reverse=True)
+    ]
+    return re.compile(rf"\b({'|'.join(alternatives)})s?\b", re.IGNORECASE)
+
+
+_KEYWORD_PATTERN = _compile_keywords(JOB_KEYWORDS + DEPARTMENT_KEYWORDS)
+
+
+class JobContentScore(NamedTuple):
+    """Explanation of how much job-listing signal a document carries."""
+
+    matches: int
+    keyword_counts: Dict[str, int]
+    length: int
+    threshold: int = MIN_JOB_KEYWORD_MATCHES
+
+    @property
+    def has_jobs(self) -> bool:
+        """True if enough keywords matched to indicate job listings."""
+        return self.matches >= self.threshold
+
+    @property
+    def density(self) -> float:
+        """Keyword matches per 1,000 characters."""
+        return self.matches * 1000 / self.length if self.length else 0.0
+
+    def is_substantial(self, min_length: int = MIN_CONTENT_LENGTH) -> bool:
+        """True if the document is long enough and has job listings."""
+        return self.length > min_length and self.has_jobs
+
+
+def score_job_content(content: str, threshold: int = MIN_JOB_KEYWORD_MATCHES) -> JobContentScore:
+    """
+    Score content for job-listing keywords in a single pass.
+
+    Keywords match whole words only (so "lead" does not match "leadership"),
+    case-insensitively, with an optional plural "s".
+
+    Args:
+        content: Text content to score
+        threshold: Matches required for has_jobs
+
+    Returns:
+        JobContentScore with total matches and per-keyword counts
+    """
+    if not content:
+        return JobContentScore(0, {}, 0, threshold)
+
+    counts = Counter(
+        ' '.join(m.group(1).lower().split())
+        for m in _KEYWORD_PATTERN.finditer(content)
+    )
+    return JobContentScore(sum(counts.values()), dict(counts), len(content), threshold)
@@ -0,0 +1,230 @@
+"""
+OpenJobs Context Cache - Gemini cached contents for static prompt prefixes
+
+classify_job sends the whole category/subcategory taxonomy and
+enhance_job_output the allowed tech stacks and contract types with every
+request, and extraction repeats the same instructions for every page. A
+ContextCache uploads such a prefix once per process (and again when its TTL
+runs out) through Gemini's cachedContents API and hands out the resource name
+to reference it by, so each call only sends its own part. Prefixes below
+Gemini's minimum cacheable size, and prefixes whose creation failed, are sent
+inline as before. LocalContextCache is a stand-in that keeps prefixes in
+memory for tests.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import requests
+
+from .logger import logger
+
+GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+
+# Set OPENJOBS_CONTEXT_CACHE=0 to always send prompt prefixes inline
+CONTEXT_CACHING = os.getenv("OPENJOBS_CONTEXT_CACHE", "1") != "0"
+
+# Lifetime requested for a cached prefix; it is recreated after it expires
+CONTEXT_CACHE_TTL = int(os.getenv("OPENJOBS_CONTEXT_CACHE_TTL", "3600"))
+
+# Gemini rejects cached contents below a minimum token count
+MIN_CACHED_TOKENS = int(os.getenv("OPENJOBS_CONTEXT_CACHE_MIN_TOKENS", "1024"))
+
+CHARS_PER_TOKEN = 4
+
+# Stop using a cached prefix this long before it expires
+_EXPIRY_MARGIN = 60
+
+
+class CachedPrefix(NamedTuple):
+    """A created cached content (name None when creation failed) and its expiry."""
+
+    name: Optional[str]
+    expires_at: float
+
+
+def _entry_key(model: str, text: str, api_key: str) -> Tuple[str, str, str]:
+    # Cached contents belong to the key's project, so they are kept per key
+    return (
+        model,
+        hashlib.sha1(text.encode("utf-8")).hexdigest(),
+        hashlib.sha1(api_key.encode("utf-8")).hexdigest(),
+    )
+
+
+class ContextCache:
+    """
+    Creates and reuses Gemini cached contents for prompt prefixes.
+
+    Thread-safe; each prefix is created once per model, API key and TTL.
+    Creation runs outside the lock: concurrent requests for the same prefix
+    wait for the one in flight, other prefixes are not held up.
+
+    Example:
+        >>> cache = ContextCache()
+        >>> cache.reference("gemini-2.0-flash", "short prefix", "key") is None
+        True
+    """
+
+    def __init__(self, ttl: int = CONTEXT_CACHE_TTL, min_tokens: Optional[int] = None):
+        self.ttl = ttl
+        self.min_tokens = min_tokens
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str, str], CachedPrefix] = {}
+        self._inflight: Dict[Tuple[str, str, str], Future] = {}
+        self.stats: Dict[str, int] = {"created": 0, "reused": 0, "failed": 0, "inline": 0}
+
+    def reference(self, model: str, text: str, api_key: str) -> Optional[str]:
+        """
+        Return the cached content name for a prompt prefix, creating it if needed.
+
+        Args:
+            model: Gemini model the prefix is used with
+            text: Static prompt prefix
+            api_key: Google API key of the request
+
+        Returns:
+            Cached content name (e.g. "cachedContents/abc") or None to send
+            the prefix inline
+        """
+        min_tokens = MIN_CACHED_TOKENS if self.min_tokens is None else self.min_tokens
+        with self._lock:
+            if not CONTEXT_CACHING or not api_key or len(text) // CHARS_PER_TOKEN < min_tokens:
+                self.stats["inline"] += 1
+                return None
+
+            key = _entry_key(model, text, api_key)
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at - _EXPIRY_MARGIN > time.monotonic():
+                self.stats["reused" if entry.name else "inline"] += 1
+                return entry.name
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            name = future.result()
+            with self._lock:
+                self.stats["reused" if name else "inline"] += 1
+            return name
+
+        name = None
+        try:
+            name = self._create(model, text, api_key)
+        finally:
+            with self._lock:
+                if name:
+                    self.stats["created"] += 1
+                else:
+                    # Do not retry a failing prefix on every call
+                    self.stats["failed"] += 1
+                self._entries[key] = CachedPrefix(name, time.monotonic() + self.ttl)
+                del self._inflight[key]
+            future.set_result(name)
+        return name
+
+    def _create(self, model: str, text: str, api_key: str) -> Optional[str]:
+        """Create a cached content holding text; returns its name or None."""
+        try:
+            response = requests.post(
+                f"{GEMINI_API_BASE}/cachedContents?key={api_key}",
+                json={
+                    "model": f"models/{model}",
+                    "contents": [{"role": "user", "parts": [{"text": text}]}],
+                    "ttl": f"{self.ttl}s",
+                },
+                timeout=30
+            )
+        except requests.RequestException as e:
+            logger.warning(f"Could not create Gemini context cache: {e}")
+            return None
+
+        if response.status_code != 200:
+            logger.warning(f"Gemini context cache error {response.status_code}: {response.text[:200]}")
+            return None
+
+        name = response.json().get("name")
+        if name:
+            logger.info(f"Cached {len(text)}-char prompt prefix for {model} as {name} ({self.ttl}s)")
+        return name
+
+    def invalidate(self, name: str) -> None:
+        """Stop using a cached content Gemini no longer accepts (e.g. deleted early)."""
+        with self._lock:
+            self._entries = {key: entry for key, entry in self._entries.items() if entry.name != name}
+
+    def clear(self) -> None:
+        """Forget all cached prefixes and reset stats."""
+        with self._lock:
+            self._entries = {}
+            self.stats = dict.fromkeys(self.stats, 0)
+
+
+class LocalContextCache(ContextCache):
+    """
+    In-memory stand-in for tests: hands out names without calling Gemini.
+
+    Example:
+        >>> cache = LocalContextCache(min_tokens=0)
+        >>> name = cache.reference("gemini-2.0-flash", "prefix", "key")
+        >>> cache.contents[name]
+        'prefix'
+    """
+
+    def __init__(self, ttl: int = CONTEXT_CACHE_TTL, min_tokens: Optional[int] = None):
+        super().__init__(ttl, min_tokens)
+        self.contents: Dict[str, str] = {}
+
+    def _create(self, model: str, text: str, api_key: str) -> Optional[str]:
+        name = f"cachedContents/local-{len(self.contents) + 1}"
+        self.contents[name] = text
+        return name
+
+    def clear(self) -> None:
+        """Forget all cached prefixes and reset stats."""
+        super().clear()
+        self.contents = {}
+
+
+default_cache = ContextCache()
+
+
+def build_contents(
+    model: str,
+    prefix: str,
+    text: str,
+    api_key: str,
+    cache: Optional[ContextCache] = None
+) -> Tuple[str, Optional[str]]:
+    """
+    Split a prompt into the text to send and the cached content to reference.
+
+    Args:
+        model: Gemini model of the request
+        prefix: Static prompt prefix ("" for none)
+        text: Request-specific part of the prompt
+        api_key: Google API key of the request
+        cache: Context cache (default: module cache)
+
+    Returns:
+        Tuple of (prompt text, cached content name or None); without a
+        cached content the prefix is prepended to the text
+    """
+    if not prefix:
+        return text, None
+    cache = default_cache if cache is None else cache
+    name = cache.reference(model, prefix, api_key)
+    if name:
+        return text, name
+    return f"{prefix}\n\n{text}", None
+
+
+def invalidate(name: str, cache: Optional[ContextCache] = None) -> None:
+    """Drop a cached content after Gemini rejected a request referencing it."""
+    cache = default_cache if cache is None else cache
+    cache.invalidate(name)
@@ -0,0 +1,195 @@
+"""
+OpenJobs Enrichment Cache - Durable cache of Gemini enrichment results
+
+On recrawls process_job re-enriched every job with up to two Gemini calls even
+when the posting had not changed. Results are cached in SQLite keyed by
+(job_url, hash of title and description, taxonomy version), so an unchanged
+posting is enriched with zero API calls, and a taxonomy or model change
+invalidates everything at once. Hit rate and saved calls are tracked in
+stats.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+from .logger import logger
+
+# Persist the cache across runs (in-memory only when unset)
+ENRICHMENT_CACHE_PATH = os.getenv("OPENJOBS_ENRICHMENT_CACHE", "")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS enrichment (
+    cache_key TEXT PRIMARY KEY,
+    job_url TEXT,
+    taxonomy_version TEXT NOT NULL,
+    data TEXT NOT NULL,
+    api_calls INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    title TEXT,
+    label_source TEXT
+);
+"""
+
+# Who classified a cached title: only Gemini labels are training data
+LABEL_GEMINI = "gemini"
+LABEL_LOCAL = "local"
+
+
+def enrichment_key(job_url: str, title: str, description: str, taxonomy_version: str) -> str:
+    """
+    Cache key for one job's enrichment.
+
+    Args:
+        job_url: Job posting URL
+        title: Job title (classification depends on it)
+        description: Job description ("" if none)
+        taxonomy_version: Version of the categories, tech stacks and model
+
+    Returns:
+        Hex digest identifying the inputs
+    """
+    content = hashlib.sha1(f"{title}\0{description}".encode("utf-8")).hexdigest()
+    return hashlib.sha1(f"{job_url}\0{content}\0{taxonomy_version}".encode("utf-8")).hexdigest()
+
+
+class EnrichmentCache:
+    """
+    SQLite-backed enrichment cache, safe to share between threads.
+
+    Example:
+        >>> cache = EnrichmentCache()
+        >>> cache.get("missing") is None
+        True
+        >>> cache.stats["misses"]
+        1
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or ":memory:"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        # Caches written before titles and label sources were stored
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(enrichment)")}
+        for column in ("title", "label_source"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE enrichment ADD COLUMN {column} TEXT")
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "saved_calls": 0, "stored": 0}
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return cached enrichment fields, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, api_calls FROM enrichment WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self.stats["saved_calls"] += row[1]
+        return json.loads(row[0])
+
+    def put(
+        self,
+        key: str,
+        data: Dict,
+        api_calls: int,
+        job_url: str = "",
+        taxonomy_version: str = "",
+        title: str = "",
+        label_source: str = LABEL_GEMINI
+    ) -> None:
+        """
+        Store enrichment fields.
+
+        Args:
+            key: Key from enrichment_key
+            data: Enrichment fields to return on a hit
+            api_calls: Gemini calls a hit saves
+            job_url: Job URL (for inspection)
+            taxonomy_version: Taxonomy version (for pruning old entries)
+            title: Job title (training data for the local title classifier)
+            label_source: LABEL_GEMINI, or LABEL_LOCAL when the local title
+                          classifier chose the category
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO enrichment "
+                "(cache_key, job_url, taxonomy_version, data, api_calls, created_at, title, label_source) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, job_url, taxonomy_version, json.dumps(data, default=str), api_calls,
+                 datetime.now().isoformat(), title, label_source)
+            )
+            self.stats["stored"] += 1
+
+    def labelled_titles(self, taxonomy_version: str) -> Iterator[Tuple[str, str, str]]:
+        """
+        Titles with the category and subcategory Gemini gave them.
+
+        Entries the local title classifier labelled are left out, so the
+        model is never trained on its own predictions.
+
+        Args:
+            taxonomy_version: Only entries of this taxonomy
+
+        Yields:
+            (title, category, subcategory) per distinct title
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT title, data FROM enrichment WHERE title != '' AND taxonomy_version = ? "
+                "AND COALESCE(label_source, ?) != ? ORDER BY created_at",
+                (taxonomy_version, LABEL_GEMINI, LABEL_LOCAL)
+            ).fetchall()
+        seen = set()
+        for title, data in rows:
+            fields = json.loads(data)
+            if "category" in fields and "subcategory" in fields and title not in seen:
+                seen.add(title)
+                yield title, fields["category"], fields["subcategory"]
+
+    def prune(self, taxonomy_version: str) -> int:
+        """Delete entries from other taxonomy versions; returns how many."""
+        with self._lock, self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM enrichment WHERE taxonomy_version != ?", (taxonomy_version,)
+            ).rowcount
+        return deleted
+
+    def clear(self) -> None:
+        """Delete every entry and reset stats."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM enrichment")
+            self.stats = dict.fromkeys(self.stats, 0)
+
+    def log_stats(self) -> None:
+        """Log hit rate and saved API calls."""
+        logger.info(
+            f"Enrichment cache: {self.stats['hits']} hits, {self.stats['misses']} misses "
+            f"({self.hit_rate:.0%} hit rate), {self.stats['saved_calls']} Gemini calls saved"
+        )
+
+    def __contains__(self, key: str) -> bool:
+        """Whether a key is cached, without counting a lookup."""
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM enrichment WHERE cache_key = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM enrichment").fetchone()[0]
+
+
+default_cache = EnrichmentCache(ENRICHMENT_CACHE_PATH or None)
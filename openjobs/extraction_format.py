@@ -0,0 +1,268 @@
+"""
+OpenJobs Extraction Format - Compact positional output for Gemini job extraction
+
+Asking Gemini to repeat "title"/"department"/"location"/"url" keys for every job
+wastes output tokens, which dominate generation latency. The compact format
+puts departments and locations in deduplicated tables and each job in a short
+positional row:
+
+    {"d": ["Engineering"], "l": ["Remote", "Berlin"],
+     "j": [["Backend Engineer", 0, 0, "https://..."], ["SRE", 0, 1, null]]}
+
+decode_jobs() turns either this format or a plain array of job objects into the
+same job dicts, so callers never see the difference.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from .partial_json import PartialJson, parse_partial_json
+
+FORMAT_JSON = "json"
+FORMAT_COMPACT = "compact"
+
+COMPACT_EXTRACTION_PROMPT = """Extract all job listings from this careers page content.
+
+IMPORTANT:
+- ONLY extract jobs that are explicitly listed on the page
+- Do NOT invent or assume job titles that aren't clearly stated
+- If unsure whether something is a job listing, skip it
+- If no jobs are clearly listed, return an empty job list
+
+Return ONLY a compact JSON object. No explanation, no markdown.
+- "d": list of distinct department or team names
+- "l": list of distinct job locations
+- "j": one row per job: [title, department_index, location_index, url]
+  - title: job title exactly as written on the page (required)
+  - department_index / location_index: index into "d" / "l", or null if not stated
+  - url: direct link to job posting, or null
+
+If no jobs found, return: {"d": [], "l": [], "j": []}
+
+Example output:
+{"d": ["Engineering"], "l": ["Remote", "Berlin"], "j": [["Software Engineer", 0, 0, "https://..."], ["Data Engineer", 0, 1, null]]}"""
+
+
+def _lookup(table: List[Any], ref: Any) -> Optional[str]:
+    """Resolve a table index; tolerate names given inline instead of indexes."""
+    if ref is None:
+        return None
+    if isinstance(ref, bool):
+        return None
+    if isinstance(ref, int):
+        return table[ref] if 0 <= ref < len(table) else None
+    return str(ref)
+
+
+def decode_compact_jobs(data: Dict) -> List[Dict]:
+    """
+    Decode the compact {"d", "l", "j"} format into job dicts.
+
+    Args:
+        data: Parsed compact response
+
+    Returns:
+        List of job dicts with title, department, location, url
+    """
+    departments = data.get("d") or []
+    locations = data.get("l") or []
+    jobs = []
+    for row in data.get("j") or []:
+        if isinstance(row, dict):
+            jobs.append(row)
+            continue
+        if not isinstance(row, list) or not row:
+            continue
+        title, dept, loc, url = (list(row) + [None, None, None])[:4]
+        jobs.append({
+            "title": title,
+            "department": _lookup(departments, dept),
+            "location": _lookup(locations, loc),
+            "url": url,
+        })
+    return jobs
+
+
+def decode_jobs(data: Any) -> List[Dict]:
+    """
+    Decode a parsed extraction response in either format.
+
+    Args:
+        data: A list of job objects, or a compact {"d", "l", "j"} object
+
+    Returns:
+        List of job dicts that have a title
+    """
+    if isinstance(data, dict):
+        jobs = decode_compact_jobs(data) if "j" in data else data.get("jobs", [])
+    elif isinstance(data, list):
+        jobs = data
+    else:
+        jobs = []
+    return [j for j in jobs if isinstance(j, dict) and j.get("title")]
+
+
+def strip_code_fence(text: str) -> str:
+    """Remove a surrounding ``` or ```json fence from model output."""
+    text = text.strip()
+    if text.startswith('```'):
+        lines = text.split('\n')
+        text = '\n'.join(lines[1:-1] if lines[-1].strip() == '```' else lines[1:])
+    return text
+
+
+def parse_jobs_text(text: str) -> List[Dict]:
+    """
+    Parse Gemini output text into job dicts.
+
+    Finds the outermost JSON array or object and decodes it in either format.
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        List of job dicts (empty if the text holds no JSON value)
+
+    Raises:
+        json.JSONDecodeError: If the JSON value is malformed
+    """
+    text = strip_code_fence(text)
+    starts = [i for i in (text.find('['), text.find('{')) if i != -1]
+    if not starts:
+        return []
+    start = min(starts)
+    end = text.rfind(']' if text[start] == '[' else '}') + 1
+    if end <= start:
+        return []
+    return decode_jobs(json.loads(text[start:end]))
+
+
+def parse_partial_jobs(text: str) -> PartialJson:
+    """
+    Parse possibly truncated Gemini output into job dicts.
+
+    Every fully written job (object or compact row) is kept; a job cut off
+    by the output-token cap is dropped.
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        PartialJson whose value is the list of job dicts
+
+    Raises:
+        json.JSONDecodeError: If the JSON is malformed before it ends
+    """
+    parsed = parse_partial_json(strip_code_fence(text))
+    return PartialJson(decode_jobs(parsed.value), parsed.complete)
+
+
+class JobStreamDecoder:
+    """
+    Decode streamed extraction output into jobs as each one closes.
+
+    Feed text deltas as they arrive; each call returns the jobs whose JSON
+    object (or compact row) was completed by that delta. Only the job being
+    written is buffered, never the whole response. Works for both a plain
+    array of job objects and the compact {"d", "l", "j"} format, whose
+    tables come before the rows.
+
+    Example:
+        >>> decoder = JobStreamDecoder()
+        >>> decoder.feed('[{"title": "Engineer"}, {"ti')
+        [{'title': 'Engineer'}]
+        >>> decoder.feed('tle": "Designer"}]')
+        [{'title': 'Designer'}]
+    """
+
+    def __init__(self):
+        self._top: Optional[str] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key_chars: Optional[List[str]] = None
+        self._pending_key: Optional[str] = None
+        self._key: Optional[str] = None
+        self._capture: List[str] = []
+        self._capture_depth: Optional[int] = None
+        self._tables: Dict[str, List] = {"d": [], "l": []}
+        self.done = False
+
+    def _should_capture(self) -> bool:
+        if self._top == '[':
+            return self._depth == 2
+        if self._depth == 2:
+            return self._key in self._tables
+        return self._depth == 3 and self._key in ("j", "jobs")
+
+    def _decode(self, text: str) -> List[Dict]:
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            return []
+        if self._top == '[':
+            return decode_jobs([value])
+        if self._key in self._tables:
+            if isinstance(value, list):
+                self._tables[self._key] = value
+            return []
+        return decode_jobs({"d": self._tables["d"], "l": self._tables["l"], "j": [value]})
+
+    def feed(self, text: str) -> List[Dict]:
+        """
+        Consume a text delta.
+
+        Args:
+            text: Next chunk of model output
+
+        Returns:
+            Jobs completed by this chunk
+        """
+        jobs: List[Dict] = []
+        for char in text:
+            if self.done:
+                break
+            if self._capture_depth is not None:
+                self._capture.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_chars is not None:
+                        self._pending_key = ''.join(self._key_chars)
+                        self._key_chars = None
+                elif self._key_chars is not None:
+                    self._key_chars.append(char)
+                continue
+
+            if self._top is None:
+                # Skip code fences or prose before the JSON value
+                if char in '[{':
+                    self._top = char
+                    self._depth = 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._top == '{' and self._depth == 1:
+                    self._key_chars = []
+            elif char == ':' and self._top == '{' and self._depth == 1:
+                self._key = self._pending_key
+            elif char in '[{':
+                self._depth += 1
+                if self._capture_depth is None and self._should_capture():
+                    self._capture = [char]
+                    self._capture_depth = self._depth
+            elif char in ']}':
+                self._depth -= 1
+                if self._capture_depth is not None and self._depth < self._capture_depth:
+                    jobs.extend(self._decode(''.join(self._capture)))
+                    self._capture = []
+                    self._capture_depth = None
+                if self._depth == 0:
+                    self.done = True
+        return jobs
@@ -0,0 +1,384 @@
+"""
+OpenJobs Extraction Templates - Learn per-site extraction templates from Gemini results
+
+A careers page keeps its layout from one run to the next, yet every scrape paid
+Gemini to read the same structure again. After a Gemini extraction this infers
+a template (wrapper induction) from where the extracted jobs sit in the page
+markdown:
+
+- the shape of the line holding each job link ("- [Title](url)", "### [Title](url)")
+- the URL prefix shared by job links
+- the heading level that names the department, if any
+- where the location is written (after a separator on the same line, or on the next line)
+
+A template is kept only if applying it to the same page reproduces Gemini's
+jobs. Later scrapes apply it locally and call Gemini only when the result
+fails validation (e.g. the site was redesigned).
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .file_store import JsonFileStore
+from .logger import logger
+from .markdown_syntax import MARKDOWN_HEADING, MARKDOWN_LINK, prefix_pattern, strip_markup
+
+LOCATION_NONE = "none"
+LOCATION_SAME_LINE = "same_line"
+LOCATION_NEXT_LINE = "next_line"
+
+# Fewer jobs than this are too few to generalize from
+MIN_TEMPLATE_JOBS = 3
+
+# Share of Gemini's jobs the template must reproduce (and share of the template's
+# jobs Gemini must have found) on the page it was learned from
+MIN_TEMPLATE_AGREEMENT = 0.9
+
+# A reused template must find at least this share of the jobs it was learned with
+MIN_TEMPLATE_YIELD = 0.5
+
+# Persist templates across runs (in-memory only when unset)
+TEMPLATES_PATH = os.getenv("OPENJOBS_TEMPLATES_PATH", "")
+
+
+@dataclass
+class ExtractionTemplate:
+    """Where the jobs sit in one careers page's markdown."""
+
+    key: str
+    line_prefix: str
+    url_prefix: str = ""
+    department_level: int = 0
+    location: str = LOCATION_NONE
+    location_separator: str = ""
+    job_count: int = 0
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def line_pattern(self) -> "re.Pattern":
+        """Regex matching a job line; groups title, url and rest."""
+        return re.compile(
+            rf'^{self.line_prefix}\[(?:\*\*|__)?(?P<title>[^\]\n]+?)(?:\*\*|__)?\]'
+            r'\(\s*<?(?P<url>[^)\s>]+)>?(?:\s+"[^"]*")?\s*\)(?P<rest>.*)$'
+        )
+
+    def to_dict(self) -> Dict:
+        """Plain dict for JSON storage."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ExtractionTemplate":
+        """Build a template from stored data, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+def template_key(url: str) -> str:
+    """
+    Key templates by host and path.
+
+    Hosted ATS boards (boards.greenhouse.io/acme, jobs.lever.co/acme) serve
+    many companies from one host, so the path is part of the key.
+    """
+    parts = urlsplit(url or "")
+    return f"{(parts.hostname or '').lower()}{parts.path.rstrip('/')}"
+
+
+def _url_prefix(urls: List[str]) -> str:
+    """Common prefix of job URLs, cut back to a path boundary."""
+    prefix = os.path.commonprefix(urls)
+    return prefix[:prefix.rfind('/') + 1] if '/' in prefix else ""
+
+
+def _next_text_line(lines: List[str], index: int) -> str:
+    for line in lines[index + 1:index + 3]:
+        if line.strip():
+            return strip_markup(line)
+    return ""
+
+
+def _same(a: Optional[str], b: Optional[str]) -> bool:
+    return bool(a) and bool(b) and strip_markup(a).lower() == strip_markup(b).lower()
+
+
+def apply_template(template: ExtractionTemplate, markdown: str) -> List[Dict]:
+    """
+    Extract jobs from page markdown with a learned template.
+
+    Args:
+        template: Template for the page
+        markdown: Page markdown (as returned by Firecrawl)
+
+    Returns:
+        Job dicts with title, department, location, url
+    """
+    pattern = template.line_pattern
+    lines = (markdown or "").splitlines()
+    headings: Dict[int, str] = {}
+    jobs = []
+    seen = set()
+
+    for index, line in enumerate(lines):
+        match = pattern.match(line)
+        if not match:
+            heading = MARKDOWN_HEADING.match(line)
+            if heading:
+                level = len(heading.group(1))
+                headings = {lvl: text for lvl, text in headings.items() if lvl < level}
+                headings[level] = strip_markup(heading.group(2))
+            continue
+
+        url = match.group('url')
+        title = strip_markup(match.group('title'))
+        if not url.startswith(template.url_prefix) or not title or (title, url) in seen:
+            continue
+        seen.add((title, url))
+
+        location = None
+        if template.location == LOCATION_SAME_LINE:
+            rest = match.group('rest')
+            if rest.startswith(template.location_separator):
+                location = strip_markup(rest[len(template.location_separator):].split(template.location_separator)[0])
+        elif template.location == LOCATION_NEXT_LINE:
+            location = _next_text_line(lines, index)
+
+        jobs.append({
+            "title": title,
+            "department": headings.get(template.department_level) if template.department_level else None,
+            "location": location or None,
+            "url": url,
+        })
+    return jobs
+
+
+def _locate_jobs(lines: List[str], jobs: List[Dict]) -> List[Tuple[int, "re.Match", Dict]]:
+    """Find the link of each job in the page: (line index, link match, job)."""
+    by_url: Dict[str, List[Tuple[int, "re.Match"]]] = {}
+    for index, line in enumerate(lines):
+        for match in MARKDOWN_LINK.finditer(line):
+            by_url.setdefault(match.group(2), []).append((index, match))
+
+    located = []
+    for job in jobs:
+        for index, match in by_url.get(job.get('url') or '', []):
+            if _same(match.group(1), job.get('title')):
+                located.append((index, match, job))
+                break
+    return located
+
+
+def _department_level(lines: List[str], located) -> int:
+    """Heading level whose text matches the jobs' departments, or 0."""
+    with_department = [(i, job) for i, _, job in located if job.get('department')]
+    if not with_department:
+        return 0
+
+    levels: Counter = Counter()
+    for index, job in with_department:
+        for line in reversed(lines[:index]):
+            heading = MARKDOWN_HEADING.match(line)
+            if heading and _same(heading.group(2), job['department']):
+                levels[len(heading.group(1))] += 1
+                break
+    if not levels:
+        return 0
+    level, count = levels.most_common(1)[0]
+    return level if count >= MIN_TEMPLATE_AGREEMENT * len(with_department) else 0
+
+
+def _location_rule(lines: List[str], located) -> Tuple[str, str]:
+    """Where locations are written: (LOCATION_*, separator)."""
+    with_location = [(i, m, job) for i, m, job in located if job.get('location')]
+    if not with_location:
+        return LOCATION_NONE, ""
+
+    votes: Counter = Counter()
+    for index, match, job in with_location:
+        location = job['location']
+        rest = lines[index][match.end():]
+        if location in rest:
+            separator = rest[:rest.index(location)]
+            if separator.strip(' *_') and len(separator) <= 5:
+                votes[(LOCATION_SAME_LINE, separator)] += 1
+                continue
+        if _same(_next_text_line(lines, index), location):
+            votes[(LOCATION_NEXT_LINE, "")] += 1
+    if not votes:
+        return LOCATION_NONE, ""
+    rule, count = votes.most_common(1)[0]
+    return rule if count >= MIN_TEMPLATE_AGREEMENT * len(with_location) else (LOCATION_NONE, "")
+
+
+def induce_template(key: str, markdown: str, jobs: List[Dict]) -> Optional[ExtractionTemplate]:
+    """
+    Learn a template that reproduces extracted jobs from page markdown.
+
+    Args:
+        key: Template key for the page (see template_key)
+        markdown: Page markdown the jobs were extracted from
+        jobs: Jobs Gemini extracted from it
+
+    Returns:
+        ExtractionTemplate, or None if no template reproduces the jobs
+    """
+    if len(jobs) < MIN_TEMPLATE_JOBS:
+        return None
+    lines = (markdown or "").splitlines()
+    located = _locate_jobs(lines, jobs)
+    if len(located) < MIN_TEMPLATE_AGREEMENT * len(jobs):
+        return None
+
+    prefixes = Counter(prefix_pattern(lines[i][:m.start()]) for i, m, _ in located)
+    prefix, count = prefixes.most_common(1)[0]
+    if prefix is None or count < MIN_TEMPLATE_AGREEMENT * len(jobs):
+        return None
+
+    location, separator = _location_rule(lines, located)
+    template = ExtractionTemplate(
+        key=key,
+        line_prefix=prefix,
+        url_prefix=_url_prefix([m.group(2) for _, m, _ in located]),
+        department_level=_department_level(lines, located),
+        location=location,
+        location_separator=separator,
+        job_count=len(jobs),
+    )
+
+    # Round trip: the template must find Gemini's jobs and little else
+    expected = {(strip_markup(j['title']), j.get('url')) for j in jobs}
+    found = {(j['title'], j['url']) for j in apply_template(template, markdown)}
+    agreed = len(expected & found)
+    if agreed < MIN_TEMPLATE_AGREEMENT * len(expected) or agreed < MIN_TEMPLATE_AGREEMENT * len(found):
+        return None
+    return template
+
+
+def validate_template_jobs(template: ExtractionTemplate, jobs: List[Dict]) -> bool:
+    """Whether jobs from a reused template are plausible enough to skip Gemini."""
+    if len(jobs) < max(1, math.ceil(template.job_count * MIN_TEMPLATE_YIELD)):
+        return False
+    titles = [job['title'] for job in jobs]
+    if any(not 2 <= len(title) <= 150 for title in titles):
+        return False
+    # A template matching navigation links yields the same few titles repeated
+    return len(set(titles)) >= 0.8 * len(titles)
+
+
+class TemplateStore(JsonFileStore[ExtractionTemplate]):
+    """
+    Thread-safe template store, optionally persisted to a JSON file.
+
+    Writes are batched (see file_store); call flush() to persist right away.
+
+    Example:
+        >>> store = TemplateStore()
+        >>> store.get("acme.com/careers") is None
+        True
+    """
+
+    kind = "extraction templates"
+
+    def _decode(self, data: Dict) -> ExtractionTemplate:
+        return ExtractionTemplate.from_dict(data)
+
+    def _encode(self, template: ExtractionTemplate) -> Dict:
+        return template.to_dict()
+
+    def get(self, key: str) -> Optional[ExtractionTemplate]:
+        """Return the template for a key, or None."""
+        with self._lock:
+            self._load()
+            return self._records.get(key)
+
+    def put(self, template: ExtractionTemplate) -> None:
+        """Store (or replace) a template."""
+        with self._lock:
+            self._load()
+            self._records[template.key] = template
+            self._changed()
+
+    def remove(self, key: str) -> None:
+        """Forget the template for a key."""
+        with self._lock:
+            self._load()
+            if self._records.pop(key, None) is not None:
+                self._changed()
+
+    def record(self, key: str, hit: bool) -> None:
+        """Count a successful or failed reuse of a template."""
+        with self._lock:
+            template = self._records.get(key)
+            if template is not None:
+                if hit:
+                    template.hits += 1
+                else:
+                    template.misses += 1
+                self._changed()
+
+
+default_store = TemplateStore(TEMPLATES_PATH or None)
+
+
+def extract_with_template(url: str, markdown: str, store: Optional[TemplateStore] = None) -> Optional[List[Dict]]:
+    """
+    Extract jobs locally with the stored template for a page.
+
+    Args:
+        url: Careers page URL
+        markdown: Page markdown
+        store: Template store (default: module store)
+
+    Returns:
+        Jobs if a template exists and its result passes validation, else None
+    """
+    store = default_store if store is None else store
+    key = template_key(url)
+    template = store.get(key)
+    if template is None:
+        return None
+
+    jobs = apply_template(template, markdown)
+    valid = validate_template_jobs(template, jobs)
+    store.record(key, valid)
+    if not valid:
+        logger.info(f"Template for {key} found {len(jobs)} jobs (learned with {template.job_count}), using Gemini")
+        return None
+    logger.info(f"Extracted {len(jobs)} jobs from {key} with a learned template (no API call)")
+    return jobs
+
+
+def learn_template(
+    url: str,
+    markdown: str,
+    jobs: List[Dict],
+    store: Optional[TemplateStore] = None
+) -> Optional[ExtractionTemplate]:
+    """
+    Learn and store a template from a Gemini extraction.
+
+    A stale template for the page is dropped when no new one can be learned.
+
+    Args:
+        url: Careers page URL
+        markdown: Page markdown the jobs were extracted from
+        jobs: Jobs Gemini extracted
+        store: Template store (default: module store)
+
+    Returns:
+        The stored template, or None
+    """
+    store = default_store if store is None else store
+    key = template_key(url)
+    template = induce_template(key, markdown, jobs)
+    if template is None:
+        store.remove(key)
+        return None
+    store.put(template)
+    logger.debug(f"Learned extraction template for {key}: {template}")
+    return template
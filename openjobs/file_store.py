@@ -0,0 +1,107 @@
+"""
+OpenJobs File Store - Thread-safe records persisted to a JSON file in batches
+
+Extraction templates and page snapshots change on nearly every page of a
+crawl. Rewriting the whole JSON file on each change made persistence cost
+grow with the store times the pages crawled, so changes are batched: the file
+is written at most once per OPENJOBS_STORE_SAVE_INTERVAL seconds, on flush()
+and at interpreter exit.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Generic, Optional, TypeVar
+
+from .logger import logger
+
+# Seconds between writes of a persisted store (0 writes on every change)
+STORE_SAVE_INTERVAL = float(os.getenv("OPENJOBS_STORE_SAVE_INTERVAL", "30"))
+
+T = TypeVar("T")
+
+
+class JsonFileStore(Generic[T]):
+    """
+    Records by key, optionally persisted to a JSON file.
+
+    Subclasses convert records to and from JSON with _decode and _encode and
+    call _changed() (holding the lock) after modifying _records.
+
+    Example:
+        >>> store = JsonFileStore()
+        >>> len(store)
+        0
+    """
+
+    # Used in log messages
+    kind = "records"
+
+    def __init__(self, path: Optional[str] = None, save_interval: float = STORE_SAVE_INTERVAL):
+        self.path = path
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._records: Dict[str, T] = {}
+        self._loaded = False
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        if path:
+            atexit.register(self.flush)
+
+    def _decode(self, data: Any) -> T:
+        return data
+
+    def _encode(self, record: T) -> Any:
+        return record
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            self._records = {key: self._decode(value) for key, value in data.items()}
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Could not load {self.kind} from {self.path}: {e}")
+
+    def _save(self) -> None:
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({key: self._encode(record) for key, record in self._records.items()}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save {self.kind} to {self.path}: {e}")
+
+    def _changed(self) -> None:
+        if not self.path:
+            return
+        self._dirty = True
+        if time.monotonic() - self._saved_at >= self.save_interval:
+            self._save()
+
+    def flush(self) -> None:
+        """Write pending changes to the file now."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def clear(self) -> None:
+        """Forget all records."""
+        with self._lock:
+            self._records = {}
+            self._loaded = True
+            self._changed()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._records)
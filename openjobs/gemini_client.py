@@ -0,0 +1,306 @@
+"""
+OpenJobs Gemini Client - One place for every generateContent request
+
+Extraction, careers-page search and enrichment all talk to Gemini through
+GeminiClient: one pooled HTTP session, a key from the key pool (rate limited
+per key), retries with exponential backoff on rate limits and server errors,
+the model routed by task, JSON answers parsed the same way everywhere, and
+token usage counted per model. Tune throughput here (OPENJOBS_GEMINI_POOL_SIZE,
+OPENJOBS_GEMINI_RETRIES, OPENJOBS_GEMINI_RETRY_BACKOFF and the key pool's
+per-key rates).
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .context_cache import invalidate
+from .key_pool import UNHEALTHY_STATUS_CODES, KeyPool, gemini_keys
+from .logger import logger
+from .partial_json import PartialJson, parse_partial_json
+
+GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+
+# Model per task; GEMINI_MODEL and GEMINI_PROCESSOR_MODEL keep their meaning
+MODEL_ROUTES: Dict[str, str] = {
+    "extraction": os.getenv("GEMINI_MODEL", "gemini-2.0-flash"),
+    "search": os.getenv("GEMINI_SEARCH_MODEL", os.getenv("GEMINI_MODEL", "gemini-2.0-flash")),
+    "enrichment": os.getenv("GEMINI_PROCESSOR_MODEL", "gemini-2.0-flash"),
+}
+
+# Connections kept open to Gemini (also the most concurrent requests that reuse one)
+GEMINI_POOL_SIZE = int(os.getenv("OPENJOBS_GEMINI_POOL_SIZE", "16"))
+
+# Retries after a rate limit, server error or dropped connection, and the first backoff
+GEMINI_RETRIES = int(os.getenv("OPENJOBS_GEMINI_RETRIES", "2"))
+GEMINI_RETRY_BACKOFF = float(os.getenv("OPENJOBS_GEMINI_RETRY_BACKOFF", "1.0"))
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Answers that, when the error names the cachedContent, mean it expired, was
+# deleted or is not visible to the key; rate limits and server errors do not
+CACHED_CONTENT_GONE_STATUS_CODES = {400, 403, 404}
+
+# usageMetadata field -> usage counter
+_USAGE_FIELDS = {
+    "promptTokenCount": "prompt_tokens",
+    "cachedContentTokenCount": "cached_tokens",
+    "candidatesTokenCount": "output_tokens",
+    "totalTokenCount": "total_tokens",
+}
+
+
+def model_for(task: str) -> str:
+    """Model a task is routed to."""
+    return MODEL_ROUTES[task]
+
+
+def parse_json(text: str) -> PartialJson:
+    """Strip code fences and parse JSON, keeping complete fields of a truncated answer."""
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return parse_partial_json(text.strip())
+
+
+class GeminiResponse(NamedTuple):
+    """Text of the first candidate, why it stopped, and the tokens it took."""
+
+    text: str
+    finish_reason: Optional[str]
+    status_code: int
+    model: str
+    usage: Dict[str, int]
+
+
+def _candidate_text(event: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """Joined text parts and finishReason of a response's first candidate."""
+    candidates = event.get("candidates") or []
+    if not candidates:
+        return "", None
+    candidate = candidates[0]
+    parts = candidate.get("content", {}).get("parts", [])
+    return "".join(part.get("text", "") for part in parts), candidate.get("finishReason")
+
+
+class GeminiClient:
+    """
+    Gemini generateContent client with pooled connections, retries and key rotation.
+
+    Thread-safe. A request without api_key takes the least-loaded key of the
+    pool and moves to another key when it is rate limited; a request with
+    api_key (e.g. one referencing a cached content, which belongs to the key
+    that created it) stays on that key.
+
+    Example:
+        >>> client = GeminiClient()
+        >>> response = client.generate(  # doctest: +SKIP
+        ...     [{"role": "user", "parts": [{"text": "Say hi"}]}], task="enrichment")
+        >>> response.text, client.usage  # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        keys: Optional[KeyPool] = None,
+        retries: int = GEMINI_RETRIES,
+        backoff: float = GEMINI_RETRY_BACKOFF,
+        pool_size: int = GEMINI_POOL_SIZE
+    ):
+        self.keys = gemini_keys if keys is None else keys
+        self.retries = retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self.usage: Dict[str, Dict[str, int]] = {}
+        self.stats: Dict[str, int] = {"requests": 0, "retries": 0, "errors": 0}
+
+    def _payload(
+        self,
+        contents: List[Dict],
+        generation_config: Optional[Dict],
+        cached_content: Optional[str],
+        response_schema: Optional[Dict],
+        tools: Optional[List[Dict]]
+    ) -> Dict:
+        config = dict(generation_config or {})
+        if response_schema:
+            config["responseMimeType"] = "application/json"
+            config["responseSchema"] = response_schema
+        payload: Dict[str, Any] = {"contents": contents, "generationConfig": config}
+        if cached_content:
+            payload["cachedContent"] = cached_content
+        if tools:
+            payload["tools"] = tools
+        return payload
+
+    def _post(
+        self,
+        model: str,
+        method: str,
+        payload: Dict,
+        api_key: Optional[str],
+        timeout: int,
+        stream: bool = False
+    ) -> requests.Response:
+        """Send one request, retrying rate limits, server errors and dropped connections."""
+        query = "alt=sse&" if stream else ""
+        pinned = api_key
+        attempt = 0
+        while True:
+            key = self.keys.wait(pinned)
+            rotate = False
+            url = f"{GEMINI_API_BASE}/models/{model}:{method}?{query}key={key}"
+            with self._lock:
+                self.stats["requests"] += 1
+            try:
+                response = self.session.post(url, json=payload, timeout=timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retries:
+                    raise
+            else:
+                status = response.status_code
+                self.keys.report(key, status)
+                # A pooled key out of quota is worth retrying on another healthy key
+                rotate = pinned is None and status in UNHEALTHY_STATUS_CODES and any(
+                    self.keys.healthy(other) for other in self.keys.keys)
+                if not (rotate or status in RETRYABLE_STATUS_CODES) or attempt >= self.retries:
+                    return response
+                response.close()
+                if status == 429 and not rotate:
+                    # Back off on the same key rather than wait out its cooldown
+                    pinned = key
+
+            delay = 0.0 if rotate else self.backoff * 2 ** attempt
+            attempt += 1
+            with self._lock:
+                self.stats["retries"] += 1
+            logger.debug(f"Retrying Gemini {method} in {delay:.1f}s (attempt {attempt + 1})")
+            time.sleep(delay)
+
+    def _failed(self, response: requests.Response, cached_content: Optional[str]) -> None:
+        with self._lock:
+            self.stats["errors"] += 1
+        error = response.text
+        logger.error(f"Gemini API error {response.status_code}: {error[:200]}")
+        if cached_content and response.status_code in CACHED_CONTENT_GONE_STATUS_CODES \
+                and "cachedcontent" in error.lower():
+            # Recreated on the next call
+            invalidate(cached_content)
+
+    def _record_usage(self, model: str, metadata: Optional[Dict[str, int]]) -> Dict[str, int]:
+        usage = {name: int((metadata or {}).get(field, 0)) for field, name in _USAGE_FIELDS.items()}
+        with self._lock:
+            totals = self.usage.setdefault(model, dict.fromkeys(["calls", *_USAGE_FIELDS.values()], 0))
+            totals["calls"] += 1
+            for name, count in usage.items():
+                totals[name] += count
+        return usage
+
+    def generate(
+        self,
+        contents: List[Dict],
+        task: str = "enrichment",
+        api_key: Optional[str] = None,
+        generation_config: Optional[Dict] = None,
+        cached_content: Optional[str] = None,
+        response_schema: Optional[Dict] = None,
+        tools: Optional[List[Dict]] = None,
+        timeout: int = 60
+    ) -> GeminiResponse:
+        """
+        Send one generateContent request.
+
+        Args:
+            contents: Conversation turns
+            task: Routing key into MODEL_ROUTES
+            api_key: Key to use (default: least-loaded pooled key)
+            generation_config: generationConfig of the request
+            cached_content: Cached content name to reference
+            response_schema: Gemini response schema for a JSON answer
+            tools: Request tools (e.g. Google Search grounding)
+            timeout: Request timeout in seconds
+
+        Returns:
+            GeminiResponse; text "" on an API error
+        """
+        model = model_for(task)
+        payload = self._payload(contents, generation_config, cached_content, response_schema, tools)
+        response = self._post(model, "generateContent", payload, api_key, timeout)
+        if response.status_code != 200:
+            self._failed(response, cached_content)
+            return GeminiResponse("", None, response.status_code, model, {})
+
+        result = response.json()
+        text, finish_reason = _candidate_text(result)
+        usage = self._record_usage(model, result.get("usageMetadata"))
+        return GeminiResponse(text, finish_reason, response.status_code, model, usage)
+
+    def stream(
+        self,
+        contents: List[Dict],
+        task: str = "extraction",
+        api_key: Optional[str] = None,
+        generation_config: Optional[Dict] = None,
+        cached_content: Optional[str] = None,
+        timeout: int = 30
+    ) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Send one streamGenerateContent request.
+
+        Only failures before the first event are retried.
+
+        Yields:
+            (text delta, finishReason) per server-sent event; nothing on an API error
+        """
+        model = model_for(task)
+        payload = self._payload(contents, generation_config, cached_content, None, None)
+        response = self._post(model, "streamGenerateContent", payload, api_key, timeout, stream=True)
+        metadata = None
+        try:
+            if response.status_code != 200:
+                self._failed(response, cached_content)
+                return
+
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                event = json.loads(line[len("data:"):])
+                # Every event carries the running totals
+                metadata = event.get("usageMetadata") or metadata
+                if event.get("candidates"):
+                    yield _candidate_text(event)
+        finally:
+            response.close()
+            if response.status_code == 200:
+                self._record_usage(model, metadata)
+
+    def log_usage(self) -> None:
+        """Log token usage per model so far."""
+        with self._lock:
+            usage = {model: dict(totals) for model, totals in self.usage.items()}
+        for model, totals in usage.items():
+            logger.info(
+                f"Gemini {model}: {totals['calls']} calls, {totals['prompt_tokens']} prompt tokens "
+                f"({totals['cached_tokens']} cached), {totals['output_tokens']} output tokens"
+            )
+
+    def clear(self) -> None:
+        """Reset token usage and stats."""
+        with self._lock:
+            self.usage = {}
+            self.stats = dict.fromkeys(self.stats, 0)
+
+
+default_client = GeminiClient()
@@ -0,0 +1,151 @@
+"""
+OpenJobs HTML to Markdown - Local reducer for raw HTML before Gemini extraction
+
+Raw careers-page HTML is mostly scripts, styles, SVG and attributes. This
+converts it to compact markdown that keeps headings, list items, table cells
+and links, so far more real listings fit in the extraction prompt.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import List, NamedTuple, Optional
+from urllib.parse import urljoin
+
+# Elements whose content is never visible text
+SKIP_TAGS = {
+    'script', 'style', 'svg', 'noscript', 'template', 'iframe', 'head',
+    'canvas', 'object', 'picture', 'video', 'audio', 'select',
+}
+
+# Elements that start a new line
+BLOCK_TAGS = {
+    'p', 'div', 'section', 'article', 'main', 'header', 'footer', 'nav', 'aside',
+    'ul', 'ol', 'table', 'thead', 'tbody', 'tr', 'form', 'dl', 'dt', 'dd',
+    'blockquote', 'pre', 'figure', 'fieldset', 'details', 'summary', 'br', 'hr',
+}
+
+HEADING_TAGS = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+
+# Rough chars-per-token ratio used to report token savings
+CHARS_PER_TOKEN = 4
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class HtmlConversion(NamedTuple):
+    """Result of converting HTML to markdown."""
+
+    markdown: str
+    input_chars: int
+    output_chars: int
+
+    @property
+    def reduction_ratio(self) -> float:
+        """How many times smaller the markdown is than the HTML (e.g. 8.0 = 8x)."""
+        return self.input_chars / self.output_chars if self.output_chars else 0.0
+
+    @property
+    def tokens_saved(self) -> int:
+        """Estimated prompt tokens saved by sending markdown instead of HTML."""
+        return (self.input_chars - self.output_chars) // CHARS_PER_TOKEN
+
+
+class _MarkdownBuilder(HTMLParser):
+    """Streaming HTML parser that emits compact markdown."""
+
+    def __init__(self, base_url: Optional[str] = None):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.parts: List[str] = []
+        self._skip_depth = 0
+        self._link_href: Optional[str] = None
+        self._link_text: List[str] = []
+
+    def _newline(self, prefix: str = "") -> None:
+        self.parts.append("\n" + prefix)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        if self._skip_depth:
+            return
+
+        if tag in HEADING_TAGS:
+            self._newline("#" * HEADING_TAGS[tag] + " ")
+        elif tag == 'li':
+            self._newline("- ")
+        elif tag in ('td', 'th'):
+            self.parts.append(" | ")
+        elif tag in BLOCK_TAGS:
+            self._newline()
+        elif tag == 'a':
+            href = dict(attrs).get('href') or ''
+            if href and not href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
+                self._link_href = urljoin(self.base_url, href) if self.base_url else href
+                self._link_text = []
+
+    def handle_startendtag(self, tag, attrs):
+        # Void elements (<br/>, <img/>) never open a skip region
+        if tag in SKIP_TAGS:
+            return
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if self._skip_depth:
+            return
+
+        if tag == 'a' and self._link_href is not None:
+            text = _WHITESPACE.sub(' ', ''.join(self._link_text)).strip()
+            if text:
+                self.parts.append(f"[{text}]({self._link_href})")
+            self._link_href = None
+        elif tag in HEADING_TAGS or tag in BLOCK_TAGS or tag == 'li':
+            self._newline()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._link_href is not None:
+            self._link_text.append(data)
+        else:
+            self.parts.append(_WHITESPACE.sub(' ', data))
+
+
+def html_to_markdown(html: str, base_url: Optional[str] = None) -> HtmlConversion:
+    """
+    Convert HTML to compact markdown, dropping non-content nodes and attributes.
+
+    Keeps headings, list items, table cells and links (resolved against
+    base_url when given). Scripts, styles, SVG and similar nodes are removed.
+
+    Args:
+        html: Raw HTML content
+        base_url: Page URL used to resolve relative links
+
+    Returns:
+        HtmlConversion with the markdown and input/output sizes
+
+    Example:
+        >>> html_to_markdown('<h2>Jobs</h2><a href="/j/1">Engineer</a>').markdown
+        '## Jobs\\n[Engineer](/j/1)'
+    """
+    if not html:
+        return HtmlConversion("", 0, 0)
+
+    builder = _MarkdownBuilder(base_url)
+    builder.feed(html)
+    builder.close()
+
+    lines = []
+    for line in ''.join(builder.parts).split('\n'):
+        line = _WHITESPACE.sub(' ', line).strip(' |')
+        # Drop empty lines and bare list/heading markers left by empty elements
+        if line and line.strip('#- '):
+            lines.append(line)
+
+    markdown = '\n'.join(lines)
+    return HtmlConversion(markdown, len(html), len(markdown))
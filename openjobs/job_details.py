@@ -0,0 +1,222 @@
+"""
+OpenJobs Job Details - Concurrent job-detail page fetching for enrichment
+
+scrape_careers_page only sees the listing page, so process_job usually has no
+description and enrichment falls back to title-only classification. This
+fetches each job_url with per-host concurrency limits, URL deduplication
+(including requests already in flight) and an LRU cache, cheapest tier first:
+a plain HTTP fetch using the JSON-LD JobPosting description or the main
+content block, and Firecrawl rendering only when that yields nothing.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Optional
+from urllib.parse import urldefrag, urlparse
+
+from .logger import logger
+from .main_content import SOURCE_JSON_LD, extract_main_content
+from .scraper import DEFAULT_WAIT_MS, fetch_raw_html, firecrawl_request, is_valid_url
+
+# Detail pages are far smaller than listing pages
+DETAIL_MAX_BYTES = 2 * 1024 * 1024
+
+# Shorter text is treated as "no description" and the next tier is tried
+MIN_DESCRIPTION_CHARS = 300
+
+# Matches the processor's safe_desc limit
+MAX_DESCRIPTION_CHARS = 15000
+
+DEFAULT_MAX_PER_HOST = 4
+DEFAULT_DETAIL_WORKERS = 16
+DEFAULT_CACHE_SIZE = 10000
+
+# Where a description came from (SOURCE_JSON_LD is shared with main_content)
+SOURCE_HTML = "html"
+SOURCE_FIRECRAWL = "firecrawl"
+
+
+class JobDetail(NamedTuple):
+    """Description found for a job URL and the tier that produced it."""
+
+    description: str
+    source: Optional[str]
+
+
+def normalize_job_url(url: str) -> str:
+    """Normalize a job URL for deduplication (drop fragment, lowercase host)."""
+    url, _ = urldefrag(url or "")
+    parsed = urlparse(url)
+    return parsed._replace(scheme=parsed.scheme.lower(), netloc=parsed.netloc.lower()).geturl()
+
+
+class DetailFetcher:
+    """
+    Fetch job descriptions concurrently with per-host limits and caching.
+
+    One instance should be shared across a batch so deduplication, the cache
+    and the per-host limits apply to all of it.
+
+    Example:
+        >>> fetcher = DetailFetcher(max_per_host=2)
+        >>> jobs = fetcher.fetch_all(jobs)  # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        max_workers: int = DEFAULT_DETAIL_WORKERS,
+        firecrawl_api_key: Optional[str] = None,
+        use_firecrawl: bool = True,
+        cache_size: int = DEFAULT_CACHE_SIZE
+    ):
+        self.max_per_host = max_per_host
+        self.max_workers = max_workers
+        self.firecrawl_api_key = firecrawl_api_key
+        self.use_firecrawl = use_firecrawl
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._cache: "OrderedDict[str, JobDetail]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self.stats: Dict[str, int] = {"cache_hits": 0, "deduplicated": 0, "fetched": 0, "empty": 0, "invalid": 0}
+
+    @contextmanager
+    def _host_slot(self, url: str):
+        host = urlparse(url).hostname or ""
+        with self._lock:
+            slot = self._host_slots.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+        with slot:
+            yield
+
+    def _fetch_uncached(self, url: str) -> JobDetail:
+        with self._host_slot(url):
+            html = fetch_raw_html(url, DETAIL_MAX_BYTES)
+            if html:
+                # JSON-LD description first, else the densest text block
+                main = extract_main_content(html, base_url=url)
+                if len(main.text) >= MIN_DESCRIPTION_CHARS:
+                    source = SOURCE_JSON_LD if main.source == SOURCE_JSON_LD else SOURCE_HTML
+                    return JobDetail(main.text[:MAX_DESCRIPTION_CHARS], source)
+
+            # Client-rendered page: only now pay for a Firecrawl render
+            if self.use_firecrawl:
+                markdown = firecrawl_request(url, DEFAULT_WAIT_MS, self.firecrawl_api_key)
+                text = extract_main_content(markdown).text
+                if len(text) >= MIN_DESCRIPTION_CHARS:
+                    return JobDetail(text[:MAX_DESCRIPTION_CHARS], SOURCE_FIRECRAWL)
+
+        return JobDetail("", None)
+
+    def get(self, url: str) -> JobDetail:
+        """
+        Return the description for a job URL, fetching it at most once.
+
+        Concurrent calls for the same URL wait for the first fetch instead of
+        starting their own.
+
+        Args:
+            url: Job posting URL
+
+        Returns:
+            JobDetail (empty description if none was found or the URL is
+            not allowed, e.g. a private or metadata address)
+        """
+        key = normalize_job_url(url)
+        # Job URLs come from page content, so they get the same SSRF checks as careers URLs
+        valid, reason = is_valid_url(key)
+        if not valid:
+            logger.warning(f"Skipping detail fetch for {key}: {reason}")
+            with self._lock:
+                self.stats["invalid"] += 1
+            return JobDetail("", None)
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return self._cache[key]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats["deduplicated"] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            detail = self._fetch_uncached(key)
+        except Exception as e:
+            logger.debug(f"Detail fetch failed for {key}: {e}")
+            detail = JobDetail("", None)
+
+        with self._lock:
+            self.stats["fetched" if detail.description else "empty"] += 1
+            self._cache[key] = detail
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            del self._inflight[key]
+        future.set_result(detail)
+        return detail
+
+    def fetch(self, job: Dict) -> Dict:
+        """
+        Add description and description_source to a job entry.
+
+        Jobs that already have a description, or whose job_url is the
+        listing page itself (the "#job-N" fallback), are returned unchanged.
+
+        Args:
+            job: Job entry from scrape_careers_page
+
+        Returns:
+            The job (a copy when a description was added)
+        """
+        url = job.get("job_url") or job.get("url")
+        if job.get("description") or not url or not url.startswith("http"):
+            return job
+        if job.get("source_url") and normalize_job_url(url) == normalize_job_url(job["source_url"]):
+            return job
+
+        detail = self.get(url)
+        if not detail.description:
+            return job
+        return dict(job, description=detail.description, description_source=detail.source)
+
+    def fetch_all(self, jobs: List[Dict]) -> List[Dict]:
+        """
+        Fetch descriptions for many jobs in parallel, preserving order.
+
+        Args:
+            jobs: Job entries from scrape_careers_page
+
+        Returns:
+            Job entries with descriptions filled in where found
+        """
+        if not jobs:
+            return []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="openjobs-details") as pool:
+            results = list(pool.map(self.fetch, jobs))
+        logger.info(
+            f"Fetched details for {sum(1 for j in results if j.get('description'))}/{len(jobs)} jobs "
+            f"({self.stats})"
+        )
+        return results
+
+
+def fetch_job_details(jobs: List[Dict], **kwargs) -> List[Dict]:
+    """
+    Fill in descriptions for scraped jobs by fetching their job_url pages.
+
+    Args:
+        jobs: Job entries from scrape_careers_page
+        **kwargs: Options for DetailFetcher
+
+    Returns:
+        Job entries with description and description_source where found
+    """
+    return DetailFetcher(**kwargs).fetch_all(jobs)
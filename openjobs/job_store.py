@@ -0,0 +1,342 @@
+"""
+OpenJobs Job Store - Embedded SQLite job store with a change feed
+
+scrape_careers_page returns a fresh list every run, with a new date_scraped on
+every job, so consumers had to diff runs themselves. JobStore keeps one row
+per job (keyed by job_url, or by slug for listing-page fallbacks) in SQLite
+with WAL, records first_seen/last_seen, marks jobs removed when their careers
+page no longer lists them, and serves changes_since(timestamp) so downstream
+systems process only new, updated and removed jobs.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+from urllib.parse import urldefrag, urlparse
+
+from .logger import logger
+
+DEFAULT_STORE_PATH = os.getenv("OPENJOBS_JOB_STORE", "openjobs.db")
+
+CHANGE_NEW = "new"
+CHANGE_UPDATED = "updated"
+CHANGE_REMOVED = "removed"
+
+# Fields that change on every scrape without the job changing
+VOLATILE_FIELDS = {"date_scraped"}
+
+# SQLite's default limit on host parameters is 999 in older builds
+_QUERY_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_key TEXT PRIMARY KEY,
+    job_url TEXT,
+    slug TEXT,
+    company TEXT,
+    title TEXT,
+    category TEXT,
+    source_url TEXT,
+    content_hash TEXT NOT NULL,
+    data TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    removed_at TEXT,
+    changed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs (company);
+CREATE INDEX IF NOT EXISTS idx_jobs_category ON jobs (category);
+CREATE INDEX IF NOT EXISTS idx_jobs_source_url ON jobs (source_url);
+CREATE INDEX IF NOT EXISTS idx_jobs_changed_at ON jobs (changed_at);
+"""
+
+
+class SyncResult(NamedTuple):
+    """Counts from writing one batch of jobs."""
+
+    new: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+
+class JobChange(NamedTuple):
+    """One entry of the change feed."""
+
+    kind: str
+    job_key: str
+    job: Dict
+    changed_at: str
+
+
+def job_key(job: Dict) -> str:
+    """
+    Identity of a job across scrapes.
+
+    The job_url (without fragment), unless it is the careers page itself with
+    a "#job-N" fragment, whose index shifts when listings move; those fall
+    back to the slug.
+    """
+    url = urldefrag(job.get("job_url") or "")[0]
+    source_url = urldefrag(job.get("source_url") or "")[0]
+    if url and url != source_url:
+        parsed = urlparse(url)
+        return parsed._replace(scheme=parsed.scheme.lower(), netloc=parsed.netloc.lower()).geturl()
+    return job.get("slug") or f"{job.get('company', '')}/{job.get('title') or job.get('title_original', '')}"
+
+
+def _content_hash(job: Dict) -> str:
+    stable = {k: v for k, v in job.items() if k not in VOLATILE_FIELDS}
+    return hashlib.sha1(json.dumps(stable, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _timestamp(value: Union[str, datetime, None]) -> str:
+    # Fixed precision so ISO strings compare in time order
+    if value is None:
+        value = datetime.now()
+    return value.isoformat(timespec="microseconds") if isinstance(value, datetime) else value
+
+
+class JobStore:
+    """
+    SQLite job store with upserts and a new/updated/removed change feed.
+
+    Safe to share between threads: each thread gets its own connection, and
+    WAL lets readers run while a batch is written.
+
+    Example:
+        >>> store = JobStore(":memory:")
+        >>> store.sync_source("https://acme.com/careers", jobs)  # doctest: +SKIP
+        >>> store.changes_since("2025-01-01T00:00:00")  # doctest: +SKIP
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        # An in-memory database exists per connection, so share one
+        self._shared = self._connect() if path == ":memory:" else None
+        self._conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=self.path != ":memory:")
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._shared is not None:
+            return self._shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = self._shared or getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+            self._shared = None
+
+    def _existing(self, keys: List[str]) -> Dict[str, sqlite3.Row]:
+        rows = {}
+        for start in range(0, len(keys), _QUERY_BATCH):
+            batch = keys[start:start + _QUERY_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            for row in self._conn.execute(
+                f"SELECT job_key, content_hash, removed_at FROM jobs WHERE job_key IN ({placeholders})", batch
+            ):
+                rows[row["job_key"]] = row
+        return rows
+
+    def upsert_jobs(self, jobs: Iterable[Dict], now: Union[str, datetime, None] = None) -> SyncResult:
+        """
+        Insert new jobs and update changed ones.
+
+        Unchanged jobs only get last_seen bumped; jobs that were marked
+        removed and are listed again count as updated.
+
+        Args:
+            jobs: Job entries (from scrape_careers_page or process_job)
+            now: Timestamp of the scrape (default: current time)
+
+        Returns:
+            SyncResult with new/updated/unchanged counts
+        """
+        now = _timestamp(now)
+        by_key: Dict[str, Dict] = {}
+        for job in jobs:
+            by_key[job_key(job)] = job
+        if not by_key:
+            return SyncResult()
+
+        inserts, updates, touches = [], [], []
+        with self._write_lock, self._conn as conn:
+            existing = self._existing(list(by_key))
+            for key, job in by_key.items():
+                content_hash = _content_hash(job)
+                columns = (
+                    job.get("job_url"), job.get("slug"), job.get("company"),
+                    job.get("title") or job.get("title_original"), job.get("category"), job.get("source_url"),
+                    content_hash, json.dumps(job, default=str),
+                )
+                row = existing.get(key)
+                if row is None:
+                    inserts.append((key, *columns, now, now, now, now))
+                elif row["content_hash"] != content_hash or row["removed_at"] is not None:
+                    updates.append((*columns, now, now, now, key))
+                else:
+                    touches.append((now, key))
+
+            conn.executemany(
+                "INSERT INTO jobs (job_key, job_url, slug, company, title, category, source_url, content_hash, "
+                "data, first_seen, last_seen, updated_at, changed_at) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                inserts
+            )
+            conn.executemany(
+                "UPDATE jobs SET job_url=?, slug=?, company=?, title=?, category=?, source_url=?, content_hash=?, "
+                "data=?, last_seen=?, updated_at=?, changed_at=?, removed_at=NULL WHERE job_key=?",
+                updates
+            )
+            conn.executemany("UPDATE jobs SET last_seen=? WHERE job_key=?", touches)
+
+        return SyncResult(new=len(inserts), updated=len(updates), unchanged=len(touches))
+
+    def mark_removed(
+        self,
+        source_url: str,
+        keep_keys: Iterable[str],
+        now: Union[str, datetime, None] = None
+    ) -> int:
+        """
+        Mark jobs of a careers page removed unless their key is in keep_keys.
+
+        Args:
+            source_url: Careers page the jobs were scraped from
+            keep_keys: Keys of the jobs the page still lists
+            now: Timestamp of the scrape (default: current time)
+
+        Returns:
+            Number of jobs marked removed
+        """
+        now = _timestamp(now)
+        keep = set(keep_keys)
+        with self._write_lock, self._conn as conn:
+            listed = conn.execute(
+                "SELECT job_key FROM jobs WHERE source_url = ? AND removed_at IS NULL", (source_url,)
+            ).fetchall()
+            gone = [(now, now, row["job_key"]) for row in listed if row["job_key"] not in keep]
+            conn.executemany("UPDATE jobs SET removed_at=?, changed_at=? WHERE job_key=?", gone)
+        return len(gone)
+
+    def sync_source(
+        self,
+        source_url: str,
+        jobs: List[Dict],
+        now: Union[str, datetime, None] = None,
+        listed: Optional[Iterable[Dict]] = None
+    ) -> SyncResult:
+        """
+        Store a full scrape of one careers page.
+
+        Upserts its jobs and marks jobs it no longer lists as removed.
+
+        Args:
+            source_url: Careers page URL
+            jobs: Jobs to store
+            now: Timestamp of the scrape (default: current time)
+            listed: Every job currently on the page, when jobs is only part of
+                    it (e.g. after filtering or failed enrichment); jobs not
+                    stored but still listed are left as they are
+
+        Returns:
+            SyncResult with new/updated/unchanged/removed counts
+        """
+        now = _timestamp(now)
+        result = self.upsert_jobs(jobs, now)
+        keep_keys = {job_key(job) for job in (jobs if listed is None else listed)}
+        removed = self.mark_removed(source_url, keep_keys, now)
+        result = result._replace(removed=removed)
+        logger.info(
+            f"Stored {source_url}: {result.new} new, {result.updated} updated, "
+            f"{result.unchanged} unchanged, {result.removed} removed"
+        )
+        return result
+
+    def changes_since(self, timestamp: Union[str, datetime], limit: Optional[int] = None) -> List[JobChange]:
+        """
+        Jobs that were added, changed or removed after a timestamp.
+
+        Args:
+            timestamp: Exclusive lower bound (ISO string or datetime)
+            limit: Maximum number of changes to return (oldest first)
+
+        Returns:
+            JobChange entries ordered by change time
+        """
+        since = _timestamp(timestamp)
+        query = "SELECT job_key, data, first_seen, removed_at, changed_at FROM jobs WHERE changed_at > ? " \
+                "ORDER BY changed_at, job_key"
+        params: list = [since]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        changes = []
+        for row in self._conn.execute(query, params):
+            if row["removed_at"] is not None:
+                kind = CHANGE_REMOVED
+            elif row["first_seen"] > since:
+                kind = CHANGE_NEW
+            else:
+                kind = CHANGE_UPDATED
+            changes.append(JobChange(kind, row["job_key"], json.loads(row["data"]), row["changed_at"]))
+        return changes
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the stored job for a key, or None."""
+        row = self._conn.execute("SELECT data FROM jobs WHERE job_key = ?", (key,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def jobs(
+        self,
+        company: Optional[str] = None,
+        category: Optional[str] = None,
+        source_url: Optional[str] = None,
+        include_removed: bool = False
+    ) -> List[Dict]:
+        """
+        List stored jobs, filtered by the indexed columns.
+
+        Args:
+            company: Only jobs of this company
+            category: Only jobs in this category
+            source_url: Only jobs from this careers page
+            include_removed: Include jobs no longer listed
+
+        Returns:
+            Job dicts with first_seen and last_seen added
+        """
+        clauses, params = [], []
+        for column, value in (("company", company), ("category", category), ("source_url", source_url)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if not include_removed:
+            clauses.append("removed_at IS NULL")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        rows = self._conn.execute(f"SELECT data, first_seen, last_seen FROM jobs {where} ORDER BY first_seen", params)
+        return [dict(json.loads(row["data"]), first_seen=row["first_seen"], last_seen=row["last_seen"]) for row in rows]
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE removed_at IS NULL").fetchone()[0]
@@ -0,0 +1,182 @@
+"""
+OpenJobs Key Pool - Per-key rate limits and health tracking for API keys
+
+Gemini and Firecrawl quotas are per key, so one key behind one global limiter
+caps throughput at that key's quota. A KeyPool holds several keys, each with
+its own requests-per-minute bucket, and sends every request to the
+least-loaded key. A key answering 429 (rate limited) or 403 (quota exhausted
+or revoked) is taken out of rotation for a cooldown that doubles while it
+keeps failing. Keys come from GOOGLE_API_KEY / FIRECRAWL_API_KEY plus the
+comma-separated GOOGLE_API_KEYS / FIRECRAWL_API_KEYS.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional
+
+from .logger import logger
+
+# Per-key request rates
+GEMINI_REQUESTS_PER_MINUTE = int(os.getenv("OPENJOBS_GEMINI_RPM", "60"))
+FIRECRAWL_REQUESTS_PER_MINUTE = int(os.getenv("OPENJOBS_FIRECRAWL_RPM", "30"))
+
+# Seconds a failing key sits out, doubled per consecutive failure up to the max
+KEY_COOLDOWN = float(os.getenv("OPENJOBS_KEY_COOLDOWN", "60"))
+MAX_KEY_COOLDOWN = 600.0
+
+# Rate limited, or quota exhausted / key not allowed
+UNHEALTHY_STATUS_CODES = {403, 429}
+
+_WINDOW = 60.0
+
+
+def keys_from_env(name: str) -> List[str]:
+    """Keys from NAME and the comma-separated NAMEs, without duplicates."""
+    keys = [os.getenv(name, "")] + os.getenv(f"{name}S", "").split(",")
+    return list(dict.fromkeys(key.strip() for key in keys if key.strip()))
+
+
+def _label(key: str) -> str:
+    """Loggable key name that does not leak the key."""
+    return f"...{key[-4:]}" if key else "(no key)"
+
+
+class _KeyState:
+    """Recent requests and health of one key."""
+
+    def __init__(self):
+        self.requests: Deque[float] = deque()
+        self.last_used = 0.0
+        self.failures = 0
+        self.cooldown_until = 0.0
+
+    def load(self, now: float) -> int:
+        while self.requests and self.requests[0] <= now - _WINDOW:
+            self.requests.popleft()
+        return len(self.requests)
+
+
+class KeyPool:
+    """
+    API keys with per-key rate buckets, least-loaded selection and cooldowns.
+
+    Thread-safe. With no keys the pool rate-limits the "" key, so keyless
+    endpoints (self-hosted Firecrawl) behave like a single-key pool.
+
+    Example:
+        >>> pool = KeyPool(["key-a", "key-b"], requests_per_minute=60)
+        >>> key = pool.wait()        # least-loaded healthy key, rate limited
+        >>> pool.report(key, 429)    # key sits out its cooldown
+        >>> pool.select()
+        'key-b'
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[str] = (),
+        requests_per_minute: int = GEMINI_REQUESTS_PER_MINUTE,
+        cooldown: float = KEY_COOLDOWN
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._keys: List[str] = []
+        self._states: Dict[str, _KeyState] = {}
+        self.stats: Dict[str, int] = {"requests": 0, "waits": 0, "cooldowns": 0}
+        for key in keys:
+            self.add(key)
+
+    @property
+    def keys(self) -> List[str]:
+        """Keys in rotation order of addition."""
+        with self._lock:
+            return list(self._keys)
+
+    def add(self, key: str) -> None:
+        """Put a key into rotation."""
+        with self._lock:
+            if key and key not in self._states:
+                self._keys.append(key)
+                self._states[key] = _KeyState()
+
+    def _state(self, key: str) -> _KeyState:
+        # Keys passed explicitly by callers get a bucket without joining the rotation
+        return self._states.setdefault(key, _KeyState())
+
+    def _pick(self, now: float) -> str:
+        """Least-loaded key not cooling down (or the one back soonest)."""
+        if not self._keys:
+            return ""
+        healthy = [key for key in self._keys if self._states[key].cooldown_until <= now]
+        if not healthy:
+            return min(self._keys, key=lambda key: self._states[key].cooldown_until)
+        return min(healthy, key=lambda key: (self._states[key].load(now), self._states[key].last_used))
+
+    def select(self) -> str:
+        """The key the next request would use ("" when the pool is empty)."""
+        with self._lock:
+            return self._pick(time.monotonic())
+
+    def wait(self, key: Optional[str] = None) -> str:
+        """
+        Wait for a request slot and record the request.
+
+        Args:
+            key: Key the request must use (e.g. one passed by the caller, or
+                 the key a cached content belongs to); default picks the
+                 least-loaded healthy key
+
+        Returns:
+            The key to send the request with
+        """
+        waited = False
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                chosen = self._pick(now) if key is None else key
+                state = self._state(chosen)
+                delay = 0.0
+                if key is None:
+                    delay = state.cooldown_until - now
+                if state.load(now) >= self.requests_per_minute:
+                    delay = max(delay, state.requests[0] + _WINDOW - now)
+                if delay <= 0:
+                    state.requests.append(now)
+                    state.last_used = now
+                    self.stats["requests"] += 1
+                    self.stats["waits"] += waited
+                    return chosen
+            logger.debug(f"Key {_label(chosen)} busy, waiting {delay:.1f}s")
+            waited = True
+            time.sleep(delay)
+
+    def report(self, key: str, status_code: int) -> None:
+        """Record a response status: 429/403 start a cooldown, success clears it."""
+        with self._lock:
+            state = self._state(key)
+            if status_code in UNHEALTHY_STATUS_CODES:
+                cooldown = min(self.cooldown * 2 ** state.failures, MAX_KEY_COOLDOWN)
+                state.failures += 1
+                state.cooldown_until = time.monotonic() + cooldown
+                self.stats["cooldowns"] += 1
+                logger.warning(f"Key {_label(key)} returned {status_code}, out of rotation for {cooldown:.0f}s")
+            elif status_code < 400:
+                state.failures = 0
+                state.cooldown_until = 0.0
+
+    def healthy(self, key: str) -> bool:
+        """Whether a key is in rotation right now."""
+        with self._lock:
+            return self._state(key).cooldown_until <= time.monotonic()
+
+    def clear(self) -> None:
+        """Forget recent requests, cooldowns and stats (the keys stay)."""
+        with self._lock:
+            self._states = {key: _KeyState() for key in self._keys}
+            self.stats = dict.fromkeys(self.stats, 0)
+
+
+gemini_keys = KeyPool(keys_from_env("GOOGLE_API_KEY"), GEMINI_REQUESTS_PER_MINUTE)
+firecrawl_keys = KeyPool(keys_from_env("FIRECRAWL_API_KEY"), FIRECRAWL_REQUESTS_PER_MINUTE)
@@ -0,0 +1,299 @@
+"""
+OpenJobs Main Content - Readability-style job description extraction
+
+Job detail pages wrap the description in navigation, headers, footers,
+"similar jobs" lists and cookie banners. This isolates the description block
+locally so enhance_job_output gets the description itself instead of page
+chrome:
+
+- HTML: the JSON-LD JobPosting description if present, otherwise the
+  container with the highest text-density score (paragraph text credited to
+  its parent and grandparent, scaled down by link density).
+- Markdown: the run of blocks with the most text, split at link lists.
+"""
+
+import json
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from .html_markdown import SKIP_TAGS, html_to_markdown
+from .prompt_compaction import prune_boilerplate
+
+# Extracted text shorter than this is not trusted; the whole page is used instead
+MIN_MAIN_CONTENT_CHARS = 200
+
+SOURCE_JSON_LD = "json_ld"
+SOURCE_DENSITY = "density"
+SOURCE_MARKDOWN = "markdown"
+SOURCE_FULL = "full"
+
+# Elements that can hold the description
+CANDIDATE_TAGS = {'div', 'section', 'article', 'main', 'td', 'body'}
+
+# Text blocks that contribute to their container's score
+PARAGRAPH_TAGS = {'p', 'li', 'pre', 'blockquote', 'dd', 'td'}
+
+# Page chrome: never a candidate, and paragraphs inside are not credited
+CHROME_TAGS = {'nav', 'header', 'footer', 'aside', 'form'}
+
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+    'source', 'track', 'wbr',
+}
+
+_NEGATIVE_HINT = re.compile(
+    r'comment|footer|nav|menu|sidebar|cookie|banner|share|social|related|similar|promo|breadcrumb',
+    re.IGNORECASE
+)
+_POSITIVE_HINT = re.compile(r'job|description|posting|content|article|main|details?', re.IGNORECASE)
+
+_LD_JSON = re.compile(
+    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE
+)
+_HTML_TAG = re.compile(r'<(?:html|body|div|p|section|article|main|span|ul|li|br|h[1-6])\b', re.IGNORECASE)
+_PAGE_TAG = re.compile(r'<(?:!doctype\s+html|html|body)\b', re.IGNORECASE)
+_MD_LINK = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+_BLOCK_SPLIT = re.compile(r'\n\s*\n')
+
+
+class MainContent(NamedTuple):
+    """Description text isolated from a page and how it was found."""
+
+    text: str
+    source: str
+    input_chars: int
+
+    @property
+    def reduction_ratio(self) -> float:
+        """How many times smaller the text is than the input."""
+        return self.input_chars / len(self.text) if self.text else 0.0
+
+
+def _iter_ld_items(data: Any) -> Iterator[Dict]:
+    """Yield JSON-LD nodes from a document, a list or an @graph."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_ld_items(item)
+    elif isinstance(data, dict):
+        yield data
+        if '@graph' in data:
+            yield from _iter_ld_items(data['@graph'])
+
+
+def json_ld_description(html: str) -> str:
+    """
+    Return the JobPosting description from JSON-LD in a page, as text.
+
+    Args:
+        html: Raw HTML content
+
+    Returns:
+        Description text, or empty string if the page has none
+    """
+    for block in _LD_JSON.findall(html or ""):
+        try:
+            data = json.loads(block)
+        except json.JSONDecodeError:
+            continue
+        for item in _iter_ld_items(data):
+            types = item.get('@type')
+            types = types if isinstance(types, list) else [types]
+            if 'JobPosting' in types and isinstance(item.get('description'), str):
+                # Descriptions are usually HTML fragments
+                return html_to_markdown(item['description']).markdown
+    return ""
+
+
+class _Node:
+    __slots__ = ('tag', 'start', 'end', 'parent', 'score', 'text_chars', 'link_chars', 'chrome', 'text')
+
+    def __init__(self, tag: str, start: int, parent: Optional["_Node"], chrome: bool):
+        self.tag = tag
+        self.start = start
+        self.end = start
+        self.parent = parent
+        self.score = 0.0
+        self.text_chars = 0
+        self.link_chars = 0
+        self.chrome = chrome
+        self.text: List[str] = []
+
+
+class _DensityScorer(HTMLParser):
+    """Score containers by the paragraph text they hold."""
+
+    def __init__(self, html: str):
+        super().__init__(convert_charrefs=True)
+        self.html = html
+        self._line_starts = [0]
+        for match in re.finditer('\n', html):
+            self._line_starts.append(match.end())
+        self.stack: List[_Node] = []
+        self.candidates: List[_Node] = []
+        self._skip_depth = 0
+        self._link_depth = 0
+
+    def _offset(self) -> int:
+        line, col = self.getpos()
+        return self._line_starts[line - 1] + col
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        if self._skip_depth or tag in VOID_TAGS:
+            return
+        if tag == 'a':
+            self._link_depth += 1
+
+        attr = dict(attrs)
+        hints = f"{attr.get('class') or ''} {attr.get('id') or ''}"
+        parent = self.stack[-1] if self.stack else None
+        chrome = (
+            (parent is not None and parent.chrome)
+            or tag in CHROME_TAGS
+            or bool(_NEGATIVE_HINT.search(hints) and not _POSITIVE_HINT.search(hints))
+        )
+        node = _Node(tag, self._offset(), parent, chrome)
+        if tag in CANDIDATE_TAGS and _POSITIVE_HINT.search(hints) and not chrome:
+            node.score += 25
+        self.stack.append(node)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if self._skip_depth or tag in VOID_TAGS:
+            return
+        if not any(node.tag == tag for node in self.stack):
+            return
+
+        end = self.html.find('>', self._offset()) + 1 or len(self.html)
+        # Close implicitly-closed children too (e.g. <p> without </p>)
+        while self.stack:
+            node = self.stack.pop()
+            node.end = end
+            self._finish(node)
+            if node.tag == tag:
+                break
+        if tag == 'a':
+            self._link_depth = max(0, self._link_depth - 1)
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        text = ' '.join(data.split())
+        if not text:
+            return
+        for node in self.stack:
+            node.text_chars += len(text)
+            if self._link_depth:
+                node.link_chars += len(text)
+        if self.stack and self.stack[-1].tag in PARAGRAPH_TAGS:
+            self.stack[-1].text.append(text)
+
+    def _finish(self, node: _Node) -> None:
+        if node.tag in PARAGRAPH_TAGS and not node.chrome:
+            text = ' '.join(node.text)
+            if len(text) >= 25:
+                score = 1 + text.count(',') + min(len(text) // 100, 3)
+                if node.parent is not None:
+                    node.parent.score += score
+                    if node.parent.parent is not None:
+                        node.parent.parent.score += score / 2
+        if node.tag in CANDIDATE_TAGS and not node.chrome:
+            self.candidates.append(node)
+
+    def close(self):
+        super().close()
+        while self.stack:
+            node = self.stack.pop()
+            node.end = len(self.html)
+            self._finish(node)
+
+
+def _best_html_block(html: str) -> Optional[str]:
+    scorer = _DensityScorer(html)
+    scorer.feed(html)
+    scorer.close()
+
+    def final_score(node: _Node) -> float:
+        link_density = node.link_chars / node.text_chars if node.text_chars else 1.0
+        return node.score * (1 - link_density)
+
+    best = max(scorer.candidates, key=final_score, default=None)
+    if best is None or final_score(best) <= 0:
+        return None
+    return html[best.start:best.end]
+
+
+def _best_markdown_run(markdown: str) -> str:
+    """Return the run of non-link blocks with the most text."""
+    blocks = [b.strip() for b in _BLOCK_SPLIT.split(prune_boilerplate(markdown)) if b.strip()]
+
+    def is_content(block: str) -> bool:
+        # Menus and related-job lists are mostly link text; descriptions are not
+        visible = _MD_LINK.sub(r'\1', block)
+        link_chars = sum(len(m.group(1)) for m in _MD_LINK.finditer(block))
+        return bool(visible.strip()) and link_chars / len(visible) <= 0.5
+
+    best: List[str] = []
+    best_chars = 0
+    run: List[str] = []
+    run_chars = 0
+    gap = 0
+    for block in blocks:
+        if is_content(block):
+            run.append(block)
+            run_chars += len(block)
+            gap = 0
+            if run_chars > best_chars:
+                best, best_chars = list(run), run_chars
+        else:
+            # Tolerate one stray block (e.g. an "Apply" link) inside the description
+            gap += 1
+            if gap > 1:
+                run, run_chars = [], 0
+    return '\n\n'.join(best)
+
+
+def is_html_page(content: str) -> bool:
+    """Whether content is a whole HTML document rather than description text or a fragment."""
+    return bool(content and _PAGE_TAG.search(content))
+
+
+def extract_main_content(content: str, base_url: Optional[str] = None) -> MainContent:
+    """
+    Isolate the job description from a detail page (HTML or markdown).
+
+    Falls back to the whole page (as text) when no block clears
+    MIN_MAIN_CONTENT_CHARS, so short plain descriptions pass through intact.
+
+    Args:
+        content: Page HTML, Firecrawl markdown or plain text
+        base_url: Page URL used to resolve relative links in HTML
+
+    Returns:
+        MainContent with the description text and the signal that found it
+    """
+    if not content:
+        return MainContent("", SOURCE_FULL, 0)
+
+    if _HTML_TAG.search(content):
+        description = json_ld_description(content)
+        if len(description) >= MIN_MAIN_CONTENT_CHARS:
+            return MainContent(description, SOURCE_JSON_LD, len(content))
+
+        block = _best_html_block(content)
+        if block:
+            text = html_to_markdown(block, base_url=base_url).markdown
+            if len(text) >= MIN_MAIN_CONTENT_CHARS:
+                return MainContent(text, SOURCE_DENSITY, len(content))
+        return MainContent(html_to_markdown(content, base_url=base_url).markdown, SOURCE_FULL, len(content))
+
+    text = _best_markdown_run(content)
+    if len(text) >= MIN_MAIN_CONTENT_CHARS:
+        return MainContent(text, SOURCE_MARKDOWN, len(content))
+    return MainContent(content.strip(), SOURCE_FULL, len(content))
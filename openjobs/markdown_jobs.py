@@ -0,0 +1,224 @@
+"""
+OpenJobs Markdown Jobs - Heuristic job-list parser for clean careers pages
+
+Many careers pages render to the same markdown shape: a heading per
+department followed by "[Title](url)" links, with the location after a
+separator or on the next line. This parses that shape without an API call and
+scores its own confidence, so extract_jobs_from_markdown only calls Gemini for
+pages the parser is unsure about.
+
+Confidence combines:
+- how many of the parsed titles look like job titles (job keywords)
+- how much of the page's job vocabulary the parsed listings account for
+  (low when listings are written in a shape the parser does not read)
+- how many listings were found (one or two links are weak evidence)
+"""
+
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .content_score import score_job_content
+from .markdown_syntax import MARKDOWN_HEADING, MARKDOWN_LINK, prefix_pattern, strip_markup
+
+# Parsed jobs are used without Gemini at or above this confidence
+MIN_HEURISTIC_CONFIDENCE = 0.75
+
+# Fewer listings than this lower the confidence
+MIN_HEURISTIC_JOBS = 3
+
+# Link text longer than this is a sentence, not a job title
+MAX_TITLE_WORDS = 12
+
+# Separators between a job link and its location on the same line
+_LOCATION_SEPARATOR = re.compile(r'^\s*(?:[-–—|·•,:]|\bin\b)\s*', re.IGNORECASE)
+# Ends a location that is followed by more columns or details
+_FIELD_END = re.compile(r'\s*(?:\||·|•|\x1f|\s[-–—]\s)')
+# Table header cells naming the department and location columns
+_DEPARTMENT_COLUMN = re.compile(r'team|department|function|area', re.IGNORECASE)
+_LOCATION_COLUMN = re.compile(r'location|office|city|where', re.IGNORECASE)
+_TABLE_RULE = re.compile(r'^\s*\|?\s*:?-{3,}')
+# Firecrawl writes line breaks inside link text as a trailing backslash
+_LINK_LINE_BREAK = re.compile(r'\\+\s*\n\s*(?:\\+\s*\n\s*)*')
+_SEGMENT = '\x1f'
+
+
+class HeuristicJobs(NamedTuple):
+    """Jobs parsed from markdown and how much to trust them."""
+
+    jobs: List[Dict]
+    confidence: float
+
+    @property
+    def confident(self) -> bool:
+        """True if the jobs can be used without a Gemini call."""
+        return self.confidence >= MIN_HEURISTIC_CONFIDENCE
+
+
+def _url_group(url: str) -> str:
+    """Job links share everything up to the last path segment."""
+    return url.rstrip('/').rsplit('/', 1)[0]
+
+
+def _is_job_keyword_text(text: str) -> bool:
+    return score_job_content(text, threshold=1).has_jobs
+
+
+def _location_after(rest: str) -> Optional[str]:
+    match = _LOCATION_SEPARATOR.match(rest)
+    if not match:
+        return None
+    location = strip_markup(_FIELD_END.split(rest[match.end():], 1)[0])
+    return location if 0 < len(location) <= 60 else None
+
+
+def _location_below(lines: List[str], index: int) -> Tuple[Optional[str], Optional[int]]:
+    """A short plain-text line right after a job line is its location."""
+    for offset in (1, 2):
+        if index + offset >= len(lines):
+            break
+        line = lines[index + offset].strip()
+        if not line:
+            continue
+        if MARKDOWN_LINK.search(line) or MARKDOWN_HEADING.match(line) or line.startswith(('-', '*', '+', '|')):
+            return None, None
+        text = strip_markup(line)
+        if 0 < len(text) <= 60 and not _is_job_keyword_text(text):
+            return text, index + offset
+        return None, None
+    return None, None
+
+
+def _table_columns(lines: List[str], index: int) -> Dict[str, int]:
+    """Department/location column indexes from the header of the table holding a line."""
+    start = index
+    while start > 0 and lines[start - 1].lstrip().startswith('|'):
+        start -= 1
+    if start + 1 >= len(lines) or not _TABLE_RULE.match(lines[start + 1]):
+        return {}
+    columns = {}
+    for position, cell in enumerate(_table_cells(lines[start])):
+        if _LOCATION_COLUMN.search(cell):
+            columns.setdefault("location", position)
+        elif _DEPARTMENT_COLUMN.search(cell):
+            columns.setdefault("department", position)
+    return columns
+
+
+def _table_cells(line: str) -> List[str]:
+    return [strip_markup(cell) for cell in line.strip().strip('|').split('|')]
+
+
+def parse_job_list(markdown: str) -> HeuristicJobs:
+    """
+    Parse a heading-and-link job list from careers page markdown.
+
+    Args:
+        markdown: Page markdown (Firecrawl output)
+
+    Returns:
+        HeuristicJobs with job dicts (title, department, location, url) and a
+        confidence between 0 and 1
+    """
+    text = _LINK_LINE_BREAK.sub(f' {_SEGMENT} ', markdown or "")
+    lines = text.splitlines()
+
+    # Candidate job links: the main content of their line, with title-like text
+    candidates = []
+    headings: Dict[int, str] = {}
+    for index, line in enumerate(lines):
+        heading = MARKDOWN_HEADING.match(line)
+        link = MARKDOWN_LINK.search(line)
+        if heading and not link:
+            level = len(heading.group(1))
+            headings = {lvl: h for lvl, h in headings.items() if lvl < level}
+            headings[level] = strip_markup(heading.group(2))
+            continue
+        if not link:
+            continue
+        prefix = prefix_pattern(line[:link.start()])
+        segments = [strip_markup(s) for s in link.group(1).split(_SEGMENT)]
+        segments = [s for s in segments if s]
+        if prefix is None or not segments:
+            continue
+        title = segments[0]
+        if not 2 <= len(title) <= 120 or len(title.split()) > MAX_TITLE_WORDS:
+            continue
+        url = link.group(2)
+        candidates.append((index, prefix, url, title, segments[1:], link.end(), dict(headings)))
+
+    if not candidates:
+        return HeuristicJobs([], 0.0)
+
+    # The listings are the group of links sharing line shape and URL path with
+    # the most job-like titles (navigation menus form groups too)
+    groups: Dict[Tuple[str, str], list] = defaultdict(list)
+    for candidate in candidates:
+        groups[(candidate[1], _url_group(candidate[2]))].append(candidate)
+    group = max(
+        groups.values(),
+        key=lambda g: (sum(_is_job_keyword_text(c[3]) for c in g), len(g))
+    )
+
+    # Department: the heading level most often directly above the listings,
+    # if it splits them ("## Open positions" over every job is not a department)
+    levels = Counter(max(h) for *_, h in group if h)
+    department_level = None
+    for level, _ in levels.most_common():
+        if len({h.get(level) for *_, h in group}) > 1:
+            department_level = level
+            break
+
+    jobs = []
+    seen = set()
+    used_lines = set()
+    for index, _, url, title, extra, link_end, heads in group:
+        if (title, url) in seen:
+            continue
+        seen.add((title, url))
+        used_lines.add(index)
+
+        department = heads.get(department_level) if department_level else None
+        location = None
+        if lines[index].lstrip().startswith('|'):
+            cells = _table_cells(lines[index])
+            columns = _table_columns(lines, index)
+            location = cells[columns["location"]] if columns.get("location", len(cells)) < len(cells) else None
+            if columns.get("department", len(cells)) < len(cells):
+                department = cells[columns["department"]] or department
+        else:
+            location = _location_after(lines[index][link_end:])
+        if not location and extra:
+            # Card links: "Title \ Engineering · Remote" inside the link text
+            parts = [strip_markup(p) for p in _FIELD_END.split(extra[-1]) if strip_markup(p)]
+            if parts and len(parts[-1]) <= 60:
+                location = parts[-1]
+                if len(parts) > 1 and not department:
+                    department = parts[0]
+        if not location:
+            location, location_line = _location_below(lines, index)
+            if location_line is not None:
+                used_lines.add(location_line)
+
+        jobs.append({"title": title, "department": department, "location": location, "url": url})
+
+    return HeuristicJobs(jobs, _confidence(lines, jobs, used_lines))
+
+
+def _confidence(lines: List[str], jobs: List[Dict], used_lines: set) -> float:
+    if not jobs:
+        return 0.0
+    keyword_share = sum(_is_job_keyword_text(job["title"]) for job in jobs) / len(jobs)
+
+    # Job vocabulary outside the parsed listings (and their headings) suggests missed jobs
+    listed = unlisted = 0
+    for index, line in enumerate(lines):
+        matches = score_job_content(line).matches
+        if index in used_lines or MARKDOWN_HEADING.match(line):
+            listed += matches
+        else:
+            unlisted += matches
+    coverage = listed / (listed + unlisted) if listed + unlisted else 0.0
+
+    size = 1.0 if len(jobs) >= MIN_HEURISTIC_JOBS else 0.5
+    return round(keyword_share * (0.5 + 0.5 * coverage) * size, 3)
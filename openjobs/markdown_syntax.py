@@ -0,0 +1,34 @@
+"""
+OpenJobs Markdown Syntax - Job-list markup shared by the markdown parsers
+
+Learned templates (extraction_templates) and the heuristic parser
+(markdown_jobs) read the same careers-page markdown: "[Title](url)" links,
+"#" headings naming departments, and list or heading markup before a job
+link. The patterns and helpers for that markup live here.
+"""
+
+import re
+from typing import Optional
+
+# A link, with optional bold around the text; groups text and url
+MARKDOWN_LINK = re.compile(r'\[(?:\*\*|__)?([^\]\n]+?)(?:\*\*|__)?\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"]*")?\s*\)')
+# A heading line; groups the "#" marks and the text
+MARKDOWN_HEADING = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+
+# Text that may precede a job link on its line: list markers, heading marks, table pipes
+_STRUCTURAL_PREFIX = re.compile(r'[\s\-*+#>|\d.]*')
+_EMPHASIS = re.compile(r'[*_`]+')
+
+
+def strip_markup(text: str) -> str:
+    """Strip emphasis and link markup from a markdown fragment."""
+    text = MARKDOWN_LINK.sub(r'\1', text)
+    return ' '.join(_EMPHASIS.sub('', text).split())
+
+
+def prefix_pattern(prefix: str) -> Optional[str]:
+    """Regex for the text before a job link, or None if it is not list/heading markup."""
+    if len(prefix) > 12 or not _STRUCTURAL_PREFIX.fullmatch(prefix):
+        return None
+    # Numbered lists change the number on every line
+    return re.sub(r'\d+', r'\\d+', re.escape(prefix))
@@ -0,0 +1,258 @@
+"""
+OpenJobs Page Diff - Differential re-extraction for recurring crawls
+
+A careers page usually changes by a few listings between crawls, yet the whole
+page was sent to Gemini again. This keeps a snapshot per URL (block hashes and
+the jobs found in each block), diffs the new markdown against it block by
+block, and sends only the added or changed blocks to Gemini. Jobs from
+unchanged blocks are kept, jobs from removed blocks are dropped and the delta
+is merged in, so extraction tokens scale with the churn rather than the page.
+"""
+
+import difflib
+import hashlib
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from .file_store import JsonFileStore
+from .logger import logger
+
+# Above this share of changed characters the whole page is re-extracted
+MAX_DELTA_RATIO = 0.5
+
+# Share of stored jobs that must be traceable to a block for a diff to be safe
+MIN_ATTRIBUTED_JOBS = 0.9
+
+# Persist snapshots across runs (in-memory only when unset)
+SNAPSHOTS_PATH = os.getenv("OPENJOBS_SNAPSHOTS_PATH", "")
+
+_BLOCK_SPLIT = re.compile(r'\n\s*\n')
+_HEADING_LINE = re.compile(r'^#{1,6}\s+\S.*$', re.MULTILINE)
+
+
+def split_blocks(markdown: str) -> List[str]:
+    """Split markdown into blank-line separated blocks."""
+    return [block.strip() for block in _BLOCK_SPLIT.split(markdown or "") if block.strip()]
+
+
+def _block_hash(block: str) -> str:
+    return hashlib.sha1(' '.join(block.split()).encode('utf-8')).hexdigest()[:16]
+
+
+def _job_block(job: Dict, blocks: List[str], match_title: bool = True) -> Optional[int]:
+    """Index of the block a job was read from (by URL, else by title unless match_title is off)."""
+    url = job.get('url')
+    if url:
+        # "/jobs/1" must not match "/jobs/12"
+        pattern = re.compile(re.escape(url) + r'(?=[)\s>"\]]|$)')
+        for index, block in enumerate(blocks):
+            if pattern.search(block):
+                return index
+    title = (job.get('title') or '').lower() if match_title else ''
+    if title:
+        for index, block in enumerate(blocks):
+            if title in block.lower():
+                return index
+    return None
+
+
+@dataclass
+class PageSnapshot:
+    """Blocks of a page at its last extraction and the block each job came from."""
+
+    url: str
+    block_hashes: List[str]
+    jobs: List[Dict]
+    job_blocks: List[Optional[str]] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, url: str, markdown: str, jobs: List[Dict]) -> "PageSnapshot":
+        """Snapshot a page and attribute each job to its block."""
+        blocks = split_blocks(markdown)
+        hashes = [_block_hash(block) for block in blocks]
+        job_blocks = []
+        for job in jobs:
+            index = _job_block(job, blocks)
+            job_blocks.append(hashes[index] if index is not None else None)
+        return cls(url, hashes, jobs, job_blocks)
+
+    @property
+    def attributed_ratio(self) -> float:
+        """Share of jobs traced to a block."""
+        if not self.jobs:
+            return 1.0
+        return sum(1 for h in self.job_blocks if h is not None) / len(self.jobs)
+
+
+class PageDelta(NamedTuple):
+    """Blocks to re-extract and how much of the page they are."""
+
+    markdown: str
+    changed_blocks: int
+    changed_chars: int
+    total_chars: int
+
+    @property
+    def ratio(self) -> float:
+        """Share of the page's characters that changed."""
+        return self.changed_chars / self.total_chars if self.total_chars else 1.0
+
+
+def diff_page(snapshot: PageSnapshot, blocks: List[str]) -> PageDelta:
+    """
+    Collect the blocks of a page that are not in its snapshot.
+
+    Each run of changed blocks is sent with the block before it and the
+    nearest heading above it, so Gemini sees the department and the context.
+
+    Args:
+        snapshot: Snapshot from the previous extraction
+        blocks: Blocks of the new page (split_blocks)
+
+    Returns:
+        PageDelta with the markdown to re-extract (empty if nothing changed)
+    """
+    hashes = [_block_hash(block) for block in blocks]
+    matcher = difflib.SequenceMatcher(None, snapshot.block_hashes, hashes, autojunk=False)
+
+    parts: List[str] = []
+    changed_blocks = changed_chars = 0
+    for tag, _, _, start, end in matcher.get_opcodes():
+        if tag not in ('replace', 'insert'):
+            continue
+        context = []
+        if start > 0:
+            headings = _HEADING_LINE.findall('\n\n'.join(blocks[:start]))
+            if headings and headings[-1] not in blocks[start - 1]:
+                context.append(headings[-1])
+            context.append(blocks[start - 1])
+        parts.append('\n\n'.join(context + blocks[start:end]))
+        changed_blocks += end - start
+        changed_chars += sum(len(block) for block in blocks[start:end])
+
+    return PageDelta('\n\n'.join(parts), changed_blocks, changed_chars, sum(len(b) for b in blocks))
+
+
+def merge_jobs(snapshot: PageSnapshot, blocks: List[str], delta_jobs: List[Dict]) -> List[Dict]:
+    """
+    Merge re-extracted jobs into the jobs of blocks that are still on the page.
+
+    Args:
+        snapshot: Snapshot from the previous extraction
+        blocks: Blocks of the new page
+        delta_jobs: Jobs extracted from the changed blocks
+
+    Returns:
+        Jobs in page order
+    """
+    present = {_block_hash(block) for block in blocks}
+    # A job from a changed block stays while the page still links to it, so a
+    # failed delta extraction does not drop listings. Titles only identify jobs
+    # without a URL: a deleted "Engineer" is not kept because "Senior Engineer"
+    # is still listed
+    kept = [
+        job for job, block_hash in zip(snapshot.jobs, snapshot.job_blocks)
+        if block_hash is None or block_hash in present
+        or _job_block(job, blocks, match_title=not job.get('url')) is not None
+    ]
+
+    merged = []
+    seen = set()
+    for job in delta_jobs + kept:
+        key = (job.get('title'), job.get('url'))
+        if key not in seen:
+            seen.add(key)
+            merged.append(job)
+
+    positions = [_job_block(job, blocks) for job in merged]
+    order = sorted(range(len(merged)), key=lambda i: (positions[i] is None, positions[i] or 0, i))
+    return [merged[i] for i in order]
+
+
+class SnapshotStore(JsonFileStore[PageSnapshot]):
+    """
+    Thread-safe snapshot store, optionally persisted to a JSON file.
+
+    Writes are batched (see file_store); call flush() to persist right away.
+
+    Example:
+        >>> store = SnapshotStore()
+        >>> store.get("https://acme.com/careers") is None
+        True
+    """
+
+    kind = "page snapshots"
+
+    def _decode(self, data: Dict) -> PageSnapshot:
+        return PageSnapshot(**data)
+
+    def _encode(self, snapshot: PageSnapshot) -> Dict:
+        return asdict(snapshot)
+
+    def get(self, url: str) -> Optional[PageSnapshot]:
+        """Return the snapshot for a URL, or None."""
+        with self._lock:
+            self._load()
+            return self._records.get(url)
+
+    def put(self, snapshot: PageSnapshot) -> None:
+        """Store (or replace) a snapshot."""
+        with self._lock:
+            self._load()
+            self._records[snapshot.url] = snapshot
+            self._changed()
+
+
+default_store = SnapshotStore(SNAPSHOTS_PATH or None)
+
+
+def record_snapshot(url: str, markdown: str, jobs: List[Dict], store: Optional[SnapshotStore] = None) -> None:
+    """Store the snapshot of a page after a full extraction."""
+    store = default_store if store is None else store
+    store.put(PageSnapshot.build(url, markdown, jobs))
+
+
+def extract_changed_blocks(
+    url: str,
+    markdown: str,
+    extract: Callable[[str], List[Dict]],
+    store: Optional[SnapshotStore] = None
+) -> List[Dict]:
+    """
+    Extract jobs from a page, re-extracting only blocks changed since last time.
+
+    Falls back to extracting the whole page when there is no usable snapshot
+    or more than MAX_DELTA_RATIO of the page changed.
+
+    Args:
+        url: Careers page URL
+        markdown: Page markdown
+        extract: Extracts jobs from markdown (the Gemini call)
+        store: Snapshot store (default: module store)
+
+    Returns:
+        Jobs on the page
+    """
+    store = default_store if store is None else store
+    snapshot = store.get(url)
+    blocks = split_blocks(markdown)
+
+    if snapshot is not None and snapshot.jobs and snapshot.attributed_ratio >= MIN_ATTRIBUTED_JOBS:
+        delta = diff_page(snapshot, blocks)
+        if delta.ratio <= MAX_DELTA_RATIO:
+            delta_jobs = extract(delta.markdown) if delta.markdown else []
+            jobs = merge_jobs(snapshot, blocks, delta_jobs)
+            logger.info(
+                f"Re-extracted {delta.changed_blocks} changed blocks of {url} "
+                f"({delta.changed_chars}/{delta.total_chars} chars): {len(snapshot.jobs)} -> {len(jobs)} jobs"
+            )
+            store.put(PageSnapshot.build(url, markdown, jobs))
+            return jobs
+        logger.debug(f"{delta.ratio:.0%} of {url} changed, re-extracting the whole page")
+
+    jobs = extract(markdown)
+    if jobs:
+        store.put(PageSnapshot.build(url, markdown, jobs))
+    return jobs
@@ -0,0 +1,198 @@
+"""
+OpenJobs Partial JSON - Recover complete values from truncated model output
+
+When Gemini stops at the output-token cap the JSON it returns is cut off
+mid-value and json.loads rejects all of it. This parser keeps everything that
+was fully written: complete array elements and complete object members, with
+partially written arrays/objects kept as members of their parent object.
+Array elements must be complete, so a half-written job object is dropped
+rather than returned with missing fields.
+"""
+
+import json
+import os
+import re
+from typing import Any, NamedTuple, Optional
+
+# Gemini finishReason when output stopped at maxOutputTokens
+FINISH_MAX_TOKENS = "MAX_TOKENS"
+
+# Follow-up requests for the rest of an answer that stopped at FINISH_MAX_TOKENS
+MAX_CONTINUATIONS = int(os.getenv("OPENJOBS_MAX_CONTINUATIONS", "3"))
+
+_WHITESPACE = ' \t\r\n'
+_NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?')
+_LITERALS = {'true': True, 'false': False, 'null': None}
+
+
+class PartialJson(NamedTuple):
+    """A parsed JSON value and whether the input held all of it."""
+
+    value: Any
+    complete: bool
+
+
+class _Truncated(Exception):
+    """Input ended inside a value; carries the keepable part (or None)."""
+
+    def __init__(self, partial: Any = None):
+        super().__init__("truncated")
+        self.partial = partial
+
+
+class _PartialParser:
+    """Recursive-descent JSON parser that tolerates a truncated tail."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+
+    def _error(self, msg: str):
+        raise json.JSONDecodeError(msg, self.text, self.pos)
+
+    def _skip_ws(self) -> None:
+        while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+            self.pos += 1
+        if self.pos >= len(self.text):
+            raise _Truncated()
+
+    def value(self) -> Any:
+        self._skip_ws()
+        char = self.text[self.pos]
+        if char == '[':
+            return self._array()
+        if char == '{':
+            return self._object()
+        if char == '"':
+            return self._string()
+        return self._scalar()
+
+    def _array(self) -> list:
+        items: list = []
+        self.pos += 1
+        try:
+            self._skip_ws()
+        except _Truncated:
+            raise _Truncated(items)
+        if self.text[self.pos] == ']':
+            self.pos += 1
+            return items
+        while True:
+            try:
+                items.append(self.value())
+                self._skip_ws()
+            except _Truncated:
+                # Drop the half-written element, keep the complete ones
+                raise _Truncated(items)
+            char = self.text[self.pos]
+            self.pos += 1
+            if char == ']':
+                return items
+            if char != ',':
+                self.pos -= 1
+                self._error("Expecting ',' delimiter")
+
+    def _object(self) -> dict:
+        members: dict = {}
+        self.pos += 1
+        try:
+            self._skip_ws()
+        except _Truncated:
+            raise _Truncated(members)
+        if self.text[self.pos] == '}':
+            self.pos += 1
+            return members
+        while True:
+            try:
+                self._skip_ws()
+                if self.text[self.pos] != '"':
+                    self._error("Expecting property name enclosed in double quotes")
+                key = self._string()
+                self._skip_ws()
+                if self.text[self.pos] != ':':
+                    self._error("Expecting ':' delimiter")
+                self.pos += 1
+            except _Truncated:
+                raise _Truncated(members)
+            try:
+                members[key] = self.value()
+                self._skip_ws()
+            except _Truncated as e:
+                # A partially written array/object is still useful as a member
+                if isinstance(e.partial, (list, dict)):
+                    members[key] = e.partial
+                raise _Truncated(members)
+            char = self.text[self.pos]
+            self.pos += 1
+            if char == '}':
+                return members
+            if char != ',':
+                self.pos -= 1
+                self._error("Expecting ',' delimiter")
+
+    def _string(self) -> str:
+        end = self.pos + 1
+        while True:
+            end = self.text.find('"', end)
+            if end == -1:
+                raise _Truncated()
+            backslashes = 0
+            while self.text[end - 1 - backslashes] == '\\':
+                backslashes += 1
+            if backslashes % 2 == 0:
+                break
+            end += 1
+        value = json.loads(self.text[self.pos:end + 1])
+        self.pos = end + 1
+        return value
+
+    def _scalar(self) -> Any:
+        rest = self.text[self.pos:self.pos + 5]
+        for literal, value in _LITERALS.items():
+            if rest.startswith(literal):
+                self.pos += len(literal)
+                return value
+            if literal.startswith(rest) and self.pos + len(rest) == len(self.text):
+                raise _Truncated()
+
+        match = _NUMBER.match(self.text, self.pos)
+        if not match:
+            self._error("Expecting value")
+        # A number running into the end of input may have been cut short
+        if match.end() == len(self.text):
+            raise _Truncated()
+        self.pos = match.end()
+        return json.loads(match.group(0))
+
+
+def parse_partial_json(text: str, start: Optional[int] = None) -> PartialJson:
+    """
+    Parse JSON that may be truncated, keeping every complete part.
+
+    Args:
+        text: JSON text, possibly cut off mid-value
+        start: Index where the value starts (default: first '[' or '{')
+
+    Returns:
+        PartialJson with the recovered value (None if nothing was complete)
+        and whether the whole value was present
+
+    Raises:
+        json.JSONDecodeError: If the text is malformed before it ends
+
+    Example:
+        >>> parse_partial_json('[{"title": "A"}, {"title": "B"}, {"ti')
+        PartialJson(value=[{'title': 'A'}, {'title': 'B'}], complete=False)
+    """
+    if start is None:
+        starts = [i for i in (text.find('['), text.find('{')) if i != -1]
+        if not starts:
+            return PartialJson(None, False)
+        start = min(starts)
+
+    parser = _PartialParser(text)
+    parser.pos = start
+    try:
+        return PartialJson(parser.value(), True)
+    except _Truncated as e:
+        return PartialJson(e.partial, False)
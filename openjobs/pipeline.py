@@ -0,0 +1,396 @@
+"""
+OpenJobs Pipeline - Bounded-queue executor for scrape -> extract -> enrich
+
+A batch used to run as one synchronous chain per URL. Here each stage
+(render, extract, detail fetch, enrich) has its own worker pool and the stages
+are connected by bounded queues, so a slow stage applies backpressure instead
+of letting work pile up in memory. Each stage reports throughput and queue
+depth, which shows the bottleneck so it can be scaled on its own.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from .job_details import DetailFetcher
+from .job_store import JobStore
+from .logger import logger
+from .processor import process_job
+from .scraper import (
+    _format_job_entry,
+    _resolve_careers_target,
+    extract_jobs_from_markdown,
+    scrape_with_firecrawl,
+)
+
+# Default workers per stage: rendering and enrichment are bounded by API rate
+# limits, extraction and detail fetches by network latency
+DEFAULT_RENDER_WORKERS = 4
+DEFAULT_EXTRACT_WORKERS = 4
+DEFAULT_DETAIL_WORKERS = 8
+DEFAULT_ENRICH_WORKERS = 4
+
+# Items a stage's input queue holds before upstream workers block
+DEFAULT_QUEUE_SIZE = 64
+
+_DONE = object()
+
+
+@dataclass
+class StageMetrics:
+    """Counters for one pipeline stage."""
+
+    name: str
+    workers: int
+    processed: int = 0
+    emitted: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the stage received its first item."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Input items processed per second."""
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of worker time spent busy (1.0 = every worker always busy)."""
+        capacity = self.elapsed * self.workers
+        return min(1.0, self.busy_seconds / capacity) if capacity else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.processed} in / {self.emitted} out, {self.errors} errors, "
+            f"{self.throughput:.2f}/s, queue {self.queue_depth} (max {self.max_queue_depth}), "
+            f"{self.utilization:.0%} busy x{self.workers}"
+        )
+
+
+class Stage:
+    """
+    One pipeline stage: a function run by a pool of workers.
+
+    The function takes one input item and returns an iterable of output items
+    (empty to drop the item, several to fan out - e.g. one page to many jobs).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Iterable[Any]],
+        workers: int = 1,
+        queue_size: int = DEFAULT_QUEUE_SIZE
+    ):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+
+
+class Pipeline:
+    """
+    Run items through stages connected by bounded queues.
+
+    Example:
+        >>> pipeline = Pipeline([Stage("double", lambda x: [x * 2], workers=2)])
+        >>> sorted(pipeline.run([1, 2, 3]))
+        [2, 4, 6]
+    """
+
+    def __init__(self, stages: List[Stage]):
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        self.stages = stages
+        self._lock = threading.Lock()
+        self._metrics = {s.name: StageMetrics(s.name, s.workers) for s in stages}
+        self._queues: List[queue.Queue] = []
+        self._cancelled = threading.Event()
+
+    def metrics(self) -> List[StageMetrics]:
+        """Snapshot of per-stage metrics, in stage order."""
+        with self._lock:
+            snapshot = []
+            for stage, q in zip(self.stages, self._queues or [None] * len(self.stages)):
+                m = self._metrics[stage.name]
+                snapshot.append(replace(m, queue_depth=q.qsize() if q else 0))
+            return snapshot
+
+    def bottleneck(self) -> Optional[StageMetrics]:
+        """The stage whose workers are busiest, or None before any work."""
+        active = [m for m in self.metrics() if m.started_at is not None]
+        return max(active, key=lambda m: (m.utilization, m.max_queue_depth)) if active else None
+
+    def log_metrics(self) -> None:
+        """Log one line per stage plus the current bottleneck."""
+        for m in self.metrics():
+            logger.info(f"Pipeline stage {m}")
+        slowest = self.bottleneck()
+        if slowest:
+            logger.info(f"Pipeline bottleneck: {slowest.name}")
+
+    def cancel(self) -> None:
+        """
+        Stop the current run: nothing more is fed and queued items are dropped.
+
+        Items a worker is already processing finish in the background; run()
+        calls this itself when the caller stops iterating early.
+        """
+        self._cancelled.set()
+
+    def _put(self, index: int, item: Any) -> None:
+        q = self._queues[index]
+        q.put(item)
+        if index < len(self.stages) and item is not _DONE:
+            with self._lock:
+                m = self._metrics[self.stages[index].name]
+                m.max_queue_depth = max(m.max_queue_depth, q.qsize())
+
+    def _worker(self, index: int, remaining: List[int]) -> None:
+        stage = self.stages[index]
+        m = self._metrics[stage.name]
+        inbox = self._queues[index]
+
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            if self._cancelled.is_set():
+                # Drain without processing so upstream puts never block
+                continue
+
+            start = time.time()
+            with self._lock:
+                if m.started_at is None:
+                    m.started_at = start
+            outputs: List[Any] = []
+            failed = False
+            try:
+                outputs = list(stage.func(item) or [])
+            except Exception as e:
+                failed = True
+                logger.error(f"Pipeline stage {stage.name} failed: {e}")
+
+            with self._lock:
+                m.processed += 1
+                m.errors += failed
+                m.emitted += len(outputs)
+                m.busy_seconds += time.time() - start
+
+            # Blocks when the next stage is behind (backpressure)
+            for output in outputs:
+                if self._cancelled.is_set():
+                    break
+                self._put(index + 1, output)
+
+        # Last worker out tells every worker of the next stage to stop
+        with self._lock:
+            remaining[index] -= 1
+            last = remaining[index] == 0
+            if last:
+                m.finished_at = time.time()
+        if last:
+            downstream = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+            for _ in range(downstream):
+                self._queues[index + 1].put(_DONE)
+
+    def run(self, items: Iterable[Any]) -> Iterator[Any]:
+        """
+        Feed items into the first stage and yield outputs of the last stage.
+
+        Outputs arrive in completion order, not input order. Closing the
+        generator early cancels the run.
+
+        Args:
+            items: Inputs for the first stage
+
+        Yields:
+            Outputs of the last stage
+
+        Raises:
+            Whatever iterating items raised, once the items fed before it
+            have been yielded
+        """
+        self._cancelled.clear()
+        self._queues = [queue.Queue(maxsize=s.queue_size) for s in self.stages]
+        self._queues.append(queue.Queue())
+        remaining = [s.workers for s in self.stages]
+
+        threads = []
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker, args=(index, remaining),
+                    name=f"openjobs-{stage.name}-{n}", daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        feed_error: List[BaseException] = []
+
+        def feed():
+            try:
+                for item in items:
+                    if self._cancelled.is_set():
+                        break
+                    self._put(0, item)
+            except BaseException as e:
+                feed_error.append(e)
+            finally:
+                # Workers only stop on _DONE, so it is sent even if items raised
+                for _ in range(self.stages[0].workers):
+                    self._queues[0].put(_DONE)
+
+        feeder = threading.Thread(target=feed, name="openjobs-feeder", daemon=True)
+        feeder.start()
+
+        results = self._queues[-1]
+        finished = False
+        try:
+            while True:
+                output = results.get()
+                if output is _DONE:
+                    break
+                yield output
+            finished = True
+        finally:
+            if not finished:
+                self.cancel()
+
+        feeder.join()
+        for thread in threads:
+            thread.join()
+        if feed_error:
+            raise feed_error[0]
+
+
+def build_careers_pipeline(
+    enrich: bool = True,
+    firecrawl_api_key: Optional[str] = None,
+    google_api_key: Optional[str] = None,
+    filter_categories: Optional[List[str]] = None,
+    detail_fetcher: Optional[Callable[[Dict], Dict]] = None,
+    fetch_details: bool = False,
+    render_workers: int = DEFAULT_RENDER_WORKERS,
+    extract_workers: int = DEFAULT_EXTRACT_WORKERS,
+    detail_workers: int = DEFAULT_DETAIL_WORKERS,
+    enrich_workers: int = DEFAULT_ENRICH_WORKERS,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    on_listing: Optional[Callable[[str, List[Dict]], None]] = None
+) -> Pipeline:
+    """
+    Build the render -> extract -> details -> enrich pipeline for careers URLs.
+
+    Args:
+        enrich: Whether to use AI enrichment in the enrich stage
+        firecrawl_api_key: Optional Firecrawl API key
+        google_api_key: Optional Google API key
+        filter_categories: If provided, only emit jobs in these categories
+        detail_fetcher: Adds details (e.g. description) to a job entry
+        fetch_details: Use a shared DetailFetcher as the detail_fetcher; the
+                       details stage is omitted when neither is given
+        render_workers: Concurrent Firecrawl renders
+        extract_workers: Concurrent Gemini extractions
+        detail_workers: Concurrent detail fetches
+        enrich_workers: Concurrent enrichments
+        queue_size: Capacity of each stage's input queue
+        on_listing: Called with each careers URL and every job extracted from
+                    it, before details, enrichment and filtering
+
+    Returns:
+        Pipeline whose run() takes careers URLs and yields processed jobs
+    """
+    if fetch_details and not detail_fetcher:
+        detail_fetcher = DetailFetcher(max_workers=detail_workers, firecrawl_api_key=firecrawl_api_key).fetch
+
+    def render(url: str):
+        target = _resolve_careers_target(url, None)
+        if not target:
+            return []
+        url, company_name = target
+        page = scrape_with_firecrawl(url, api_key=firecrawl_api_key)
+        if not page:
+            logger.warning(f"No content from Firecrawl for {url}")
+            return []
+        return [(url, company_name, page)]
+
+    def extract(rendered):
+        url, company_name, page = rendered
+        jobs = extract_jobs_from_markdown(page, api_key=google_api_key)
+        logger.info(f"Extracted {len(jobs)} jobs from {company_name}")
+        now = datetime.now().isoformat()
+        entries = [_format_job_entry(job, idx, company_name, url, now) for idx, job in enumerate(jobs)]
+        if on_listing and entries:
+            on_listing(url, entries)
+        return entries
+
+    def details(job: Dict):
+        return [detail_fetcher(job)]
+
+    def process(job: Dict):
+        processed = process_job(job, enrich=enrich, api_key=google_api_key)
+        if processed is None:
+            return []
+        if filter_categories and processed.get("category") not in filter_categories:
+            return []
+        return [processed]
+
+    stages = [
+        Stage("render", render, render_workers, queue_size),
+        Stage("extract", extract, extract_workers, queue_size),
+    ]
+    if detail_fetcher:
+        stages.append(Stage("details", details, detail_workers, queue_size))
+    stages.append(Stage("enrich", process, enrich_workers, queue_size))
+    return Pipeline(stages)
+
+
+def run_careers_pipeline(
+    urls: Iterable[str],
+    store: Optional[JobStore] = None,
+    **kwargs
+) -> List[Dict[str, Any]]:
+    """
+    Scrape, extract and enrich jobs from many careers URLs concurrently.
+
+    Args:
+        urls: Careers page URLs
+        store: JobStore to sync each careers page's jobs into; pages that
+               yield no jobs are left untouched (a failed scrape is not
+               treated as every job being removed), and only jobs missing
+               from the extracted page are marked removed (not jobs that were
+               filtered out or failed enrichment)
+        **kwargs: Options for build_careers_pipeline
+
+    Returns:
+        List of processed job dicts (in completion order)
+    """
+    listings: Dict[str, List[Dict]] = {}
+    if store is not None:
+        # dict item assignment is atomic, so extract workers can share it
+        kwargs["on_listing"] = listings.__setitem__
+    pipeline = build_careers_pipeline(**kwargs)
+    jobs = list(pipeline.run(urls))
+    pipeline.log_metrics()
+
+    if store is not None:
+        by_source: Dict[str, List[Dict[str, Any]]] = {}
+        for job in jobs:
+            by_source.setdefault(job.get("source_url", ""), []).append(job)
+        now = datetime.now()
+        for source_url, listed in listings.items():
+            store.sync_source(source_url, by_source.get(source_url, []), now, listed=listed)
+    return jobs
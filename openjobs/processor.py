@@ -4,25 +4,47 @@ OpenJobs Processor - AI-powered job enrichment using Gemini
 Enhance scraped job listings with structured data extraction.
 """
 
+import hashlib
 import json
 import os
 import re
-import threading
-import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-import requests
-
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .context_cache import CHARS_PER_TOKEN, build_contents
+from .enrichment_cache import (
+    LABEL_GEMINI,
+    LABEL_LOCAL,
+    EnrichmentCache,
+    default_cache,
+    enrichment_key,
+)
+from .gemini_client import default_client, model_for, parse_json
+from .key_pool import gemini_keys
 from .logger import logger
+from .main_content import extract_main_content, is_html_page
+from .partial_json import FINISH_MAX_TOKENS, MAX_CONTINUATIONS
+from .title_classifier import confident_prediction
 
 # Gemini API configuration
 GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY", "")
-MODEL_NAME = os.getenv("GEMINI_PROCESSOR_MODEL", "gemini-2.0-flash")
+MODEL_NAME = model_for("enrichment")
 MAX_TOKENS = 8192
 TEMPERATURE = 0.2
 
+# Batched enhancement: estimated input tokens and postings per prompt
+ENHANCE_BATCH_TOKENS = int(os.getenv("OPENJOBS_ENHANCE_BATCH_TOKENS", "4000"))
+ENHANCE_BATCH_MAX_JOBS = int(os.getenv("OPENJOBS_ENHANCE_BATCH_MAX_JOBS", "8"))
+
+# Set OPENJOBS_ENHANCE_BATCHING=0 to enhance one description per call in process_jobs
+ENHANCE_BATCHING = os.getenv("OPENJOBS_ENHANCE_BATCHING", "1") != "0"
+
+CONTINUATION_PROMPT = (
+    "Your previous answer was cut off. Continue the JSON exactly where it stopped. "
+    "Output only the remaining text, without repeating anything."
+)
+
 
 def _load_config() -> Dict:
     """Load configuration from config/tech_stacks.json"""
@@ -97,30 +119,140 @@ CATEGORY_SUBCATEGORIES = {
 }
 
 
-class RateLimiter:
-    """Rate limiter for API calls."""
+# Changes when the taxonomy, allowed values or model change, invalidating cached enrichment
+TAXONOMY_VERSION = hashlib.sha1(json.dumps(
+    [MODEL_NAME, ALLOWED_CATEGORIES, CATEGORY_SUBCATEGORIES, ALLOWED_TECH_STACKS, ALLOWED_CONTRACT_TYPES],
+    sort_keys=True
+).encode("utf-8")).hexdigest()[:12]
+
+# Static prompt prefixes, placed before the per-job text so Gemini can cache them
+CLASSIFY_INSTRUCTIONS = f"""Classify the job title given below into:
+
+1. **category**: Select from: {ALLOWED_CATEGORIES}
+2. **subcategory**: Select the most relevant subcategory
+3. **similar_job_title**: A normalized version of the job title
+
+Categories and their subcategories:
+{json.dumps(CATEGORY_SUBCATEGORIES, indent=2)}
+
+Respond with JSON only:
+{{"category": "...", "subcategory": "...", "similar_job_title": "..."}}"""
+
+# Fields enhance_job_output extracts, with the instruction for each
+ENHANCE_FIELDS = {
+    "simplified_job_title": "Clean job title without seniority/gender/location",
+    "tech_stack": f"List of technologies from allowed list: {ALLOWED_TECH_STACKS[:50]}...",
+    "experience_required": 'e.g., "3-5 years" or "Not Specified"',
+    "education_level": 'e.g., "Bachelor\'s Degree" or "Not Specified"',
+    "salary_range": 'e.g., "$80,000 - $120,000 per year" or "Not Specified"',
+    "location": "Job location",
+    "remote_type": '"Remote", "Hybrid", "On-Site", or "Not Specified"',
+    "contract_type": f"From {ALLOWED_CONTRACT_TYPES}",
+    "benefits": "List of benefits mentioned",
+    "requirements": "Key requirements as list",
+}
+
+_LIST_FIELDS = {"tech_stack", "benefits", "requirements"}
+REMOTE_TYPES = ["Remote", "Hybrid", "On-Site", "Not Specified"]
+
 
-    def __init__(self, requests_per_minute: int = 60):
-        self.requests_per_minute = requests_per_minute
-        self.requests = []
-        self.lock = threading.Lock()
+def _enhance_instructions(fields: List[str], batch: bool = False) -> str:
+    """Static enrichment prompt asking for the given fields only."""
+    lines = "\n".join(f"- {name}: {ENHANCE_FIELDS[name]}" for name in fields)
+    if batch:
+        return f"""Extract structured data from each job posting given below.
 
-    def wait(self):
-        with self.lock:
-            now = datetime.now()
-            minute_ago = now - timedelta(minutes=1)
-            self.requests = [t for t in self.requests if t > minute_ago]
+Return a JSON object mapping each posting's ID to an object with these fields:
+{lines}
 
-            if len(self.requests) >= self.requests_per_minute:
-                oldest = min(self.requests)
-                sleep_time = (oldest + timedelta(minutes=1) - now).total_seconds()
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
+Respond with valid JSON only."""
+    return f"""Extract structured data from the job posting given below.
 
-            self.requests.append(now)
+Return a JSON object with these fields:
+{lines}
+
+Respond with valid JSON only."""
+
+
+def _enhance_schema(fields: List[str]) -> Dict:
+    """Gemini response schema for the given enrichment fields."""
+    properties: Dict[str, Dict] = {}
+    for name in fields:
+        if name == "tech_stack":
+            properties[name] = {"type": "ARRAY", "items": {"type": "STRING", "enum": ALLOWED_TECH_STACKS}}
+        elif name in _LIST_FIELDS:
+            properties[name] = {"type": "ARRAY", "items": {"type": "STRING"}}
+        elif name == "contract_type":
+            properties[name] = {"type": "STRING", "enum": ALLOWED_CONTRACT_TYPES}
+        elif name == "remote_type":
+            properties[name] = {"type": "STRING", "enum": REMOTE_TYPES}
+        else:
+            properties[name] = {"type": "STRING"}
+    return {"type": "OBJECT", "properties": properties, "required": list(fields)}
+
+
+def _enhance_defaults(job_title: str) -> Dict[str, Any]:
+    """Values for enrichment fields Gemini did not provide."""
+    defaults: Dict[str, Any] = {name: [] if name in _LIST_FIELDS else "Not Specified" for name in ENHANCE_FIELDS}
+    defaults["simplified_job_title"] = job_title
+    return defaults
+
+
+ENHANCE_INSTRUCTIONS = _enhance_instructions(list(ENHANCE_FIELDS))
+
+# process_job output fields and the enhance_job_output field they come from
+ENHANCED_OUTPUT_FIELDS = {
+    "title_simplified": "simplified_job_title",
+    "tech_stack": "tech_stack",
+    "experience_required": "experience_required",
+    "education_level": "education_level",
+    "salary_range": "salary_range",
+    "remote_type": "remote_type",
+    "contract_type": "contract_type",
+    "benefits": "benefits",
+    "requirements": "requirements",
+}
+CLASSIFICATION_OUTPUT_FIELDS = {"category", "subcategory", "similar_title"}
+BASE_FIELDS = {
+    "company", "job_url", "slug", "title_original", "department", "location", "date_scraped", "source_url",
+}
+
+# Unambiguous keywords in a scraped title or location that settle a field without Gemini
+_LOCAL_REMOTE_TYPES = {
+    "Remote": re.compile(r'\b(?:remote|work from home|wfh)\b', re.IGNORECASE),
+    "Hybrid": re.compile(r'\bhybrid\b', re.IGNORECASE),
+    "On-Site": re.compile(r'\b(?:on-?site|in[- ]office)\b', re.IGNORECASE),
+}
+_LOCAL_CONTRACT_TYPES = {
+    "Internship": re.compile(r'\b(?:intern|internship|praktikum|stage)\b', re.IGNORECASE),
+    "Part-Time": re.compile(r'\bpart[- ]?time\b', re.IGNORECASE),
+    "Freelance": re.compile(r'\bfreelance\b', re.IGNORECASE),
+    "Contract": re.compile(r'\b(?:contract|contractor)\b', re.IGNORECASE),
+}
 
 
-gemini_rate_limiter = RateLimiter(requests_per_minute=60)
+def _local_fields(title: str, location: Optional[str]) -> Dict[str, str]:
+    """
+    remote_type and contract_type read from the scraped title and location.
+
+    A field is only set when exactly one value matches, so "Remote or
+    Hybrid" still goes to Gemini.
+    """
+    text = f"{title} {location or ''}"
+    fields = {}
+    for name, patterns in (("remote_type", _LOCAL_REMOTE_TYPES), ("contract_type", _LOCAL_CONTRACT_TYPES)):
+        matches = [value for value, pattern in patterns.items() if pattern.search(text)]
+        if len(matches) == 1 and (name != "contract_type" or matches[0] in ALLOWED_CONTRACT_TYPES):
+            fields[name] = matches[0]
+    return fields
+
+
+class _FallbackResult(dict):
+    """Default fields returned when Gemini gave no answer; never cached."""
+
+
+class _LocalResult(dict):
+    """Classification by the local title model; cached, but not as a Gemini label."""
 
 
 def _sanitize_text(value: str) -> str:
@@ -131,60 +263,77 @@ def _sanitize_text(value: str) -> str:
     return value.strip()
 
 
-def _call_gemini(prompt: str, api_key: Optional[str] = None) -> Optional[Dict]:
+def _call_gemini(
+    prompt: str,
+    api_key: Optional[str] = None,
+    prefix: str = "",
+    response_schema: Optional[Dict] = None
+) -> Optional[Dict]:
     """
     Call Gemini API and return parsed JSON response.
 
     Args:
         prompt: The prompt to send to Gemini
-        api_key: Optional API key (uses GOOGLE_API_KEY env var if not provided)
+        api_key: Optional API key (default: least-loaded key of GOOGLE_API_KEY(S))
+        prefix: Static prompt prefix, referenced as Gemini cached content
+                when it is large enough and sent before the prompt otherwise
+        response_schema: Optional Gemini response schema for the JSON answer
 
     Returns:
         Parsed JSON response or None on failure
     """
-    google_api_key = api_key or GOOGLE_API_KEY
+    google_api_key = api_key or gemini_keys.select()
     if not google_api_key:
         logger.error("GOOGLE_API_KEY not set")
         return None
 
-    gemini_rate_limiter.wait()
+    prompt, cached_content = build_contents(MODEL_NAME, prefix, prompt, google_api_key)
+    # A cached content belongs to the key that created it; otherwise the client may rotate keys
+    request_key = google_api_key if cached_content else api_key
+    contents = [{"role": "user", "parts": [{"text": prompt}]}]
+
+    def generate(turns: List[Dict]) -> Tuple[str, Optional[str]]:
+        response = default_client.generate(
+            turns,
+            task="enrichment",
+            api_key=request_key,
+            generation_config={"maxOutputTokens": MAX_TOKENS, "temperature": TEMPERATURE},
+            cached_content=cached_content,
+            response_schema=response_schema,
+        )
+        return response.text, response.finish_reason
 
     try:
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{MODEL_NAME}:generateContent?key={google_api_key}"
-
-        payload = {
-            "contents": [{"parts": [{"text": prompt}]}],
-            "generationConfig": {
-                "maxOutputTokens": MAX_TOKENS,
-                "temperature": TEMPERATURE,
-            }
-        }
-
-        response = requests.post(url, json=payload, timeout=60)
-
-        if response.status_code != 200:
-            logger.error(f"Gemini API error {response.status_code}: {response.text[:200]}")
+        text, finish_reason = generate(contents)
+        first_text = text
+
+        # Ask for the rest of a truncated answer, replaying what we have as the model turn
+        continuations = 0
+        while text and finish_reason == FINISH_MAX_TOKENS and continuations < MAX_CONTINUATIONS:
+            continuations += 1
+            logger.warning(f"Gemini output hit the token cap, requesting continuation {continuations}")
+            more, finish_reason = generate(contents + [
+                {"role": "model", "parts": [{"text": text}]},
+                {"role": "user", "parts": [{"text": CONTINUATION_PROMPT}]},
+            ])
+            if not more:
+                break
+            text += more
+
+        if not text:
             return None
 
-        result = response.json()
-
-        if "candidates" in result and len(result["candidates"]) > 0:
-            text = result["candidates"][0].get("content", {}).get("parts", [{}])[0].get("text", "")
-
-            if text:
-                # Clean up markdown code blocks
-                text = text.strip()
-                if text.startswith("```json"):
-                    text = text[7:]
-                if text.startswith("```"):
-                    text = text[3:]
-                if text.endswith("```"):
-                    text = text[:-3]
-                text = text.strip()
+        try:
+            parsed = parse_json(text)
+        except json.JSONDecodeError:
+            if text == first_text:
+                raise
+            # Continuation did not line up with the cut-off answer
+            parsed = parse_json(first_text)
 
-                return json.loads(text)
-
-        return None
+        if parsed.value is not None and not parsed.complete:
+            logger.warning("Gemini response truncated, keeping complete fields only")
+        return parsed.value
 
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse Gemini response: {e}")
@@ -205,25 +354,27 @@ def classify_job(job_title: str, api_key: Optional[str] = None) -> Dict[str, str
     Returns:
         Dict with category, subcategory, and similar_job_title
     """
-    safe_title = _sanitize_text(job_title)
+    prediction = confident_prediction(job_title, TAXONOMY_VERSION)
+    if prediction is not None:
+        return _validate_classification(_LocalResult(
+            category=prediction.category,
+            subcategory=prediction.subcategory,
+            similar_job_title=job_title,
+        ), job_title)
 
-    prompt = f"""Classify the job title "{safe_title}" into:
+    result = _call_gemini(_classify_text(job_title), api_key, prefix=CLASSIFY_INSTRUCTIONS)
+    return _validate_classification(result, job_title)
 
-1. **category**: Select from: {ALLOWED_CATEGORIES}
-2. **subcategory**: Select the most relevant subcategory
-3. **similar_job_title**: A normalized version of the job title
 
-Categories and their subcategories:
-{json.dumps(CATEGORY_SUBCATEGORIES, indent=2)}
-
-Respond with JSON only:
-{{"category": "...", "subcategory": "...", "similar_job_title": "..."}}
-"""
+def _classify_text(job_title: str) -> str:
+    """Per-job part of the classification prompt."""
+    return f'Job title: "{_sanitize_text(job_title)}"'
 
-    result = _call_gemini(prompt, api_key)
 
+def _validate_classification(result: Optional[Dict[str, Any]], job_title: str) -> Dict[str, Any]:
+    """Fall back on a missing answer and reset categories outside the taxonomy."""
     if not result:
-        return {"category": "No Match Found", "subcategory": "No Match Found", "similar_job_title": job_title}
+        return _FallbackResult(category="No Match Found", subcategory="No Match Found", similar_job_title=job_title)
 
     # Validate category
     if result.get("category") not in ALLOWED_CATEGORIES:
@@ -233,92 +384,289 @@ Respond with JSON only:
     return result
 
 
+def _enhance_field_names(fields: Optional[Iterable[str]]) -> List[str]:
+    """Validate enhance_job_output field names, in ENHANCE_FIELDS order."""
+    if fields is None:
+        return list(ENHANCE_FIELDS)
+    requested = set(fields)
+    unknown = requested - set(ENHANCE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown enrichment fields: {sorted(unknown)}")
+    return [name for name in ENHANCE_FIELDS if name in requested]
+
+
+def _posting_text(job_title: str, job_description: str, company_info: str) -> str:
+    """Per-job part of the enrichment prompt."""
+    safe_title = _sanitize_text(job_title)
+    # A whole detail page loses its chrome so the size limit holds description
+    # text; description text from the caller is kept as given
+    if is_html_page(job_description):
+        job_description = extract_main_content(job_description).text
+    safe_desc = _sanitize_text(job_description)[:15000]  # Limit size
+    safe_company = _sanitize_text(company_info)
+
+    return f"""Job Title: {safe_title}
+Description: {safe_desc}
+Company Info: {safe_company}
+"""
+
+
+def _validate_enhanced(result: Dict[str, Any], names: List[str], subset: bool) -> Dict[str, Any]:
+    """Keep requested fields and allowed values of one enrichment result."""
+    if subset:
+        result = {name: value for name, value in result.items() if name in names}
+
+    # Filter tech stack to allowed values
+    if "tech_stack" in result:
+        result["tech_stack"] = [t for t in result.get("tech_stack", []) if t in ALLOWED_TECH_STACKS]
+
+    # Validate contract type
+    if "contract_type" in names and result.get("contract_type") not in ALLOWED_CONTRACT_TYPES:
+        result["contract_type"] = "Other"
+
+    return result
+
+
+def _enhance_fallback(job_title: str, names: List[str]) -> _FallbackResult:
+    defaults = _enhance_defaults(job_title)
+    return _FallbackResult({name: defaults[name] for name in names})
+
+
 def enhance_job_output(
     job_title: str,
     job_description: str = "",
     company_info: str = "",
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    fields: Optional[Iterable[str]] = None
 ) -> Dict[str, Any]:
     """
     Enhance job data with AI-extracted fields.
 
     Args:
         job_title: Job title
-        job_description: Raw job description text
+        job_description: Raw job description text, or a whole detail page
+                         (HTML or markdown) to isolate the description from
         company_info: Optional company context
         api_key: Optional Google API key
+        fields: Fields of ENHANCE_FIELDS to extract (default: all); a subset
+                gets a prompt and response schema for just those fields
 
     Returns:
         Dict with enhanced job fields
+
+    Raises:
+        ValueError: If fields names an unknown field
     """
-    safe_title = _sanitize_text(job_title)
-    safe_desc = _sanitize_text(job_description)[:15000]  # Limit size
-    safe_company = _sanitize_text(company_info)
+    names = _enhance_field_names(fields)
+    if not names:
+        return {}
+    if fields is None:
+        instructions, schema = ENHANCE_INSTRUCTIONS, None
+    else:
+        instructions, schema = _enhance_instructions(names), _enhance_schema(names)
 
-    prompt = f"""Extract structured data from this job posting:
+    prompt = _posting_text(job_title, job_description, company_info)
+    result = _call_gemini(prompt, api_key, prefix=instructions, response_schema=schema)
 
-Job Title: {safe_title}
-Description: {safe_desc}
-Company Info: {safe_company}
+    if not result:
+        return _enhance_fallback(job_title, names)
 
-Return a JSON object with these fields:
-- simplified_job_title: Clean job title without seniority/gender/location
-- tech_stack: List of technologies from allowed list: {ALLOWED_TECH_STACKS[:50]}...
-- experience_required: e.g., "3-5 years" or "Not Specified"
-- education_level: e.g., "Bachelor's Degree" or "Not Specified"
-- salary_range: e.g., "$80,000 - $120,000 per year" or "Not Specified"
-- location: Job location
-- remote_type: "Remote", "Hybrid", "On-Site", or "Not Specified"
-- contract_type: From {ALLOWED_CONTRACT_TYPES}
-- benefits: List of benefits mentioned
-- requirements: Key requirements as list
-
-Respond with valid JSON only.
-"""
+    return _validate_enhanced(result, names, subset=fields is not None)
 
-    result = _call_gemini(prompt, api_key)
 
-    if not result:
-        return {
-            "simplified_job_title": job_title,
-            "tech_stack": [],
-            "experience_required": "Not Specified",
-            "education_level": "Not Specified",
-            "salary_range": "Not Specified",
-            "location": "Not Specified",
-            "remote_type": "Not Specified",
-            "contract_type": "Not Specified",
-            "benefits": [],
-            "requirements": []
-        }
+def _pack_batches(sizes: List[int], token_budget: int, max_jobs: int) -> List[List[int]]:
+    """
+    Group job indexes into batches whose estimated tokens fit the budget.
 
-    # Filter tech stack to allowed values
-    if "tech_stack" in result:
-        result["tech_stack"] = [t for t in result.get("tech_stack", []) if t in ALLOWED_TECH_STACKS]
+    A job above half the budget gains little from sharing a prompt and is
+    sent alone.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    used = 0
+    for index, size in enumerate(sizes):
+        if size > token_budget // 2:
+            batches.append([index])
+            continue
+        if current and (used + size > token_budget or len(current) >= max_jobs):
+            batches.append(current)
+            current, used = [], 0
+        current.append(index)
+        used += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def enhance_jobs_batch(
+    jobs: Dict[str, Tuple[str, str]],
+    api_key: Optional[str] = None,
+    fields: Optional[Iterable[str]] = None,
+    token_budget: int = ENHANCE_BATCH_TOKENS,
+    max_jobs: int = ENHANCE_BATCH_MAX_JOBS
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Enhance several jobs with as few Gemini calls as the token budget allows.
 
-    # Validate contract type
-    if result.get("contract_type") not in ALLOWED_CONTRACT_TYPES:
-        result["contract_type"] = "Other"
+    Descriptions are packed in order into prompts of up to token_budget
+    estimated input tokens and max_jobs postings; each posting is tagged with
+    a short ID and the answer is a JSON object keyed by those IDs. Postings
+    missing from a malformed or truncated answer are retried by splitting
+    the batch in half, down to single enhance_job_output calls.
 
-    return result
+    Args:
+        jobs: Job ID -> (job title, job description)
+        api_key: Optional Google API key
+        fields: Fields of ENHANCE_FIELDS to extract (default: all)
+        token_budget: Estimated input tokens per prompt
+        max_jobs: Postings per prompt (bounds the output size)
+
+    Returns:
+        Job ID -> enhanced fields, as enhance_job_output would return them
+
+    Raises:
+        ValueError: If fields names an unknown field
+
+    Example:
+        >>> results = enhance_jobs_batch({  # doctest: +SKIP
+        ...     "job-1": ("Backend Engineer", "Build APIs in Go..."),
+        ...     "job-2": ("Designer", "Own our design system..."),
+        ... })
+        >>> results["job-2"]["tech_stack"]  # doctest: +SKIP
+    """
+    names = _enhance_field_names(fields)
+    if not names or not jobs:
+        return {job_id: {} for job_id in jobs}
+
+    ids = list(jobs)
+    texts = [_posting_text(title, description, "") for title, description in jobs.values()]
+    results: Dict[str, Dict[str, Any]] = {}
+    if not (api_key or gemini_keys.select()):
+        logger.error("GOOGLE_API_KEY not set")
+        return {job_id: _enhance_fallback(jobs[job_id][0], names) for job_id in ids}
+
+    instructions = _enhance_instructions(names, batch=True)
+    item_schema = _enhance_schema(names)
+
+    def run(batch: List[int]) -> None:
+        if len(batch) == 1:
+            title, description = jobs[ids[batch[0]]]
+            results[ids[batch[0]]] = enhance_job_output(title, description, api_key=api_key, fields=fields)
+            return
+
+        # Short positional IDs keep long caller IDs (URLs) out of the prompt
+        keys = [str(n) for n in range(1, len(batch) + 1)]
+        prompt = "\n".join(f"[ID: {key}]\n{texts[index]}" for key, index in zip(keys, batch))
+        schema = {"type": "OBJECT", "properties": dict.fromkeys(keys, item_schema), "required": keys}
+        answer = _call_gemini(prompt, api_key, prefix=instructions, response_schema=schema)
+
+        missing = []
+        for key, index in zip(keys, batch):
+            result = answer.get(key) if isinstance(answer, dict) else None
+            if isinstance(result, dict) and result:
+                results[ids[index]] = _validate_enhanced(result, names, subset=fields is not None)
+            else:
+                missing.append(index)
+        if missing:
+            logger.warning(f"Batched enrichment answered {len(batch) - len(missing)}/{len(batch)} jobs, splitting the rest")
+            middle = (len(missing) + 1) // 2
+            for half in (missing[:middle], missing[middle:]):
+                if half:
+                    run(half)
+
+    sizes = [len(text) // CHARS_PER_TOKEN for text in texts]
+    batches = _pack_batches(sizes, token_budget, max_jobs)
+    logger.info(f"Enhancing {len(ids)} jobs in {len(batches)} batched calls")
+    for batch in batches:
+        run(batch)
+    return {job_id: results[job_id] for job_id in ids}
+
+
+def _requested_fields(fields: Iterable[str]) -> Set[str]:
+    """Validate process_job field names; returns the enrichment fields among them."""
+    requested = set(fields)
+    unknown = requested - BASE_FIELDS - CLASSIFICATION_OUTPUT_FIELDS - set(ENHANCED_OUTPUT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+    return requested - BASE_FIELDS
+
+
+class _EnrichmentPlan(NamedTuple):
+    """What process_job has to do for one job."""
+
+    local: Dict[str, Any]
+    classify: bool
+    enhance: List[str]
+    taxonomy_version: str
+
+
+def _enrichment_plan(
+    title: str,
+    location: Optional[str],
+    description: str,
+    wanted: Optional[Set[str]]
+) -> _EnrichmentPlan:
+    """
+    Split the requested enrichment into local fields, classification and
+    the output fields to get from enhance_job_output.
+    """
+    if wanted is None:
+        enhance = list(ENHANCED_OUTPUT_FIELDS) if description else []
+        return _EnrichmentPlan({}, True, enhance, TAXONOMY_VERSION)
+
+    local = {name: value for name, value in _local_fields(title, location).items() if name in wanted}
+    classify = bool(wanted & CLASSIFICATION_OUTPUT_FIELDS) or ("title_simplified" in wanted and not description)
+    enhance = [name for name in ENHANCED_OUTPUT_FIELDS if name in wanted and name not in local] if description else []
+    return _EnrichmentPlan(local, classify, enhance, f"{TAXONOMY_VERSION}:{','.join(sorted(wanted))}")
+
+
+def _enhance_fields(enhance: List[str], wanted: Optional[Set[str]]) -> Optional[List[str]]:
+    """enhance_job_output fields for process_job output fields (None for all)."""
+    return None if wanted is None else [ENHANCED_OUTPUT_FIELDS[name] for name in enhance]
 
 
 def process_job(
     job: Dict[str, Any],
     enrich: bool = True,
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    cache: Optional[EnrichmentCache] = None,
+    fields: Optional[Iterable[str]] = None,
+    enhanced: Optional[Dict[str, Any]] = None,
+    classification: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Process a scraped job with optional AI enrichment.
 
+    Enrichment is cached by job URL, title/description hash and
+    TAXONOMY_VERSION, so an unchanged posting costs no API calls.
+
+    With fields, only those enrichment fields are produced: classification
+    is skipped unless a classification field is requested, enhancement asks
+    Gemini for just the remaining fields, and remote_type/contract_type are
+    read from the title and location when they state them. Requests that
+    need nothing beyond that make no API calls.
+
     Args:
         job: Raw job dict from scraper (must have 'title' field)
         enrich: Whether to use AI enrichment (default True)
         api_key: Optional Google API key
+        cache: Enrichment cache (default: module cache, persisted when
+               OPENJOBS_ENRICHMENT_CACHE is set)
+        fields: Output fields to enrich, e.g. ["category", "remote_type"]
+                (default: all); base fields are always included
+        enhanced: enhance_job_output result computed beforehand (process_jobs
+                  gets it from enhance_jobs_batch)
+        classification: classify_job result computed beforehand (e.g. by
+                        the Gemini Batch API)
 
     Returns:
         Processed job dict with all fields
+
+    Raises:
+        ValueError: If fields names an unknown field
     """
+    wanted = None if fields is None else _requested_fields(fields)
+
     title = job.get("title", "")
     if not title:
         logger.warning("Job has no title, skipping")
@@ -343,45 +691,109 @@ def process_job(
         processed["subcategory"] = "No Match Found"
         return processed
 
+    description = job.get("description", "")
+    local, classify, enhance, taxonomy_version = _enrichment_plan(title, processed["location"], description, wanted)
+    if not classify and not enhance:
+        processed.update(local)
+        return processed
+
+    cache = default_cache if cache is None else cache
+    cache_key = enrichment_key(processed["job_url"], title, description, taxonomy_version)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        logger.debug(f"Enrichment cache hit: {title}")
+        processed.update(cached)
+        return processed
+    base_fields = set(processed)
+    processed.update(local)
+
     # AI enrichment
     logger.info(f"Enriching job: {title}")
+    failed = False
 
     # Classify job
-    classification = classify_job(title, api_key)
-    processed["category"] = classification.get("category", "No Match Found")
-    processed["subcategory"] = classification.get("subcategory", "No Match Found")
-    processed["similar_title"] = classification.get("similar_job_title", title)
-
-    # Skip non-matching categories if desired
-    if processed["category"] == "No Match Found":
-        logger.debug(f"Job '{title}' did not match any category")
+    if not classify:
+        classification = {}
+    elif classification is None:
+        classification = classify_job(title, api_key)
+    if classify:
+        failed = isinstance(classification, _FallbackResult)
+        processed["category"] = classification.get("category", "No Match Found")
+        processed["subcategory"] = classification.get("subcategory", "No Match Found")
+        processed["similar_title"] = classification.get("similar_job_title", title)
+
+        # Skip non-matching categories if desired
+        if processed["category"] == "No Match Found":
+            logger.debug(f"Job '{title}' did not match any category")
 
     # Enhance with additional fields
-    description = job.get("description", "")
-    if description:
-        enhanced = enhance_job_output(title, description, api_key=api_key)
-        processed.update({
-            "title_simplified": enhanced.get("simplified_job_title", title),
-            "tech_stack": enhanced.get("tech_stack", []),
-            "experience_required": enhanced.get("experience_required", "Not Specified"),
-            "education_level": enhanced.get("education_level", "Not Specified"),
-            "salary_range": enhanced.get("salary_range", "Not Specified"),
-            "remote_type": enhanced.get("remote_type", "Not Specified"),
-            "contract_type": enhanced.get("contract_type", "Not Specified"),
-            "benefits": enhanced.get("benefits", []),
-            "requirements": enhanced.get("requirements", []),
-        })
-    else:
+    if enhance:
+        if enhanced is None:
+            enhanced = enhance_job_output(title, description, api_key=api_key, fields=_enhance_fields(enhance, wanted))
+        failed = failed or isinstance(enhanced, _FallbackResult)
+        defaults = _enhance_defaults(title)
+        for name in enhance:
+            source = ENHANCED_OUTPUT_FIELDS[name]
+            processed[name] = enhanced.get(source, defaults[source])
+    elif wanted is None or "title_simplified" in wanted:
         processed["title_simplified"] = classification.get("similar_job_title", title)
 
+    if wanted is not None:
+        processed = {k: v for k, v in processed.items() if k in base_fields or k in wanted}
+
+    # A failed call would otherwise be served from the cache on every recrawl
+    if not failed:
+        enrichment = {k: v for k, v in processed.items() if k not in base_fields}
+        # A hit only saves the calls this enrichment actually made
+        local = isinstance(classification, _LocalResult)
+        cache.put(cache_key, enrichment, api_calls=int(classify and not local) + bool(enhance),
+                  job_url=processed["job_url"], taxonomy_version=TAXONOMY_VERSION, title=title,
+                  label_source=LABEL_LOCAL if local else LABEL_GEMINI)
+
     return processed
 
 
+def _batch_enhancements(
+    jobs: List[Dict[str, Any]],
+    api_key: Optional[str],
+    cache: EnrichmentCache,
+    fields: Optional[Iterable[str]]
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Run enhance_jobs_batch for the jobs process_job would enhance one by one.
+
+    Returns:
+        Job index -> enhance_job_output result; jobs that are cached, need no
+        enhancement or have nothing to share a batch with are left out
+    """
+    wanted = None if fields is None else _requested_fields(fields)
+    groups: Dict[Tuple[str, ...], Dict[str, Tuple[str, str]]] = {}
+    for index, job in enumerate(jobs):
+        title, description = job.get("title", ""), job.get("description", "")
+        if not title or not description:
+            continue
+        plan = _enrichment_plan(title, job.get("location"), description, wanted)
+        if not plan.enhance or enrichment_key(job.get("job_url", ""), title, description, plan.taxonomy_version) in cache:
+            continue
+        groups.setdefault(tuple(plan.enhance), {})[str(index)] = (title, description)
+
+    results: Dict[int, Dict[str, Any]] = {}
+    for enhance, group in groups.items():
+        if len(group) < 2:
+            continue
+        batch = enhance_jobs_batch(group, api_key, fields=_enhance_fields(list(enhance), wanted))
+        results.update((int(job_id), enhanced) for job_id, enhanced in batch.items())
+    return results
+
+
 def process_jobs(
     jobs: List[Dict[str, Any]],
     enrich: bool = True,
     api_key: Optional[str] = None,
-    filter_categories: Optional[List[str]] = None
+    filter_categories: Optional[List[str]] = None,
+    cache: Optional[EnrichmentCache] = None,
+    fields: Optional[Iterable[str]] = None,
+    batch_enhance: Optional[bool] = None
 ) -> List[Dict[str, Any]]:
     """
     Process multiple jobs with optional filtering.
@@ -391,14 +803,27 @@ def process_jobs(
         enrich: Whether to use AI enrichment
         api_key: Optional Google API key
         filter_categories: If provided, only return jobs in these categories
+        cache: Enrichment cache (default: module cache)
+        fields: Output fields to enrich (default: all); category is added
+                when filter_categories is given
+        batch_enhance: Enhance descriptions with enhance_jobs_batch instead
+                       of one call per job (default: OPENJOBS_ENHANCE_BATCHING)
 
     Returns:
         List of processed job dicts
     """
+    cache = default_cache if cache is None else cache
+    if fields is not None:
+        fields = set(fields) | ({"category"} if filter_categories else set())
+    prefetched: Dict[int, Dict[str, Any]] = {}
+    if enrich and (ENHANCE_BATCHING if batch_enhance is None else batch_enhance):
+        prefetched = _batch_enhancements(jobs, api_key, cache, fields)
     processed_jobs = []
 
-    for job in jobs:
-        processed = process_job(job, enrich=enrich, api_key=api_key)
+    for index, job in enumerate(jobs):
+        processed = process_job(
+            job, enrich=enrich, api_key=api_key, cache=cache, fields=fields, enhanced=prefetched.get(index)
+        )
 
         if processed is None:
             continue
@@ -412,4 +837,7 @@ def process_jobs(
         processed_jobs.append(processed)
 
     logger.info(f"Processed {len(processed_jobs)} jobs (from {len(jobs)} total)")
+    if enrich:
+        cache.log_stats()
+        default_client.log_usage()
     return processed_jobs
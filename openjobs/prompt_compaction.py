@@ -0,0 +1,162 @@
+"""
+OpenJobs Prompt Compaction - Shrink careers-page markdown before extraction
+
+Firecrawl markdown carries nav menus, footers, cookie banners, images and long
+tracking URLs. This prunes repeated and boilerplate blocks and replaces long
+URLs with short reference IDs (L1, L2, ...) that are mapped back to the real
+URLs after Gemini returns the jobs.
+"""
+
+import re
+from typing import Dict, List, NamedTuple
+
+from .content_score import score_job_content
+
+# URLs at least this long are replaced with a reference ID
+MIN_COMPACT_URL_LENGTH = 40
+
+# Appended to the extraction prompt when links were replaced
+LINK_REFERENCE_NOTE = (
+    "Links in the page content are shortened to reference IDs like L1, L2. "
+    "For url, return the reference ID exactly as written."
+)
+
+_BLOCK_SPLIT = re.compile(r'\n\s*\n')
+_WHITESPACE = re.compile(r'\s+')
+_IMAGE = re.compile(r'!\[[^\]]*\]\([^)]*\)')
+_MD_LINK = re.compile(r'\[([^\]]*)\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"]*")?\s*\)')
+_BARE_URL = re.compile(r'(?<![(<])\bhttps?://[^\s)\]>]+')
+_REF_ID = re.compile(r'^\(?(L\d+)\)?$')
+
+# Blocks that are boilerplate unless they also mention job keywords
+_BOILERPLATE = re.compile(
+    r'cookie|privacy policy|terms of (?:use|service)|all rights reserved|©|'
+    r'newsletter|accept all|consent|skip to (?:main )?content',
+    re.IGNORECASE
+)
+
+
+class CompactedPrompt(NamedTuple):
+    """Compacted page content plus the reference-ID to URL mapping."""
+
+    text: str
+    links: Dict[str, str]
+    original_chars: int
+
+    @property
+    def saved_chars(self) -> int:
+        """Characters removed from the prompt."""
+        return self.original_chars - len(self.text)
+
+
+def prune_boilerplate(markdown: str) -> str:
+    """
+    Drop images, repeated blocks and boilerplate blocks from markdown.
+
+    Blocks are separated by blank lines. A block is dropped if an identical
+    block appeared earlier (nav menus repeated in header and footer), or if it
+    matches boilerplate phrases (cookies, privacy, copyright) and carries no
+    job keywords.
+
+    Args:
+        markdown: Page markdown
+
+    Returns:
+        Pruned markdown
+    """
+    if not markdown:
+        return ""
+
+    seen = set()
+    kept: List[str] = []
+    for block in _BLOCK_SPLIT.split(_IMAGE.sub('', markdown)):
+        block = block.strip()
+        if not block:
+            continue
+
+        key = _WHITESPACE.sub(' ', block).lower()
+        if key in seen:
+            continue
+        seen.add(key)
+
+        if _BOILERPLATE.search(block) and not score_job_content(block).matches:
+            continue
+
+        kept.append(block)
+
+    return '\n\n'.join(kept)
+
+
+def compact_links(markdown: str, min_length: int = MIN_COMPACT_URL_LENGTH) -> CompactedPrompt:
+    """
+    Replace long URLs with short reference IDs.
+
+    The same URL always gets the same ID. Use restore_links() to map IDs in
+    extracted jobs back to the real URLs.
+
+    Args:
+        markdown: Page markdown
+        min_length: Only URLs at least this long are replaced
+
+    Returns:
+        CompactedPrompt with the rewritten text and the ID -> URL mapping
+    """
+    links: Dict[str, str] = {}
+    ids: Dict[str, str] = {}
+
+    def ref(url: str) -> str:
+        if url not in ids:
+            ids[url] = f"L{len(ids) + 1}"
+            links[ids[url]] = url
+        return ids[url]
+
+    def replace_link(match) -> str:
+        text, url = match.group(1), match.group(2)
+        if len(url) < min_length:
+            return match.group(0)
+        return f"[{text}]({ref(url)})"
+
+    def replace_bare(match) -> str:
+        url = match.group(0)
+        return ref(url) if len(url) >= min_length else url
+
+    text = _MD_LINK.sub(replace_link, markdown or "")
+    text = _BARE_URL.sub(replace_bare, text)
+    return CompactedPrompt(text, links, len(markdown or ""))
+
+
+def compact_markdown(markdown: str, min_length: int = MIN_COMPACT_URL_LENGTH) -> CompactedPrompt:
+    """
+    Prune boilerplate and compact long links in one step.
+
+    Args:
+        markdown: Page markdown
+        min_length: Only URLs at least this long are replaced
+
+    Returns:
+        CompactedPrompt whose original_chars is the size before pruning
+    """
+    compacted = compact_links(prune_boilerplate(markdown), min_length)
+    return compacted._replace(original_chars=len(markdown or ""))
+
+
+def restore_links(jobs: List[Dict], links: Dict[str, str]) -> List[Dict]:
+    """
+    Map reference IDs in extracted jobs back to real URLs (in place).
+
+    Args:
+        jobs: Job dicts returned by extraction
+        links: ID -> URL mapping from compact_links()
+
+    Returns:
+        The same job list, with url fields restored
+    """
+    if not links:
+        return jobs
+    for job in jobs:
+        url = job.get('url')
+        if isinstance(url, str):
+            match = _REF_ID.match(url.strip())
+            if match and match.group(1) in links:
+                job['url'] = links[match.group(1)]
+    return jobs
@@ -0,0 +1,85 @@
+"""
+OpenJobs Scrape Result - Typed result of scraping a careers page
+
+Replaces the "<!-- RAW_HTML -->" string prefix: the content type, the tier that
+produced the content, sizes, per-attempt timings and the job keyword score
+travel with the page body instead of being re-detected downstream.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .content_score import JobContentScore
+
+CONTENT_MARKDOWN = "markdown"
+CONTENT_HTML = "html"
+
+# Tiers of scrape_with_firecrawl, cheapest first
+TIER_FIRECRAWL = "firecrawl"
+TIER_FIRECRAWL_SCROLL = "firecrawl_scroll"
+TIER_RAW_HTML = "raw_html"
+
+# Legacy marker for HTML content passed around as a plain string
+RAW_HTML_MARKER = "<!-- RAW_HTML -->\n"
+
+
+@dataclass
+class ScrapeAttempt:
+    """Timing and size of one fetch attempt."""
+
+    tier: str
+    duration_ms: int
+    chars: int
+
+
+@dataclass
+class ScrapeResult:
+    """
+    Page content returned by scrape_with_firecrawl.
+
+    Truthy when content is non-empty, so `if not result:` works as it did
+    for the plain string.
+    """
+
+    url: str
+    content: str = ""
+    content_type: str = CONTENT_MARKDOWN
+    tier: Optional[str] = None
+    score: Optional[JobContentScore] = None
+    attempts: List[ScrapeAttempt] = field(default_factory=list)
+    embedded_jobs: List[Dict] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.content)
+
+    def __len__(self) -> int:
+        return len(self.content)
+
+    @property
+    def is_html(self) -> bool:
+        """True if content is raw HTML rather than Firecrawl markdown."""
+        return self.content_type == CONTENT_HTML
+
+    @property
+    def chars_fetched(self) -> int:
+        """Characters received across all attempts, including discarded ones."""
+        return sum(a.chars for a in self.attempts)
+
+    @property
+    def duration_ms(self) -> int:
+        """Total time spent across all attempts."""
+        return sum(a.duration_ms for a in self.attempts)
+
+    def to_text(self) -> str:
+        """Return content in the legacy string form (HTML prefixed with the marker)."""
+        if self.is_html:
+            return f"{RAW_HTML_MARKER}{self.content}"
+        return self.content
+
+    @classmethod
+    def from_text(cls, text: str, url: str = "") -> "ScrapeResult":
+        """Wrap a legacy string, detecting the RAW_HTML marker."""
+        text = text or ""
+        if text.startswith(RAW_HTML_MARKER.rstrip('\n')):
+            return cls(url=url, content=text[len(RAW_HTML_MARKER):], content_type=CONTENT_HTML)
+        return cls(url=url, content=text)
@@ -4,6 +4,7 @@ OpenJobs Scraper - Scrape job listings from any careers page
 Uses Firecrawl for JavaScript rendering and Gemini AI for job extraction.
 """
 
+import importlib.util
 import ipaddress
 import json
 import os
@@ -11,14 +12,41 @@ import re
 import socket
 import threading
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import replace
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import requests
 
-from .http_utils import post_json_with_retry
+from .content_score import score_job_content
+from .context_cache import build_contents
+from .extraction_format import (
+    COMPACT_EXTRACTION_PROMPT,
+    FORMAT_COMPACT,
+    JobStreamDecoder,
+    parse_partial_jobs,
+)
+from .extraction_templates import extract_with_template, learn_template
+from .gemini_client import default_client, model_for
+from .html_markdown import html_to_markdown
+from .http_utils import RETRYABLE_STATUS_CODES
+from .key_pool import UNHEALTHY_STATUS_CODES, firecrawl_keys, gemini_keys
 from .logger import logger
+from .markdown_jobs import parse_job_list
+from .page_diff import extract_changed_blocks, record_snapshot
+from .partial_json import FINISH_MAX_TOKENS, MAX_CONTINUATIONS
+from .prompt_compaction import LINK_REFERENCE_NOTE, compact_markdown, restore_links
+from .scrape_result import (
+    CONTENT_HTML,
+    TIER_FIRECRAWL,
+    TIER_FIRECRAWL_SCROLL,
+    TIER_RAW_HTML,
+    ScrapeAttempt,
+    ScrapeResult,
+)
+from .url_rules import WAIT_TIER_SLOW, classify_url
 from .utils import create_slug
 
 # Configuration
@@ -26,33 +54,41 @@ from .utils import create_slug
 FIRECRAWL_API_KEY = os.getenv("FIRECRAWL_API_KEY", "")
 FIRECRAWL_URL = os.getenv("FIRECRAWL_URL", "https://api.firecrawl.dev")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
-GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
-GEMINI_URL = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent"
+GEMINI_MODEL = model_for("extraction")
+EXTRACTION_GENERATION_CONFIG = {"temperature": 0.1, "maxOutputTokens": 8192}
 
 # Firecrawl wait time configuration
 DEFAULT_WAIT_MS = 5000  # Default wait for JS rendering
 SLOW_SPA_WAIT_MS = 8000  # Extra time for heavy JS sites
 
-# Patterns that need extra wait time (heavy JS career sites)
-SLOW_SITE_PATTERNS = [
-    'workday', 'lever.co', 'greenhouse.io', 'bamboohr',
-    'careers.', 'jobs.', 'apply.', 'hire.'
-]
-
 # Heavy SPA sites that need extended wait + scroll actions
 HEAVY_SPA_WAIT_MS = 15000  # 15 seconds for very heavy JS sites
-HEAVY_SPA_PATTERNS = ['retool', 'airtable', 'vercel', 'notion', 'figma']
-
-# Job-related keywords for content validation
-# Used to detect if scraped content contains actual job listings
-JOB_KEYWORDS = [
-    'engineer', 'manager', 'designer', 'analyst', 'developer', 'director',
-    'coordinator', 'specialist', 'lead', 'senior', 'junior', 'associate',
-    'account executive', 'product manager', 'software engineer'
-]
 
-# Minimum keyword matches required to consider content as having job listings
-MIN_JOB_KEYWORD_MATCHES = 5
+# Retries of a Firecrawl request after a rate limit, server error or dropped
+# connection, and the first backoff in seconds
+FIRECRAWL_RETRIES = 2
+FIRECRAWL_RETRY_BACKOFF = 2.0
+
+# Slow sites, heavy SPAs and skipped URLs are defined in config/url_rules.json
+
+# Converted HTML shorter than this has no useful visible text; send the markup instead
+MIN_CONVERTED_HTML_CHARS = 200
+
+# Raw HTML fallback: streamed in chunks and capped to bound memory per fetch
+RAW_HTML_MAX_BYTES = int(os.getenv("OPENJOBS_RAW_HTML_MAX_BYTES", str(5 * 1024 * 1024)))
+RAW_HTML_CHUNK_SIZE = 64 * 1024
+
+# Output format requested from Gemini with the default prompts: "compact"
+# (positional rows with department/location tables) or "json" (one object per job)
+EXTRACTION_FORMAT = os.getenv("OPENJOBS_EXTRACTION_FORMAT", FORMAT_COMPACT)
+
+# Brotli is only decoded by urllib3 when the brotli package is installed
+_HAS_BROTLI = any(importlib.util.find_spec(mod) for mod in ("brotli", "brotlicffi"))
+ACCEPT_ENCODING = "gzip, deflate, br" if _HAS_BROTLI else "gzip, deflate"
+
+# Start of an embedded jobs array: \"jobs\":[ (escaped JSON) or "jobs": [ (plain JSON)
+_JOBS_ARRAY_START = re.compile(rb'\\?"jobs\\?"\s*:\s*\[')
+_BRACKETS = re.compile(rb'[\[\]]')
 
 
 def _has_job_content(content: str) -> bool:
@@ -68,11 +104,7 @@ def _has_job_content(content: str) -> bool:
     Returns:
         True if content has enough job keywords to indicate job listings
     """
-    if not content:
-        return False
-    content_lower = content.lower()
-    match_count = sum(content_lower.count(kw) for kw in JOB_KEYWORDS)
-    return match_count >= MIN_JOB_KEYWORD_MATCHES
+    return score_job_content(content).has_jobs
 
 
 # Common careers page paths to try during discovery
@@ -88,51 +120,6 @@ COMMON_CAREERS_PATHS = [
 ]
 
 
-class RateLimiter:
-    """Rate limiter to prevent overwhelming APIs."""
-
-    def __init__(self, requests_per_minute: int = 30):
-        self.requests_per_minute = requests_per_minute
-        self.requests = []
-        self.lock = threading.Lock()
-
-    def wait(self):
-        """Wait if necessary to stay within rate limit."""
-        with self.lock:
-            now = datetime.now()
-            minute_ago = now - timedelta(minutes=1)
-
-            # Remove old requests outside the window
-            self.requests = [t for t in self.requests if t > minute_ago]
-
-            # If at limit, wait for oldest request to expire
-            if len(self.requests) >= self.requests_per_minute:
-                oldest = min(self.requests)
-                sleep_time = (oldest + timedelta(minutes=1) - now).total_seconds()
-                if sleep_time > 0:
-                    logger.debug(f"Rate limit reached, waiting {sleep_time:.1f}s")
-                    time.sleep(sleep_time)
-
-            # Record this request
-            self.requests.append(datetime.now())
-
-
-# Global rate limiter instance
-firecrawl_rate_limiter = RateLimiter(requests_per_minute=30)
-
-# URLs that cannot be scraped or are not career pages
-SKIP_URL_PATTERNS = [
-    # File extensions (not pages)
-    '.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.pdf', '.zip',
-    # Social media / login pages (can't scrape)
-    'linkedin.com', 'twitter.com', 'facebook.com', 'instagram.com',
-    # Generic job boards (not company-specific)
-    'indeed.com', 'glassdoor.com', 'monster.com', 'ziprecruiter.com',
-    # Workday (has its own ATS - too complex to scrape)
-    '.myworkdayjobs.com',
-]
-
-
 def _is_private_ip(ip_str: str) -> bool:
     """Check if an IP address is private, loopback, or otherwise internal."""
     try:
@@ -164,8 +151,6 @@ def is_valid_url(url: str) -> Tuple[bool, str]:
     if not url:
         return False, "Empty URL"
 
-    url_lower = url.lower()
-
     # Parse URL for security checks
     try:
         parsed = urlparse(url)
@@ -190,6 +175,11 @@ def is_valid_url(url: str) -> Tuple[bool, str]:
     if hostname_lower in blocked_hosts:
         return False, f"Blocked hostname: {hostname}"
 
+    # Check skip rules before DNS resolution (cheap, and avoids lookups for skipped URLs)
+    skip_reason = classify_url(url).skip_reason
+    if skip_reason:
+        return False, f"Skipped pattern: {skip_reason}"
+
     # Security: Check if hostname resolves to private/internal IP
     try:
         if _is_private_ip(hostname):
@@ -209,14 +199,12 @@ def is_valid_url(url: str) -> Tuple[bool, str]:
     except Exception:
         pass
 
-    # Check for skip patterns
-    for pattern in SKIP_URL_PATTERNS:
-        if pattern in url_lower:
-            return False, f"Skipped pattern: {pattern}"
-
     return True, "OK"
 
 
+# Separates the static instructions from the page in extraction prompts
+PAGE_CONTENT_MARKER = "\n\nPage content:\n"
+
 # Default extraction prompt for Gemini
 EXTRACTION_PROMPT = """Extract all job listings from this careers page content.
 
@@ -239,7 +227,7 @@ Example output:
 [{"title": "Software Engineer", "department": "Engineering", "location": "Remote", "url": "https://..."}]"""
 
 
-def _firecrawl_request(
+def firecrawl_request(
     url: str,
     wait_ms: int,
     api_key: Optional[str] = None,
@@ -248,28 +236,34 @@ def _firecrawl_request(
     """
     Make a single Firecrawl request with optional scroll actions.
 
+    The URL is not validated here; check it with is_valid_url first. Every
+    attempt takes its own slot in the key pool: a pooled key answering 429 or
+    403 moves the request to another healthy key, and rate limits, server
+    errors and dropped connections are retried with backoff.
+
     Args:
         url: The URL to scrape
         wait_ms: Milliseconds to wait for JS rendering
-        api_key: Optional Firecrawl API key
+        api_key: Optional Firecrawl API key (kept for every attempt)
         with_scroll: If True, add scroll actions (cloud Firecrawl only)
 
     Returns:
         Markdown content or empty string on failure
     """
-    try:
-        headers = {}
-        firecrawl_api_key = api_key or FIRECRAWL_API_KEY
+    payload = {
+        "url": url,
+        "formats": ["markdown"],
+        "waitFor": wait_ms,
+        "timeout": 60000,
+    }
+    pinned = api_key or None
+    for attempt in range(FIRECRAWL_RETRIES + 1):
+        # Rate limited per key; self-hosted Firecrawl without keys shares one bucket
+        firecrawl_api_key = firecrawl_keys.wait(pinned)
+        headers = {"Content-Type": "application/json"}
         if firecrawl_api_key:
             headers["Authorization"] = f"Bearer {firecrawl_api_key}"
 
-        payload = {
-            "url": url,
-            "formats": ["markdown"],
-            "waitFor": wait_ms,
-            "timeout": 60000,
-        }
-
         # Add scroll actions only for cloud Firecrawl (self-hosted doesn't support it)
         is_cloud = firecrawl_api_key or 'api.firecrawl.dev' in FIRECRAWL_URL
         if with_scroll and is_cloud:
@@ -282,38 +276,190 @@ def _firecrawl_request(
             ]
             logger.debug(f"Using scroll actions for {url}")
 
-        data = post_json_with_retry(
-            f"{FIRECRAWL_URL}/v1/scrape",
-            json_body=payload,
-            headers=headers if headers else None,
-            timeout=90 if with_scroll else 60
-        )
-
-        if not data:
+        rotate = False
+        try:
+            response = requests.post(
+                f"{FIRECRAWL_URL}/v1/scrape",
+                json=payload,
+                headers=headers,
+                timeout=90 if with_scroll else 60
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            logger.debug(f"Firecrawl request failed: {e}")
+        except Exception as e:
+            logger.debug(f"Firecrawl request failed: {e}")
             return ""
+        else:
+            status = response.status_code
+            firecrawl_keys.report(firecrawl_api_key, status)
+            if status == 200:
+                try:
+                    data = response.json()
+                except ValueError as e:
+                    logger.debug(f"Firecrawl returned invalid JSON: {e}")
+                    return ""
+                return (data or {}).get('data', {}).get('markdown', '')
+
+            # A pooled key out of quota is worth retrying on another healthy key
+            rotate = pinned is None and status in UNHEALTHY_STATUS_CODES and any(
+                firecrawl_keys.healthy(other) for other in firecrawl_keys.keys)
+            if not (rotate or status in RETRYABLE_STATUS_CODES):
+                logger.debug(f"Firecrawl request failed: HTTP {status}")
+                return ""
+            if status == 429 and not rotate:
+                # Back off on the same key rather than wait out its cooldown
+                pinned = firecrawl_api_key or None
+
+        if attempt < FIRECRAWL_RETRIES:
+            delay = 0.0 if rotate else FIRECRAWL_RETRY_BACKOFF * 2 ** attempt
+            logger.debug(f"Retrying Firecrawl for {url} in {delay:.1f}s (attempt {attempt + 2})")
+            time.sleep(delay)
+
+    return ""
+
+
+class _EmbeddedJobsScanner:
+    """
+    Watch streamed HTML for a complete embedded jobs array.
 
-        return data.get('data', {}).get('markdown', '')
+    Tracks bracket depth from each "jobs":[ marker so a fetch can stop as soon as
+    the array closes and parses, instead of downloading the rest of the page.
+    """
 
-    except Exception as e:
-        logger.debug(f"Firecrawl request failed: {e}")
-        return ""
+    def __init__(self):
+        self.buffer = bytearray()
+        self.jobs: List[Dict] = []
+        self._start: Optional[int] = None  # offset of the current marker
+        self._pos = 0  # next offset to scan
+        self._depth = 0
+
+    def feed(self, chunk: bytes) -> bool:
+        """Append a chunk; return True once a complete jobs array has been seen."""
+        self.buffer += chunk
+
+        while True:
+            if self._start is None:
+                match = _JOBS_ARRAY_START.search(self.buffer, self._pos)
+                if not match:
+                    # Keep a small overlap in case a marker straddles two chunks
+                    self._pos = max(self._pos, len(self.buffer) - 16)
+                    return False
+                self._start, self._pos, self._depth = match.start(), match.end(), 1
+
+            closed_at = None
+            for bracket in _BRACKETS.finditer(self.buffer, self._pos):
+                self._depth += 1 if bracket.group() == b'[' else -1
+                if self._depth == 0:
+                    closed_at = bracket.end()
+                    break
+
+            if closed_at is None:
+                self._pos = len(self.buffer)
+                return False
+
+            self.jobs = self._parse_array(closed_at)
+            if self.jobs:
+                return True
+
+            # Not a parseable jobs array - resume after it and look for the next marker
+            self._start, self._pos = None, closed_at
+
+    def _parse_array(self, closed_at: int) -> List[Dict]:
+        """Parse the bracket-balanced array between the current marker and closed_at."""
+        marker = self.buffer[self._start:closed_at]
+        array = bytes(marker[marker.index(b'['):]).decode('utf-8', errors='replace')
+        if marker.startswith(b'\\'):
+            array = array.replace('\\"', '"')
+        try:
+            items = json.loads(array)
+        except json.JSONDecodeError:
+            return []
+        return _jobs_from_array(items)
 
 
-def _fetch_raw_html(url: str) -> str:
-    """Fetch raw HTML directly as fallback when Firecrawl fails."""
+def fetch_raw_html(url: str, max_bytes: int = RAW_HTML_MAX_BYTES) -> str:
+    """
+    Fetch raw HTML directly as fallback when Firecrawl fails.
+
+    See _fetch_raw_html_streamed for streaming, size cap and early exit.
+    The URL is not validated here; check it with is_valid_url first.
+
+    Args:
+        url: The URL to fetch
+        max_bytes: Maximum decoded bytes to read (default RAW_HTML_MAX_BYTES)
+
+    Returns:
+        HTML (possibly truncated) or empty string on failure
+    """
+    return _fetch_raw_html_streamed(url, max_bytes)[0]
+
+
+def _fetch_raw_html_streamed(url: str, max_bytes: int = RAW_HTML_MAX_BYTES) -> Tuple[str, List[Dict]]:
+    """
+    Stream raw HTML with a size cap, stopping early on a complete jobs payload.
+
+    The body is read in chunks with gzip/brotli negotiation, so memory per fetch
+    is bounded by max_bytes. Once a complete embedded jobs array has been
+    received the rest of the page is not needed, so the fetch stops there.
+
+    Args:
+        url: The URL to fetch
+        max_bytes: Maximum decoded bytes to read (default RAW_HTML_MAX_BYTES)
+
+    Returns:
+        (html, embedded_jobs) - html may be truncated; embedded_jobs is non-empty
+        only when the fetch stopped on a complete jobs payload
+    """
     try:
         response = requests.get(
             url,
             timeout=30,
+            stream=True,
             headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+                "Accept-Encoding": ACCEPT_ENCODING,
             }
         )
-        response.raise_for_status()
-        return response.text
+        try:
+            response.raise_for_status()
+
+            scanner = _EmbeddedJobsScanner()
+            jobs: List[Dict] = []
+            for chunk in response.iter_content(chunk_size=RAW_HTML_CHUNK_SIZE):
+                if scanner.feed(chunk[:max_bytes - len(scanner.buffer)]):
+                    logger.debug(f"Found complete embedded jobs after {len(scanner.buffer)} bytes of {url}")
+                    jobs = scanner.jobs
+                    break
+                if len(scanner.buffer) >= max_bytes:
+                    logger.info(f"Raw HTML for {url} exceeds {max_bytes} bytes, truncating")
+                    break
+
+            try:
+                html = scanner.buffer.decode(response.encoding or 'utf-8', errors='replace')
+            except LookupError:
+                html = scanner.buffer.decode('utf-8', errors='replace')
+            return html, jobs
+        finally:
+            response.close()
     except Exception as e:
         logger.debug(f"Raw HTML fetch failed: {e}")
-        return ""
+        return "", []
+
+
+def _jobs_from_array(items) -> List[Dict]:
+    """Normalize an embedded jobs array into job dicts, dropping entries without a title."""
+    if not isinstance(items, list):
+        return []
+    return [
+        {
+            'title': job.get('title'),
+            'department': job.get('department'),
+            'location': job.get('location'),
+            'url': job.get('link') or job.get('url')
+        }
+        for job in items
+        if isinstance(job, dict) and job.get('title')
+    ]
 
 
 def _extract_embedded_jobs(html: str) -> List[Dict]:
@@ -339,14 +485,7 @@ def _extract_embedded_jobs(html: str) -> List[Dict]:
             jobs_str = escaped_match.group(0).replace('\\"', '"')
             jobs_str = '{' + jobs_str + '}'
             data = json.loads(jobs_str)
-            for job in data.get('jobs', []):
-                if job.get('title'):
-                    jobs.append({
-                        'title': job.get('title'),
-                        'department': job.get('department'),
-                        'location': job.get('location'),
-                        'url': job.get('link') or job.get('url')
-                    })
+            jobs = _jobs_from_array(data.get('jobs', []))
             if jobs:
                 logger.debug(f"Extracted {len(jobs)} jobs from escaped JSON")
                 return jobs
@@ -383,30 +522,33 @@ def _extract_embedded_jobs(html: str) -> List[Dict]:
         if unescaped_match:
             try:
                 jobs_str = '[' + unescaped_match.group(1) + ']'
-                job_list = json.loads(jobs_str)
-                for job in job_list:
-                    if isinstance(job, dict) and job.get('title'):
-                        jobs.append({
-                            'title': job.get('title'),
-                            'department': job.get('department'),
-                            'location': job.get('location'),
-                            'url': job.get('link') or job.get('url')
-                        })
+                jobs = _jobs_from_array(json.loads(jobs_str))
                 if jobs:
                     logger.debug(f"Extracted {len(jobs)} jobs from unescaped JSON")
                     return jobs
             except json.JSONDecodeError:
                 pass
 
+            # Arrays with nested brackets defeat the non-greedy match; balance them instead
+            scanner = _EmbeddedJobsScanner()
+            if scanner.feed(html.encode('utf-8')):
+                logger.debug(f"Extracted {len(scanner.jobs)} jobs from nested JSON array")
+                return scanner.jobs
+
     except Exception as e:
         logger.debug(f"Embedded job extraction error: {e}")
 
     return jobs
 
 
-def scrape_with_firecrawl(url: str, api_key: Optional[str] = None) -> str:
+def scrape_with_firecrawl(
+    url: str,
+    api_key: Optional[str] = None,
+    on_borderline: Optional[Callable[[ScrapeResult], None]] = None,
+    cancel: Optional[threading.Event] = None
+) -> ScrapeResult:
     """
-    Scrape a URL using Firecrawl and return markdown content.
+    Scrape a URL using Firecrawl and return the page content.
 
     Uses tiered approach:
     1. Standard scrape with appropriate wait time
@@ -415,59 +557,113 @@ def scrape_with_firecrawl(url: str, api_key: Optional[str] = None) -> str:
 
     Args:
         url: The URL to scrape
-        api_key: Optional Firecrawl API key (uses FIRECRAWL_API_KEY env var if not provided)
+        api_key: Optional Firecrawl API key (default: least-loaded key of FIRECRAWL_API_KEY(S))
+        on_borderline: Called with a copy of the attempt 1 result when it has
+                       content but not enough to skip the retry, so callers can
+                       start extracting from it while the retry runs
+        cancel: When set, remaining tiers are skipped and the best result so
+                far is returned
 
     Returns:
-        Markdown content of the page, or empty string on failure
+        ScrapeResult with content, content type, tier used, per-attempt timings
+        and job keyword score (falsy if nothing was scraped)
     """
-    # Apply rate limiting before making request
-    firecrawl_rate_limiter.wait()
-
-    url_lower = url.lower()
+    result = ScrapeResult(url=url)
 
-    # Determine initial wait time based on URL patterns
+    # Determine initial wait time and heavy SPA handling from URL rules
+    url_class = classify_url(url)
     wait_time = DEFAULT_WAIT_MS
-    if any(pattern in url_lower for pattern in SLOW_SITE_PATTERNS):
+    if url_class.wait_tier == WAIT_TIER_SLOW:
         wait_time = SLOW_SPA_WAIT_MS
         logger.debug(f"Using extended wait time ({wait_time}ms) for slow site: {url}")
 
-    # Check if this is a heavy SPA site
-    is_heavy_spa = any(pattern in url_lower for pattern in HEAVY_SPA_PATTERNS)
+    is_heavy_spa = url_class.needs_scroll
 
     # Attempt 1: Standard scrape
-    markdown = _firecrawl_request(url, wait_time, api_key)
+    # Each document is scored once; the score travels with it on the result
+    markdown = _timed_attempt(result, TIER_FIRECRAWL, firecrawl_request, url, wait_time, api_key)
+    result.content, result.tier, result.score = markdown, TIER_FIRECRAWL, score_job_content(markdown)
 
     # Check if we got meaningful content with job keywords
-    if markdown and len(markdown) > 2000 and _has_job_content(markdown):
-        return markdown
-
-    # Attempt 2: For heavy SPAs or content without jobs, retry with extended wait
-    if is_heavy_spa or not markdown or len(markdown) < 2000 or not _has_job_content(markdown):
-        logger.info(f"Retrying {url} with extended wait ({HEAVY_SPA_WAIT_MS}ms)")
-        firecrawl_rate_limiter.wait()
-        markdown_retry = _firecrawl_request(url, HEAVY_SPA_WAIT_MS, api_key, with_scroll=True)
+    if result.score.is_substantial():
+        return result
+
+    if on_borderline and result.content:
+        on_borderline(replace(result, attempts=list(result.attempts)))
+
+    # Attempt 2: Heavy SPAs and content without jobs get a retry with extended wait
+    if cancel and cancel.is_set():
+        return result
+    score = result.score
+    reason = "heavy SPA" if is_heavy_spa else f"{score.matches} job keywords in {score.length} chars"
+    logger.info(f"Retrying {url} with extended wait ({HEAVY_SPA_WAIT_MS}ms): {reason}")
+    markdown_retry = _timed_attempt(
+        result, TIER_FIRECRAWL_SCROLL, firecrawl_request, url, HEAVY_SPA_WAIT_MS, api_key, with_scroll=True
+    )
 
-        # Use retry result if it's better
-        if markdown_retry and len(markdown_retry) > len(markdown or ""):
-            markdown = markdown_retry
+    # Use retry result if it's better
+    if markdown_retry and len(markdown_retry) > len(result.content):
+        result.content, result.tier = markdown_retry, TIER_FIRECRAWL_SCROLL
+        result.score = score_job_content(markdown_retry)
 
-        if markdown and len(markdown) > 2000 and _has_job_content(markdown):
-            return markdown
+    if result.score.is_substantial() or (cancel and cancel.is_set()):
+        return result
 
     # Attempt 3: Fallback to raw HTML if Firecrawl content lacks job keywords
     # Raw HTML can contain embedded JSON that we can parse directly
-    if not markdown or len(markdown) < 2000 or not _has_job_content(markdown):
-        logger.info(f"Firecrawl returned minimal content, trying raw HTML fallback for {url}")
-        raw_html = _fetch_raw_html(url)
-        if raw_html and len(raw_html) > 5000:
-            # Return HTML wrapped in a marker so extract_jobs knows it's HTML
-            return f"<!-- RAW_HTML -->\n{raw_html}"
+    logger.info(f"Firecrawl returned minimal content, trying raw HTML fallback for {url}")
+    raw_html, embedded_jobs = _timed_attempt(result, TIER_RAW_HTML, _fetch_raw_html_streamed, url)
+    # A fetch that stopped early on a complete jobs payload is kept regardless of size
+    if raw_html and (embedded_jobs or len(raw_html) > 5000):
+        result.content, result.content_type, result.tier = raw_html, CONTENT_HTML, TIER_RAW_HTML
+        result.embedded_jobs = embedded_jobs
+        result.score = None  # keyword score applies to markdown only
+        return result
 
     # Return whatever we got (might be empty)
-    if not markdown:
+    if not result.content:
         logger.error(f"Firecrawl returned empty response for {url}")
 
-    return markdown or ""
+    return result
+
+
+def _timed_attempt(result: ScrapeResult, tier: str, fetch, *args, **kwargs):
+    """Run one fetch attempt and record its timing and size on the result."""
+    start_time = time.time()
+    content = fetch(*args, **kwargs)
+    text = content[0] if isinstance(content, tuple) else content
+    result.attempts.append(ScrapeAttempt(
+        tier=tier,
+        duration_ms=int((time.time() - start_time) * 1000),
+        chars=len(text or ""),
+    ))
+    return content
+
+
+# Speculative extraction of attempt 1 while the scroll retry runs; attempt 1
+# wins outright once it yields this many jobs whose titles appear on the page.
+# Opt-in: a borderline page costs an extra Gemini extraction for lower latency
+SPECULATIVE_EXTRACTION = os.getenv("OPENJOBS_SPECULATIVE_EXTRACTION", "0") == "1"
+SPECULATIVE_WIN_JOBS = 5
+
+# Shared by all speculative scrapes; scrape tasks never wait on extraction
+# tasks, so queued extractions cannot deadlock a full pool
+SPECULATIVE_WORKERS = 8
+_speculative_executor = ThreadPoolExecutor(max_workers=SPECULATIVE_WORKERS, thread_name_prefix="openjobs-speculative")
+
+# Skip Gemini when the heuristic markdown parser is confident (see markdown_jobs)
+HEURISTIC_EXTRACTION = os.getenv("OPENJOBS_HEURISTIC_EXTRACTION", "1") != "0"
+
+# Reuse per-page templates learned from earlier Gemini extractions (see extraction_templates)
+TEMPLATE_EXTRACTION = os.getenv("OPENJOBS_TEMPLATE_EXTRACTION", "1") != "0"
+
+# Send only blocks changed since the last extraction of a page to Gemini (see page_diff)
+DIFFERENTIAL_EXTRACTION = os.getenv("OPENJOBS_DIFFERENTIAL_EXTRACTION", "1") != "0"
+
+CONTINUATION_NOTE = """Your previous answer was cut off. These jobs were already extracted:
+{titles}
+
+Return ONLY the remaining job listings from the page that are not listed above, in the same format."""
 
 
 HTML_EXTRACTION_PROMPT = """Extract all job listings from this careers page HTML.
@@ -488,107 +684,358 @@ Return ONLY a valid JSON array. No explanation, no markdown.
 If no jobs found, return: []"""
 
 
+class _PreparedExtraction(NamedTuple):
+    """Prompt and link map for one extraction, or jobs found without Gemini."""
+
+    prompt_text: str
+    links: Dict[str, str]
+    embedded_jobs: List[Dict]
+
+
+def _prepare_extraction(
+    markdown: Union[str, ScrapeResult],
+    prompt: Optional[str],
+    output_format: Optional[str]
+) -> Optional[_PreparedExtraction]:
+    """
+    Build the extraction prompt for a page.
+
+    Returns embedded jobs directly when the raw HTML carries them, and None
+    when there is too little content to extract from.
+    """
+    page = markdown if isinstance(markdown, ScrapeResult) else ScrapeResult.from_text(markdown)
+    content = page.content
+    if not content:
+        return None
+
+    # Compact rows cut output tokens; a custom prompt keeps its own format
+    default_prompt = (
+        COMPACT_EXTRACTION_PROMPT
+        if (output_format or EXTRACTION_FORMAT) == FORMAT_COMPACT
+        else EXTRACTION_PROMPT
+    )
+
+    # Raw HTML (fallback mode)
+    if page.is_html:
+        # First try: Embedded JSON jobs (found while streaming, or parsed now - no API call)
+        embedded_jobs = page.embedded_jobs or _extract_embedded_jobs(content)
+        if embedded_jobs:
+            logger.info(f"Extracted {len(embedded_jobs)} jobs from embedded JSON")
+            return _PreparedExtraction("", {}, embedded_jobs)
+
+        # Reduce HTML to compact markdown locally before it reaches Gemini
+        conversion = html_to_markdown(content, base_url=page.url or None)
+        if conversion.output_chars >= MIN_CONVERTED_HTML_CHARS:
+            logger.info(
+                f"Reduced HTML {conversion.input_chars} -> {conversion.output_chars} chars "
+                f"({conversion.reduction_ratio:.1f}x, ~{conversion.tokens_saved} tokens saved)"
+            )
+            content = conversion.markdown
+            extraction_prompt = prompt or default_prompt
+            content_limit = 25000
+        else:
+            # Client-rendered page with no visible text - let Gemini read the markup
+            extraction_prompt = HTML_EXTRACTION_PROMPT
+            content_limit = 50000
+            logger.debug("Using HTML extraction mode with Gemini")
+    else:
+        extraction_prompt = prompt or default_prompt
+        content_limit = 25000
+
+    if len(content) < 50:
+        return None
+
+    # Prune boilerplate and shorten long URLs so more listings fit the window
+    links: Dict[str, str] = {}
+    if extraction_prompt is not HTML_EXTRACTION_PROMPT:
+        compacted = compact_markdown(content)
+        logger.debug(
+            f"Compacted prompt content {compacted.original_chars} -> {len(compacted.text)} chars "
+            f"({compacted.saved_chars} saved, {len(compacted.links)} link refs)"
+        )
+        content, links = compacted.text, compacted.links
+        if links:
+            extraction_prompt = f"{extraction_prompt}\n\n{LINK_REFERENCE_NOTE}"
+
+    # Only copy when the page actually exceeds the prompt window
+    if len(content) > content_limit:
+        content = content[:content_limit]
+
+    return _PreparedExtraction(f"{extraction_prompt}{PAGE_CONTENT_MARKER}{content}", links, [])
+
+
+def _recurring_page(markdown: Union[str, ScrapeResult], prompt: Optional[str]) -> Optional[ScrapeResult]:
+    """
+    The page if results from earlier runs apply to it (templates, snapshots):
+    Firecrawl markdown with a URL, extracted with the default prompt.
+    """
+    if prompt is not None or not isinstance(markdown, ScrapeResult):
+        return None
+    return markdown if markdown.url and markdown.content and not markdown.is_html else None
+
+
+def _heuristic_jobs(markdown: Union[str, ScrapeResult], prompt: Optional[str]) -> Optional[List[Dict]]:
+    """Jobs from the local markdown parser, or None if it is not confident."""
+    if not HEURISTIC_EXTRACTION or prompt is not None:
+        return None
+    page = markdown if isinstance(markdown, ScrapeResult) else ScrapeResult.from_text(markdown)
+    if page.is_html or not page.content:
+        return None
+    result = parse_job_list(page.content)
+    if not result.confident:
+        logger.debug(f"Markdown parser confidence {result.confidence:.2f} for {len(result.jobs)} jobs, using Gemini")
+        return None
+    logger.info(f"Parsed {len(result.jobs)} jobs from markdown without Gemini (confidence {result.confidence:.2f})")
+    return result.jobs
+
+
 def extract_jobs_from_markdown(
-    markdown: str,
+    markdown: Union[str, ScrapeResult],
     prompt: Optional[str] = None,
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    output_format: Optional[str] = None
 ) -> List[Dict]:
     """
     Use Gemini to extract job listings from markdown or HTML content.
 
+    For a Firecrawl ScrapeResult with the default prompt, a template learned
+    from an earlier extraction of the same page is tried first, and a new
+    template is learned from Gemini's result (OPENJOBS_TEMPLATE_EXTRACTION=0
+    turns this off). Markdown with the default prompt then goes through the
+    heuristic job-list parser, and Gemini is skipped when it is confident
+    (OPENJOBS_HEURISTIC_EXTRACTION=0 turns this off). When a page was
+    extracted before, only the blocks that changed since are sent to Gemini
+    and merged into the previous jobs (OPENJOBS_DIFFERENTIAL_EXTRACTION=0
+    turns this off).
+
     Args:
-        markdown: Page content as markdown (or HTML if marked with <!-- RAW_HTML -->)
+        markdown: ScrapeResult from scrape_with_firecrawl, or page content as a
+                  string (HTML if prefixed with <!-- RAW_HTML -->)
         prompt: Custom extraction prompt (uses default if not provided)
-        api_key: Google API key (uses GOOGLE_API_KEY env var if not provided)
+        api_key: Google API key (default: least-loaded key of GOOGLE_API_KEY(S))
+        output_format: "compact" or "json" for the default prompt
+                       (uses OPENJOBS_EXTRACTION_FORMAT, default "compact")
 
     Returns:
         List of job dicts with title, department, location, url
     """
-    if not markdown or len(markdown) < 50:
+    page = _recurring_page(markdown, prompt)
+    jobs = extract_with_template(page.url, page.content) if page and TEMPLATE_EXTRACTION else None
+    if not jobs:
+        jobs = _heuristic_jobs(markdown, prompt)
+    if jobs:
+        if page and DIFFERENTIAL_EXTRACTION:
+            record_snapshot(page.url, page.content, jobs)
+        return jobs
+
+    if not page:
+        return _extract_with_gemini(markdown, prompt, api_key, output_format)
+
+    if DIFFERENTIAL_EXTRACTION:
+        jobs = extract_changed_blocks(
+            page.url, page.content,
+            lambda content: _extract_with_gemini(replace(page, content=content), prompt, api_key, output_format)
+        )
+    else:
+        jobs = _extract_with_gemini(page, prompt, api_key, output_format)
+    if jobs and TEMPLATE_EXTRACTION:
+        learn_template(page.url, page.content, jobs)
+    return jobs
+
+
+def _extract_with_gemini(
+    markdown: Union[str, ScrapeResult],
+    prompt: Optional[str],
+    api_key: Optional[str],
+    output_format: Optional[str]
+) -> List[Dict]:
+    """Extract jobs from page content with Gemini (continuing past the output token cap)."""
+    prepared = _prepare_extraction(markdown, prompt, output_format)
+    if prepared is None:
         return []
+    if prepared.embedded_jobs:
+        return prepared.embedded_jobs
 
-    google_api_key = api_key or GOOGLE_API_KEY
-    if not google_api_key:
+    if not (api_key or gemini_keys.select()):
         logger.error("GOOGLE_API_KEY not set")
         return []
 
-    # Check if content is raw HTML (fallback mode)
-    is_html = markdown.startswith("<!-- RAW_HTML -->")
-    if is_html:
-        html_content = markdown[len("<!-- RAW_HTML -->\n"):]
+    links = prepared.links
+    base_prompt = prepared.prompt_text
+    prompt_text = base_prompt
+    jobs: List[Dict] = []
+    seen = set()
+    start_time = time.time()
 
-        # First try: Extract embedded JSON jobs directly (fast, no API call)
-        embedded_jobs = _extract_embedded_jobs(html_content)
-        if embedded_jobs:
-            logger.info(f"Extracted {len(embedded_jobs)} jobs from embedded JSON")
-            return embedded_jobs
+    try:
+        for _ in range(MAX_CONTINUATIONS + 1):
+            text, finish_reason = _generate_extraction(prompt_text, api_key)
+            if not text:
+                break
+
+            # Keep every complete job even if the output was cut off
+            batch, complete = parse_partial_jobs(text)
+            new_jobs = [j for j in batch if (j.get('title'), j.get('url')) not in seen]
+            seen.update((j.get('title'), j.get('url')) for j in new_jobs)
+            jobs.extend(new_jobs)
+
+            if finish_reason != FINISH_MAX_TOKENS:
+                break
+            logger.warning(
+                f"Gemini output hit the token cap after {len(jobs)} jobs "
+                f"(complete JSON: {complete}), requesting the remaining listings"
+            )
+            if not new_jobs:
+                break
+            titles = '\n'.join(f"- {j['title']}" for j in jobs)
+            prompt_text = f"{base_prompt}\n\n{CONTINUATION_NOTE.format(titles=titles)}"
 
-        # Fallback: Use Gemini to parse HTML
-        markdown = html_content
-        extraction_prompt = HTML_EXTRACTION_PROMPT
-        content_limit = 50000
-        logger.debug("Using HTML extraction mode with Gemini")
-    else:
-        extraction_prompt = prompt or EXTRACTION_PROMPT
-        content_limit = 25000
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse Gemini response: {e}")
+    except Exception as e:
+        logger.error(f"Gemini extraction failed: {e}")
+
+    duration_ms = int((time.time() - start_time) * 1000)
+    logger.debug(f"Extracted {len(jobs)} jobs in {duration_ms}ms")
+    return restore_links(jobs, links)
+
+
+def iter_jobs_from_markdown(
+    markdown: Union[str, ScrapeResult],
+    prompt: Optional[str] = None,
+    api_key: Optional[str] = None,
+    output_format: Optional[str] = None
+) -> Iterator[Dict]:
+    """
+    Stream job listings from markdown or HTML content as Gemini writes them.
+
+    Uses Gemini's streaming endpoint and yields each job as soon as its JSON
+    object (or compact row) closes, so callers can enrich or store jobs while
+    extraction is still running. Same arguments and job dicts as
+    extract_jobs_from_markdown.
 
+    Yields:
+        Job dicts with title, department, location, url
+    """
+    page = _recurring_page(markdown, prompt)
+    jobs = extract_with_template(page.url, page.content) if page and TEMPLATE_EXTRACTION else None
+    if not jobs:
+        jobs = _heuristic_jobs(markdown, prompt)
+    if jobs:
+        if page and DIFFERENTIAL_EXTRACTION:
+            record_snapshot(page.url, page.content, jobs)
+        yield from jobs
+        return
+
+    prepared = _prepare_extraction(markdown, prompt, output_format)
+    if prepared is None:
+        return
+    if prepared.embedded_jobs:
+        yield from prepared.embedded_jobs
+        return
+
+    if not (api_key or gemini_keys.select()):
+        logger.error("GOOGLE_API_KEY not set")
+        return
+
+    prompt_text = prepared.prompt_text
+    streamed: List[Dict] = []
+    titles: List[str] = []
+    seen = set()
     start_time = time.time()
 
     try:
-        payload = {
-            "contents": [{"parts": [{"text": f"{extraction_prompt}\n\nPage content:\n{markdown[:content_limit]}"}]}],
-            "generationConfig": {
-                "temperature": 0.1,
-                "maxOutputTokens": 8192
-            }
-        }
+        for _ in range(MAX_CONTINUATIONS + 1):
+            decoder = JobStreamDecoder()
+            finish_reason = None
+            new_jobs = 0
+            for delta, reason in _stream_extraction(prompt_text, api_key):
+                finish_reason = reason or finish_reason
+                for job in decoder.feed(delta):
+                    key = (job.get('title'), job.get('url'))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    titles.append(job['title'])
+                    new_jobs += 1
+                    if len(titles) == 1:
+                        logger.debug(f"First job streamed after {int((time.time() - start_time) * 1000)}ms")
+                    job = restore_links([job], prepared.links)[0]
+                    streamed.append(job)
+                    yield job
+
+            if finish_reason != FINISH_MAX_TOKENS or not new_jobs:
+                break
+            logger.warning(
+                f"Gemini stream hit the token cap after {len(titles)} jobs, requesting the remaining listings"
+            )
+            listed = '\n'.join(f"- {title}" for title in titles)
+            prompt_text = f"{prepared.prompt_text}\n\n{CONTINUATION_NOTE.format(titles=listed)}"
 
-        response = requests.post(
-            f"{GEMINI_URL}?key={google_api_key}",
-            json=payload,
-            timeout=30
-        )
-        duration_ms = int((time.time() - start_time) * 1000)
+    except Exception as e:
+        logger.error(f"Gemini streaming extraction failed: {e}")
 
-        if response.status_code != 200:
-            logger.error(f"Gemini error {response.status_code}: {response.text[:200]}")
-            return []
+    duration_ms = int((time.time() - start_time) * 1000)
+    logger.debug(f"Streamed {len(titles)} jobs in {duration_ms}ms")
+    if page and streamed:
+        if TEMPLATE_EXTRACTION:
+            learn_template(page.url, page.content, streamed)
+        if DIFFERENTIAL_EXTRACTION:
+            record_snapshot(page.url, page.content, streamed)
 
-        result = response.json()
 
-        # Extract text from response
-        text = ""
-        if 'candidates' in result and result['candidates']:
-            parts = result['candidates'][0].get('content', {}).get('parts', [])
-            for part in parts:
-                if 'text' in part:
-                    text += part['text']
+def _extraction_request(prompt_text: str, api_key: Optional[str]) -> Tuple[List[Dict], Optional[str], Optional[str]]:
+    """
+    Contents, cached content and key for an extraction prompt.
 
-        if not text:
-            return []
+    The instructions before the page content are referenced as Gemini cached
+    content when they are large enough to cache; such a request has to use
+    the key the cached content belongs to, any other may use any pooled key.
+    """
+    instructions, marker, page = prompt_text.partition(PAGE_CONTENT_MARKER)
+    cached_content = None
+    if marker:
+        cache_key = api_key or gemini_keys.select()
+        prompt_text, cached_content = build_contents(GEMINI_MODEL, instructions, marker.lstrip() + page, cache_key)
+        if cached_content:
+            api_key = cache_key
+    return [{"parts": [{"text": prompt_text}]}], cached_content, api_key
 
-        # Parse JSON from response
-        text = text.strip()
-        if text.startswith('```'):
-            lines = text.split('\n')
-            text = '\n'.join(lines[1:-1] if lines[-1] == '```' else lines[1:])
 
-        start = text.find('[')
-        end = text.rfind(']') + 1
+def _stream_extraction(prompt_text: str, api_key: Optional[str] = None) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Send one extraction prompt to Gemini's streaming endpoint.
 
-        if start == -1 or end == 0:
-            return []
+    Yields:
+        (text delta, finishReason) per server-sent event; nothing on an API error
+    """
+    contents, cached_content, api_key = _extraction_request(prompt_text, api_key)
+    yield from default_client.stream(
+        contents,
+        task="extraction",
+        api_key=api_key,
+        generation_config=EXTRACTION_GENERATION_CONFIG,
+        cached_content=cached_content,
+    )
 
-        jobs = json.loads(text[start:end])
-        logger.debug(f"Extracted {len(jobs)} jobs in {duration_ms}ms")
-        return [j for j in jobs if isinstance(j, dict) and j.get('title')]
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse Gemini response: {e}")
-        return []
-    except Exception as e:
-        logger.error(f"Gemini extraction failed: {e}")
-        return []
+def _generate_extraction(prompt_text: str, api_key: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """
+    Send one extraction prompt to Gemini.
+
+    Returns:
+        Tuple of (response text, finishReason); ("", None) on an API error
+    """
+    contents, cached_content, api_key = _extraction_request(prompt_text, api_key)
+    response = default_client.generate(
+        contents,
+        task="extraction",
+        api_key=api_key,
+        generation_config=EXTRACTION_GENERATION_CONFIG,
+        cached_content=cached_content,
+        timeout=30,
+    )
+    return response.text, response.finish_reason
 
 
 def scrape_careers_page(
@@ -596,7 +1043,8 @@ def scrape_careers_page(
     company_name: Optional[str] = None,
     firecrawl_api_key: Optional[str] = None,
     google_api_key: Optional[str] = None,
-    extraction_prompt: Optional[str] = None
+    extraction_prompt: Optional[str] = None,
+    speculative: Optional[bool] = None
 ) -> List[Dict]:
     """
     Scrape job postings from a careers page using Firecrawl + Gemini.
@@ -609,13 +1057,152 @@ def scrape_careers_page(
         firecrawl_api_key: Optional Firecrawl API key
         google_api_key: Optional Google API key for Gemini
         extraction_prompt: Optional custom prompt for job extraction
+        speculative: Extract from the first Firecrawl result while the scroll
+                     retry runs (uses OPENJOBS_SPECULATIVE_EXTRACTION, default off)
 
     Returns:
         List of job entries with: company, job_url, slug, title, department, location, date_scraped
     """
-    if not url:
+    target = _resolve_careers_target(url, company_name)
+    if not target:
+        return []
+    url, company_name = target
+
+    # Step 1 + 2: Scrape page with Firecrawl and extract jobs with Gemini
+    if SPECULATIVE_EXTRACTION if speculative is None else speculative:
+        page, jobs = _scrape_and_extract_speculative(url, firecrawl_api_key, google_api_key, extraction_prompt)
+    else:
+        page = scrape_with_firecrawl(url, api_key=firecrawl_api_key)
+        jobs = extract_jobs_from_markdown(page, prompt=extraction_prompt, api_key=google_api_key) if page else []
+    if not page:
+        logger.warning(f"No content from Firecrawl for {url}")
         return []
 
+    if not jobs:
+        logger.info(f"No jobs extracted from {url}")
+        return []
+
+    logger.info(f"Extracted {len(jobs)} jobs from {company_name}")
+
+    # Step 3: Format output
+    now = datetime.now().isoformat()
+    return [_format_job_entry(job, idx, company_name, url, now) for idx, job in enumerate(jobs)]
+
+
+def _count_validated_jobs(jobs: List[Dict], content: str) -> int:
+    """Count jobs whose title actually appears in the page content."""
+    haystack = ' '.join(content.lower().split())
+    return sum(1 for job in jobs if ' '.join(str(job.get('title', '')).lower().split()) in haystack)
+
+
+def _scrape_and_extract_speculative(
+    url: str,
+    firecrawl_api_key: Optional[str],
+    google_api_key: Optional[str],
+    prompt: Optional[str]
+) -> Tuple[ScrapeResult, List[Dict]]:
+    """
+    Scrape a page, overlapping extraction of attempt 1 with the scroll retry.
+
+    When attempt 1 is borderline, extraction starts on it in the background
+    while scrape_with_firecrawl retries. If that speculative extraction finds
+    at least SPECULATIVE_WIN_JOBS validated jobs before the scrape finishes,
+    the remaining tiers are cancelled and its result is used. Otherwise the
+    final page is extracted too (unless it is the attempt 1 content) and the
+    result with more validated jobs wins. A cancelled retry starts no further
+    tier; only its in-flight Firecrawl request finishes on the shared pool.
+
+    Returns:
+        (page, jobs) for the winning result
+    """
+    cancel = threading.Event()
+    speculation: Dict[str, Future] = {}
+
+    def on_borderline(first: ScrapeResult) -> None:
+        logger.debug(f"Speculatively extracting attempt 1 of {url} while the retry runs")
+        speculation['first'] = first
+        speculation['jobs'] = _speculative_executor.submit(
+            extract_jobs_from_markdown, first, prompt=prompt, api_key=google_api_key
+        )
+
+    scrape_future = _speculative_executor.submit(
+        scrape_with_firecrawl, url, firecrawl_api_key, on_borderline=on_borderline, cancel=cancel
+    )
+    while not scrape_future.done():
+        spec_future = speculation.get('jobs')
+        if spec_future is None or not spec_future.done():
+            wait([f for f in (scrape_future, spec_future) if f], timeout=0.25, return_when=FIRST_COMPLETED)
+            continue
+
+        first, spec_jobs = speculation['first'], spec_future.result()
+        if _count_validated_jobs(spec_jobs, first.content) >= SPECULATIVE_WIN_JOBS:
+            # Attempt 1 clearly wins: stop waiting for the retry
+            cancel.set()
+            logger.info(f"Speculative extraction found {len(spec_jobs)} jobs, cancelling retry for {url}")
+            return first, spec_jobs
+        break
+
+    page = scrape_future.result()
+    spec_future = speculation.get('jobs')
+    if spec_future is None:
+        jobs = extract_jobs_from_markdown(page, prompt=prompt, api_key=google_api_key) if page else []
+        return page, jobs
+
+    first, spec_jobs = speculation['first'], spec_future.result()
+    if not page or (page.content == first.content and page.content_type == first.content_type):
+        return first, spec_jobs
+
+    jobs = extract_jobs_from_markdown(page, prompt=prompt, api_key=google_api_key)
+    if _count_validated_jobs(spec_jobs, first.content) > _count_validated_jobs(jobs, page.content):
+        logger.info(f"Speculative attempt 1 result kept for {url} ({len(spec_jobs)} vs {len(jobs)} jobs)")
+        return first, spec_jobs
+    return page, jobs
+
+
+def iter_careers_page(
+    url: str,
+    company_name: Optional[str] = None,
+    firecrawl_api_key: Optional[str] = None,
+    google_api_key: Optional[str] = None,
+    extraction_prompt: Optional[str] = None
+) -> Iterator[Dict]:
+    """
+    Scrape a careers page and yield job entries as Gemini extracts them.
+
+    Streaming counterpart of scrape_careers_page: the first entry is available
+    as soon as Gemini has written it, instead of after the whole response.
+
+    Args:
+        url: The careers page URL to scrape
+        company_name: Optional company name (extracted from URL if not provided)
+        firecrawl_api_key: Optional Firecrawl API key
+        google_api_key: Optional Google API key for Gemini
+        extraction_prompt: Optional custom prompt for job extraction
+
+    Yields:
+        Job entries with: company, job_url, slug, title, department, location, date_scraped
+    """
+    target = _resolve_careers_target(url, company_name)
+    if not target:
+        return
+    url, company_name = target
+
+    page = scrape_with_firecrawl(url, api_key=firecrawl_api_key)
+    if not page:
+        logger.warning(f"No content from Firecrawl for {url}")
+        return
+
+    now = datetime.now().isoformat()
+    jobs = iter_jobs_from_markdown(page, prompt=extraction_prompt, api_key=google_api_key)
+    for idx, job in enumerate(jobs):
+        yield _format_job_entry(job, idx, company_name, url, now)
+
+
+def _resolve_careers_target(url: str, company_name: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Normalize and validate a careers URL; return (url, company_name) or None."""
+    if not url:
+        return None
+
     # Ensure URL has protocol
     if not url.startswith('http'):
         url = f'https://{url}'
@@ -624,7 +1211,7 @@ def scrape_careers_page(
     is_valid, reason = is_valid_url(url)
     if not is_valid:
         logger.info(f"Skipping invalid URL: {url} ({reason})")
-        return []
+        return None
 
     # Extract company name from URL if not provided
     if not company_name:
@@ -635,47 +1222,24 @@ def scrape_careers_page(
             company_name = "unknown"
 
     logger.info(f"Scraping {company_name} careers page: {url}")
+    return url, company_name
 
-    # Step 1: Scrape page with Firecrawl
-    markdown = scrape_with_firecrawl(url, api_key=firecrawl_api_key)
-    if not markdown:
-        logger.warning(f"No content from Firecrawl for {url}")
-        return []
 
-    # Step 2: Extract jobs with Gemini
-    jobs = extract_jobs_from_markdown(
-        markdown,
-        prompt=extraction_prompt,
-        api_key=google_api_key
-    )
-    if not jobs:
-        logger.info(f"No jobs extracted from {url}")
-        return []
-
-    logger.info(f"Extracted {len(jobs)} jobs from {company_name}")
-
-    # Step 3: Format output
-    jobs_data = []
-    now = datetime.now().isoformat()
-
-    for idx, job in enumerate(jobs):
-        title = job.get('title', '')
-        job_url = job.get('url') or f"{url}#job-{idx}"
-
-        job_entry = {
-            "company": company_name,
-            "title": title,
-            "department": job.get('department'),
-            "location": job.get('location'),
-            "job_url": job_url,
-            "slug": create_slug(company_name, title),
-            "date_scraped": now,
-            "source_url": url
-        }
+def _format_job_entry(job: Dict, idx: int, company_name: str, url: str, now: str) -> Dict:
+    """Turn an extracted job into an output entry."""
+    title = job.get('title', '')
+    job_url = job.get('url') or f"{url}#job-{idx}"
 
-        jobs_data.append(job_entry)
-
-    return jobs_data
+    return {
+        "company": company_name,
+        "title": title,
+        "department": job.get('department'),
+        "location": job.get('location'),
+        "job_url": job_url,
+        "slug": create_slug(company_name, title),
+        "date_scraped": now,
+        "source_url": url
+    }
 
 
 def _check_url_exists(url: str) -> bool:
@@ -687,13 +1251,13 @@ def _check_url_exists(url: str) -> bool:
         return False
 
 
-def _search_careers_with_gemini(domain: str, api_key: str) -> Optional[str]:
+def _search_careers_with_gemini(domain: str, api_key: Optional[str] = None) -> Optional[str]:
     """
     Use Gemini with Google Search grounding to find careers page.
 
     Args:
         domain: Company domain (e.g., "stripe.com")
-        api_key: Google API key
+        api_key: Google API key (default: least-loaded pooled key)
 
     Returns:
         Best careers page URL or None
@@ -706,29 +1270,15 @@ For example, stripe.com's jobs are at stripe.com/jobs/search, not stripe.com/job
 
 Return ONLY the URL, nothing else. If you cannot find it, return "NONE"."""
 
-        response = requests.post(
-            f"{GEMINI_URL}?key={api_key}",
-            json={
-                "contents": [{"parts": [{"text": prompt}]}],
-                "tools": [{"google_search": {}}],
-                "generationConfig": {"temperature": 0.1}
-            },
+        response = default_client.generate(
+            [{"parts": [{"text": prompt}]}],
+            task="search",
+            api_key=api_key,
+            generation_config={"temperature": 0.1},
+            tools=[{"google_search": {}}],
             timeout=30
         )
-
-        if response.status_code != 200:
-            logger.debug(f"Gemini search failed: {response.status_code}")
-            return None
-
-        result = response.json()
-
-        # Extract text from response
-        text = ""
-        if 'candidates' in result and result['candidates']:
-            parts = result['candidates'][0].get('content', {}).get('parts', [])
-            for part in parts:
-                if 'text' in part:
-                    text += part['text']
+        text = response.text
 
         text = text.strip()
         if not text or text.upper() == "NONE":
@@ -802,13 +1352,12 @@ def discover_careers_url(
             return test_url
 
     # Step 2: Use Gemini with Google Search
-    api_key = google_api_key or GOOGLE_API_KEY
-    if not api_key:
+    if not (google_api_key or gemini_keys.select()):
         logger.warning("No Google API key for Gemini search")
         return None
 
     logger.info(f"Searching for {domain} careers page with Gemini...")
-    found_url = _search_careers_with_gemini(domain, api_key)
+    found_url = _search_careers_with_gemini(domain, google_api_key)
 
     if found_url:
         logger.info(f"Found careers page via search: {found_url}")
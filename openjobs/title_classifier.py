@@ -0,0 +1,372 @@
+"""
+OpenJobs Title Classifier - Local category model distilled from Gemini labels
+
+Every classify_job call sends a title to Gemini, although the enrichment
+cache already holds many titles Gemini has labelled. This trains a small
+linear model on them: hashed character n-grams and words of the title, a
+multinomial naive Bayes over category/subcategory pairs, and a softmax
+temperature fitted on held-out titles so the confidence is calibrated.
+classify_job answers locally when the model is at least
+LOCAL_CLASSIFIER_THRESHOLD sure and asks Gemini otherwise. Standard library
+only.
+
+Train and report accuracy and avoided calls with:
+
+    python -m openjobs.title_classifier --cache enrichment.db --out title_model.json
+"""
+
+import json
+import math
+import os
+import random
+import re
+import threading
+import zlib
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .logger import logger
+
+# Saved model used by classify_job (none when unset)
+TITLE_MODEL_PATH = os.getenv("OPENJOBS_TITLE_MODEL", "")
+
+# classify_job answers locally at or above this calibrated confidence
+LOCAL_CLASSIFIER_THRESHOLD = float(os.getenv("OPENJOBS_LOCAL_CLASSIFIER_THRESHOLD", "0.9"))
+
+HASH_BUCKETS = 2 ** 18
+NGRAM_SIZES = (3, 4, 5)
+SMOOTHING = 0.1
+
+# Share of titles held out to fit the temperature and report accuracy
+HOLDOUT_RATIO = 0.2
+
+_LABEL_SEPARATOR = "\t"
+_NON_WORD = re.compile(r'[^a-z0-9+#]+')
+
+
+def title_features(title: str) -> List[int]:
+    """Hashed character n-grams and words of a normalized title."""
+    text = _NON_WORD.sub(" ", (title or "").lower()).strip()
+    grams = {f"w:{word}" for word in text.split()}
+    padded = f" {text} "
+    for size in NGRAM_SIZES:
+        grams.update(padded[i:i + size] for i in range(len(padded) - size + 1))
+    return sorted({zlib.crc32(gram.encode("utf-8")) % HASH_BUCKETS for gram in grams})
+
+
+class Prediction(NamedTuple):
+    """Most likely category/subcategory and calibrated probabilities."""
+
+    category: str
+    subcategory: str
+    confidence: float
+    category_confidence: float
+
+
+class TitleClassifier:
+    """
+    Multinomial naive Bayes over hashed title features, with a calibrated softmax.
+
+    Example:
+        >>> model = TitleClassifier.train([("Backend Engineer", "Software Engineering", "Backend Engineer"),
+        ...                                ("Data Scientist", "Data", "Data Scientist")])
+        >>> model.predict("Senior Backend Engineer").category
+        'Software Engineering'
+    """
+
+    def __init__(
+        self,
+        labels: List[str],
+        class_counts: List[int],
+        feature_totals: List[int],
+        feature_counts: Dict[int, Dict[int, int]],
+        temperature: float = 1.0,
+        taxonomy_version: str = ""
+    ):
+        self.labels = labels
+        self.class_counts = class_counts
+        self.feature_totals = feature_totals
+        self.feature_counts = feature_counts
+        self.temperature = temperature
+        self.taxonomy_version = taxonomy_version
+        total = sum(class_counts)
+        self._log_prior = [math.log(count / total) for count in class_counts]
+        self._log_denominator = [math.log(t + SMOOTHING * HASH_BUCKETS) for t in feature_totals]
+
+    @classmethod
+    def train(
+        cls,
+        examples: Iterable[Tuple[str, str, str]],
+        taxonomy_version: str = "",
+        temperature: float = 1.0
+    ) -> "TitleClassifier":
+        """
+        Count features per category/subcategory pair.
+
+        Args:
+            examples: (title, category, subcategory) triples
+            taxonomy_version: Taxonomy the labels belong to
+            temperature: Softmax temperature (see calibrate)
+        """
+        label_index: Dict[str, int] = {}
+        class_counts: List[int] = []
+        feature_totals: List[int] = []
+        feature_counts: Dict[int, Dict[int, int]] = defaultdict(dict)
+        for title, category, subcategory in examples:
+            label = f"{category}{_LABEL_SEPARATOR}{subcategory}"
+            if label not in label_index:
+                label_index[label] = len(class_counts)
+                class_counts.append(0)
+                feature_totals.append(0)
+            c = label_index[label]
+            features = title_features(title)
+            class_counts[c] += 1
+            feature_totals[c] += len(features)
+            for feature in features:
+                counts = feature_counts[feature]
+                counts[c] = counts.get(c, 0) + 1
+        if not class_counts:
+            raise ValueError("No labelled titles to train on")
+        return cls(list(label_index), class_counts, feature_totals, dict(feature_counts), temperature, taxonomy_version)
+
+    def _scores(self, title: str) -> List[float]:
+        """Log-likelihood of each label (up to a shared constant)."""
+        features = title_features(title)
+        log_smoothing = math.log(SMOOTHING)
+        scores = [
+            prior + len(features) * (log_smoothing - denominator)
+            for prior, denominator in zip(self._log_prior, self._log_denominator)
+        ]
+        for feature in features:
+            for c, count in self.feature_counts.get(feature, {}).items():
+                scores[c] += math.log(count + SMOOTHING) - log_smoothing
+        return scores
+
+    @staticmethod
+    def _softmax(scores: Sequence[float], temperature: float) -> List[float]:
+        top = max(scores)
+        exps = [math.exp((score - top) / temperature) for score in scores]
+        total = sum(exps)
+        return [e / total for e in exps]
+
+    def probabilities(self, title: str) -> Dict[str, float]:
+        """Calibrated probability of each "category<TAB>subcategory" label."""
+        return dict(zip(self.labels, self._softmax(self._scores(title), self.temperature)))
+
+    def predict(self, title: str) -> Prediction:
+        """Most likely category and subcategory of a title."""
+        probabilities = self._softmax(self._scores(title), self.temperature)
+        best = max(range(len(probabilities)), key=probabilities.__getitem__)
+        category, subcategory = self.labels[best].split(_LABEL_SEPARATOR, 1)
+        category_confidence = sum(
+            p for label, p in zip(self.labels, probabilities) if label.split(_LABEL_SEPARATOR, 1)[0] == category
+        )
+        return Prediction(category, subcategory, probabilities[best], category_confidence)
+
+    def calibrate(self, examples: Sequence[Tuple[str, str, str]]) -> float:
+        """
+        Fit the softmax temperature that minimizes log loss on held-out titles.
+
+        Naive Bayes multiplies correlated n-gram evidence and is far too sure
+        of itself; dividing the scores by a fitted temperature fixes that.
+
+        Returns:
+            The fitted temperature
+        """
+        label_index = {label: c for c, label in enumerate(self.labels)}
+        scored = [
+            (self._scores(title), label_index.get(f"{category}{_LABEL_SEPARATOR}{subcategory}"))
+            for title, category, subcategory in examples
+        ]
+        scored = [(scores, c) for scores, c in scored if c is not None]
+        if not scored:
+            return self.temperature
+
+        def log_loss(temperature: float) -> float:
+            return -sum(math.log(max(self._softmax(scores, temperature)[c], 1e-12)) for scores, c in scored)
+
+        candidates = [2 ** (step / 4) for step in range(-8, 41)]
+        self.temperature = min(candidates, key=log_loss)
+        return self.temperature
+
+    def save(self, path: str) -> None:
+        """Write the model as JSON."""
+        data = {
+            "labels": self.labels,
+            "class_counts": self.class_counts,
+            "feature_totals": self.feature_totals,
+            "feature_counts": {str(f): {str(c): n for c, n in counts.items()} for f, counts in self.feature_counts.items()},
+            "temperature": self.temperature,
+            "taxonomy_version": self.taxonomy_version,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "TitleClassifier":
+        """Read a model written by save."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        feature_counts = {
+            int(f): {int(c): n for c, n in counts.items()} for f, counts in data["feature_counts"].items()
+        }
+        return cls(data["labels"], data["class_counts"], data["feature_totals"], feature_counts,
+                   data["temperature"], data.get("taxonomy_version", ""))
+
+
+class Evaluation(NamedTuple):
+    """Held-out accuracy and how many Gemini calls the threshold avoids."""
+
+    examples: int
+    accuracy: float
+    category_accuracy: float
+    avoided_ratio: float
+    accuracy_when_local: float
+
+
+def evaluate(
+    model: TitleClassifier,
+    examples: Sequence[Tuple[str, str, str]],
+    threshold: float = LOCAL_CLASSIFIER_THRESHOLD
+) -> Evaluation:
+    """Score a model on labelled titles it was not trained on."""
+    correct = category_correct = local = local_correct = 0
+    for title, category, subcategory in examples:
+        prediction = model.predict(title)
+        hit = (prediction.category, prediction.subcategory) == (category, subcategory)
+        correct += hit
+        category_correct += prediction.category == category
+        if prediction.confidence >= threshold:
+            local += 1
+            local_correct += hit
+    n = len(examples)
+    return Evaluation(
+        n,
+        correct / n if n else 0.0,
+        category_correct / n if n else 0.0,
+        local / n if n else 0.0,
+        local_correct / local if local else 0.0,
+    )
+
+
+def train_from_examples(
+    examples: Sequence[Tuple[str, str, str]],
+    taxonomy_version: str = "",
+    threshold: float = LOCAL_CLASSIFIER_THRESHOLD,
+    seed: int = 0
+) -> Tuple[TitleClassifier, Evaluation]:
+    """
+    Train on part of the titles, calibrate and evaluate on the rest, then
+    retrain on all of them with the fitted temperature.
+
+    Returns:
+        (model trained on every title, evaluation on the held-out titles)
+    """
+    shuffled = list(examples)
+    random.Random(seed).shuffle(shuffled)
+    split = int(len(shuffled) * (1 - HOLDOUT_RATIO))
+    train, holdout = shuffled[:split], shuffled[split:]
+
+    model = TitleClassifier.train(train, taxonomy_version)
+    # Half the holdout fits the temperature, the other half measures it
+    middle = len(holdout) // 2
+    temperature = model.calibrate(holdout[:middle])
+    evaluation = evaluate(model, holdout[middle:], threshold)
+    return TitleClassifier.train(shuffled, taxonomy_version, temperature), evaluation
+
+
+_default_model: Optional[TitleClassifier] = None
+_default_loaded = False
+_default_lock = threading.Lock()
+
+# Titles the default model classified itself, and those it left to Gemini
+stats: Dict[str, int] = {"local": 0, "deferred": 0}
+
+
+def default_classifier(taxonomy_version: str) -> Optional[TitleClassifier]:
+    """
+    The model at OPENJOBS_TITLE_MODEL, loaded once; None when unset, missing
+    or trained on another taxonomy.
+    """
+    global _default_model, _default_loaded
+    with _default_lock:
+        if not _default_loaded:
+            _default_loaded = True
+            if TITLE_MODEL_PATH:
+                try:
+                    _default_model = TitleClassifier.load(TITLE_MODEL_PATH)
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"Could not load title model from {TITLE_MODEL_PATH}: {e}")
+        model = _default_model
+    if model is not None and model.taxonomy_version and model.taxonomy_version != taxonomy_version:
+        logger.debug("Title model was trained on another taxonomy, not using it")
+        return None
+    return model
+
+
+def confident_prediction(job_title: str, taxonomy_version: str) -> Optional[Prediction]:
+    """
+    The default model's prediction when it clears LOCAL_CLASSIFIER_THRESHOLD.
+
+    Returns:
+        Prediction, or None to ask Gemini (no model, or not confident enough)
+    """
+    model = default_classifier(taxonomy_version)
+    if model is None:
+        return None
+    prediction = model.predict(job_title)
+    with _default_lock:
+        if prediction.confidence >= LOCAL_CLASSIFIER_THRESHOLD:
+            stats["local"] += 1
+            return prediction
+        stats["deferred"] += 1
+    return None
+
+
+def reset_default_classifier() -> None:
+    """Reload OPENJOBS_TITLE_MODEL on next use and reset stats."""
+    global _default_model, _default_loaded
+    with _default_lock:
+        _default_model = None
+        _default_loaded = False
+        for name in stats:
+            stats[name] = 0
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Train a title model from an enrichment cache and report its accuracy."""
+    import argparse
+
+    from .enrichment_cache import ENRICHMENT_CACHE_PATH, EnrichmentCache
+    from .processor import TAXONOMY_VERSION
+
+    parser = argparse.ArgumentParser(description="Train the local job title classifier from cached Gemini labels")
+    parser.add_argument("--cache", default=ENRICHMENT_CACHE_PATH, help="Enrichment cache database")
+    parser.add_argument("--out", default=TITLE_MODEL_PATH or "title_model.json", help="Model file to write")
+    parser.add_argument("--threshold", type=float, default=LOCAL_CLASSIFIER_THRESHOLD,
+                        help="Confidence needed to skip Gemini")
+    args = parser.parse_args(argv)
+
+    if not args.cache:
+        parser.error("--cache (or OPENJOBS_ENRICHMENT_CACHE) is required")
+    examples = list(EnrichmentCache(args.cache).labelled_titles(TAXONOMY_VERSION))
+    if len(examples) < 10:
+        parser.error(f"Only {len(examples)} labelled titles in {args.cache}")
+
+    model, evaluation = train_from_examples(examples, TAXONOMY_VERSION, args.threshold)
+    model.save(args.out)
+
+    labels = Counter(label.split(_LABEL_SEPARATOR, 1)[0] for label in model.labels)
+    print(f"Trained on {len(examples)} titles, {len(model.labels)} subcategories in {len(labels)} categories")
+    print(f"Held-out titles:        {evaluation.examples}")
+    print(f"Accuracy:               {evaluation.accuracy:.1%} (category {evaluation.category_accuracy:.1%})")
+    print(f"Temperature:            {model.temperature:.2f}")
+    print(f"Calls avoided at {args.threshold:.2f}:  {evaluation.avoided_ratio:.1%} "
+          f"({evaluation.accuracy_when_local:.1%} accurate)")
+    print(f"Saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+OpenJobs URL Rules - Compiled URL classification for scraping decisions
+
+Classifies a URL in a single pass into:
+- skip reason (file types, social networks, generic job boards)
+- Firecrawl wait tier (default or slow JS sites)
+- whether the page is a heavy SPA that needs scroll actions
+
+Domains are matched on the hostname with a suffix trie, so "linkedin.com" in a
+query string no longer blocks a legitimate page. Rules are loaded from
+config/url_rules.json (override with OPENJOBS_URL_RULES).
+"""
+
+import json
+import os
+import posixpath
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .logger import logger
+
+WAIT_TIER_DEFAULT = "default"
+WAIT_TIER_SLOW = "slow"
+
+# Rule categories as they appear in the config file
+CATEGORY_SKIP = "skip"
+CATEGORY_SLOW = "slow"
+CATEGORY_HEAVY_SPA = "heavy_spa"
+RULE_CATEGORIES = (CATEGORY_SKIP, CATEGORY_SLOW, CATEGORY_HEAVY_SPA)
+
+DEFAULT_RULES_PATH = Path(__file__).parent / 'config' / 'url_rules.json'
+
+# Built-in rules, used when the rules file cannot be loaded.
+# Must match config/url_rules.json (checked by the test suite).
+DEFAULT_URL_RULES: Dict = {
+    CATEGORY_SKIP: {
+        "domains": [
+            "linkedin.com", "twitter.com", "facebook.com", "instagram.com",
+            "indeed.com", "glassdoor.com", "monster.com", "ziprecruiter.com",
+            "myworkdayjobs.com",
+        ],
+        "extensions": [
+            ".css", ".js", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".pdf", ".zip",
+        ],
+    },
+    CATEGORY_SLOW: {
+        "domains": ["lever.co", "greenhouse.io"],
+        "host_keywords": ["workday", "bamboohr"],
+        "subdomains": ["careers", "jobs", "apply", "hire"],
+    },
+    CATEGORY_HEAVY_SPA: {
+        "host_keywords": ["retool", "airtable", "vercel", "notion", "figma"],
+    },
+}
+
+# Marks the end of a domain in the suffix trie (never a valid host label)
+_TERMINAL = "."
+
+
+class UrlClassification(NamedTuple):
+    """Result of classifying a URL."""
+
+    skip_reason: Optional[str]
+    wait_tier: str
+    needs_scroll: bool
+
+    @property
+    def skip(self) -> bool:
+        """True if the URL should not be scraped."""
+        return self.skip_reason is not None
+
+
+def load_url_rules(path: Optional[str] = None) -> Dict:
+    """
+    Load URL rules from a JSON config file.
+
+    Args:
+        path: Path to a rules file (defaults to OPENJOBS_URL_RULES or the
+              packaged config/url_rules.json)
+
+    Returns:
+        Rules dict keyed by category ("skip", "slow", "heavy_spa")
+    """
+    rules_path = path or os.getenv("OPENJOBS_URL_RULES") or DEFAULT_RULES_PATH
+    try:
+        with open(rules_path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Failed to load URL rules from {rules_path}: {e}. Using defaults.")
+        return DEFAULT_URL_RULES
+
+
+class UrlClassifier:
+    """
+    Precompiled URL classifier.
+
+    Each category in the rules may define:
+    - domains: registrable domains matched against the host suffix
+    - subdomains: first host label (e.g. "careers" for careers.example.com)
+    - host_keywords: substrings anywhere in the hostname (e.g. "workday")
+    - extensions: file extensions at the end of the path (e.g. ".pdf")
+    """
+
+    def __init__(self, rules: Dict):
+        self._trie: Dict = {}
+        self._extensions: Dict[str, Tuple[str, str]] = {}
+        host_groups = []
+
+        for category in RULE_CATEGORIES:
+            spec = rules.get(category) or {}
+
+            for domain in spec.get("domains", []):
+                self._add_domain(domain, category)
+
+            for ext in spec.get("extensions", []):
+                ext = ext.lower()
+                if not ext.startswith('.'):
+                    ext = f".{ext}"
+                self._extensions.setdefault(ext, (category, ext))
+
+            alternatives = [
+                rf"^{re.escape(label.lower().strip('.'))}\."
+                for label in spec.get("subdomains", [])
+            ]
+            alternatives += [re.escape(kw.lower()) for kw in spec.get("host_keywords", [])]
+            if alternatives:
+                host_groups.append(f"(?P<{category}>{'|'.join(alternatives)})")
+
+        # One matcher for every host keyword/subdomain rule across categories
+        self._host_pattern = re.compile('|'.join(host_groups)) if host_groups else None
+        self._match_host = lru_cache(maxsize=65536)(self._match_host_uncached)
+
+    @classmethod
+    def from_config(cls, path: Optional[str] = None) -> "UrlClassifier":
+        """Build a classifier from a JSON rules file."""
+        return cls(load_url_rules(path))
+
+    def _add_domain(self, domain: str, category: str) -> None:
+        domain = domain.lower().strip('.')
+        node = self._trie
+        for label in reversed(domain.split('.')):
+            node = node.setdefault(label, {})
+        node.setdefault(_TERMINAL, []).append((category, domain))
+
+    def _match_host_uncached(self, host: str) -> Tuple[Tuple[str, str], ...]:
+        """Return (category, rule) pairs matching the hostname."""
+        matches: List[Tuple[str, str]] = []
+
+        node = self._trie
+        for label in reversed(host.split('.')):
+            node = node.get(label)
+            if node is None:
+                break
+            matches.extend(node.get(_TERMINAL, ()))
+
+        if self._host_pattern is not None:
+            for m in self._host_pattern.finditer(host):
+                matches.append((m.lastgroup, m.group(0).strip('.')))
+
+        return tuple(matches)
+
+    def classify(self, url: str) -> UrlClassification:
+        """
+        Classify a URL in one pass.
+
+        Args:
+            url: URL to classify (scheme optional)
+
+        Returns:
+            UrlClassification with skip reason, wait tier and scroll flag
+        """
+        if '//' not in url:
+            url = f"//{url}"
+        try:
+            parts = urlsplit(url)
+            # Fully qualified names ("linkedin.com.") match like their bare form
+            host = (parts.hostname or '').rstrip('.')
+        except ValueError:
+            return UrlClassification("Invalid URL format", WAIT_TIER_DEFAULT, False)
+
+        matches = self._match_host(host)
+        ext = posixpath.splitext(parts.path)[1].lower()
+        if ext in self._extensions:
+            matches += (self._extensions[ext],)
+
+        skip_reason = None
+        wait_tier = WAIT_TIER_DEFAULT
+        needs_scroll = False
+
+        for category, rule in matches:
+            if category == CATEGORY_SKIP:
+                skip_reason = skip_reason or rule
+            elif category == CATEGORY_SLOW:
+                wait_tier = WAIT_TIER_SLOW
+            elif category == CATEGORY_HEAVY_SPA:
+                needs_scroll = True
+
+        return UrlClassification(skip_reason, wait_tier, needs_scroll)
+
+    def filter(self, urls: Iterable[str]) -> Iterator[str]:
+        """
+        Yield only URLs that are not skipped.
+
+        Useful for pre-filtering large frontier lists before scraping.
+        """
+        for url in urls:
+            if url and not self.classify(url).skip:
+                yield url
+
+
+_default_classifier: Optional[UrlClassifier] = None
+
+
+def get_url_classifier() -> UrlClassifier:
+    """Return the process-wide classifier built from the default rules file."""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = UrlClassifier.from_config()
+    return _default_classifier
+
+
+def classify_url(url: str) -> UrlClassification:
+    """
+    Classify a URL using the default rules.
+
+    Example:
+        >>> classify_url("https://jobs.lever.co/acme")
+        UrlClassification(skip_reason=None, wait_tier='slow', needs_scroll=False)
+    """
+    return get_url_classifier().classify(url)
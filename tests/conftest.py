@@ -11,3 +11,47 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "integration: marks tests as integration tests requiring external services"
     )
+
+
+@pytest.fixture(autouse=True)
+def _isolated_state(monkeypatch):
+    """
+    Give each test fresh module-level stores, caches and counters.
+
+    Stores that can be persisted are swapped for in-memory ones rather than
+    cleared, so a test run never writes to the OPENJOBS_*_PATH files.
+    """
+    from openjobs import (
+        batch_enrichment,
+        context_cache,
+        enrichment_cache,
+        extraction_templates,
+        page_diff,
+        processor,
+        title_classifier,
+    )
+    from openjobs.gemini_client import default_client
+    from openjobs.key_pool import firecrawl_keys, gemini_keys
+
+    # Learned templates and snapshots would turn another test's extraction into a local parse or a diff
+    monkeypatch.setattr(extraction_templates, "default_store", extraction_templates.TemplateStore())
+    monkeypatch.setattr(page_diff, "default_store", page_diff.SnapshotStore())
+    # A cached prompt prefix (or a failed creation) would change another test's requests
+    monkeypatch.setattr(context_cache, "default_cache", context_cache.ContextCache())
+    # Cached enrichment would skip mocked calls; bound by name where it is imported
+    enrichment = enrichment_cache.EnrichmentCache()
+    for module in (enrichment_cache, processor, batch_enrichment):
+        monkeypatch.setattr(module, "default_cache", enrichment)
+    # A local title model would answer classify_job calls tests expect to reach Gemini
+    monkeypatch.setattr(title_classifier, "TITLE_MODEL_PATH", "")
+    title_classifier.reset_default_classifier()
+    # Request buckets and cooldowns would delay later tests; retries need not sleep
+    for pool in (gemini_keys, firecrawl_keys):
+        pool.clear()
+    monkeypatch.setattr(default_client, "backoff", 0)
+    default_client.clear()
+    yield
+    title_classifier.reset_default_classifier()
+    for pool in (gemini_keys, firecrawl_keys):
+        pool.clear()
+    default_client.clear()
@@ -0,0 +1,191 @@
+"""Tests for openjobs.batch_enrichment module, against a local Gemini Batch API stub."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from openjobs.batch_enrichment import BatchState, iter_batch_enrichment
+from openjobs.enrichment_cache import EnrichmentCache
+from openjobs.key_pool import KeyPool
+from openjobs.processor import process_job
+
+JOBS = [
+    {"title": "Data Engineer", "job_url": "https://acme.com/jobs/1", "description": "Spark and Python."},
+    {"title": "Product Designer", "job_url": "https://acme.com/jobs/2", "description": "Own the design system."},
+    {"title": "Backend Engineer", "job_url": "https://acme.com/jobs/3"},
+]
+
+
+def _answer(text):
+    """What the stub model answers to one request."""
+    if "Classify the job title" in text:
+        category = "Design" if "Designer" in text else "Data"
+        return {"category": category, "subcategory": "Other", "similar_job_title": "Engineer"}
+    return {"simplified_job_title": "Engineer", "tech_stack": ["Python", "Cobol++"], "contract_type": "Full-Time"}
+
+
+class GeminiBatchStub:
+    """In-process stand-in for the Files and Batch endpoints of the Gemini API."""
+
+    def __init__(self, polls_until_done=1, fail_keys=(), final_state="BATCH_STATE_SUCCEEDED"):
+        self.polls_until_done = polls_until_done
+        self.fail_keys = set(fail_keys)
+        self.final_state = final_state
+        self.files = {}
+        self.submitted = []
+        self.polls = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body, headers=None, raw=None):
+                data = raw if raw is not None else json.dumps(body).encode("utf-8")
+                self.send_response(200)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _body(self):
+                return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            def do_POST(self):
+                body = self._body()
+                path = self.path.split("?")[0]
+                if path == "/upload/v1beta/files":
+                    self._send({}, {"X-Goog-Upload-URL": f"{stub.url}/upload-session/{len(stub.files) + 1}"})
+                elif path.startswith("/upload-session/"):
+                    name = f"files/input-{path.rsplit('/', 1)[1]}"
+                    stub.files[name] = body.decode("utf-8")
+                    self._send({"file": {"name": name}})
+                elif path.endswith(":batchGenerateContent"):
+                    stub.submitted.append(json.loads(body)["batch"]["input_config"]["file_name"])
+                    self._send({"name": f"batches/{len(stub.submitted)}", "metadata": {"state": "BATCH_STATE_PENDING"}})
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if path.startswith("/v1beta/batches/"):
+                    stub.polls += 1
+                    if stub.polls < stub.polls_until_done:
+                        self._send({"metadata": {"state": "BATCH_STATE_RUNNING"}})
+                    else:
+                        done = {"responsesFile": "files/output"} if stub.final_state == "BATCH_STATE_SUCCEEDED" else {}
+                        self._send({"metadata": {"state": stub.final_state}, "done": True, "response": done})
+                elif path == "/download/v1beta/files/output:download":
+                    self._send(None, raw=stub.results().encode("utf-8"))
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True).start()
+
+    def results(self):
+        """Answer every request of the submitted file, in reverse order."""
+        lines = []
+        for raw in reversed(self.files[self.submitted[-1]].splitlines()):
+            request = json.loads(raw)
+            if request["key"] in self.fail_keys:
+                lines.append({"key": request["key"], "error": {"code": 500}})
+                continue
+            text = request["request"]["contents"][0]["parts"][0]["text"]
+            answer = json.dumps(_answer(text))
+            lines.append({"key": request["key"], "response": {"candidates": [{"content": {"parts": [{"text": answer}]}}]}})
+        return "\n".join(json.dumps(line) for line in lines) + "\n"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = GeminiBatchStub()
+    with patch("openjobs.batch_enrichment.GEMINI_API_ROOT", server.url):
+        yield server
+    server.close()
+
+
+@patch("openjobs.processor._call_gemini", side_effect=AssertionError("interactive call"))
+class TestBatchEnrichment:
+    """Tests for iter_batch_enrichment."""
+
+    def test_end_to_end(self, _no_calls, stub, tmp_path):
+        """Test requests are submitted once and results come back as processed jobs."""
+        cache = EnrichmentCache()
+        jobs = list(iter_batch_enrichment(JOBS, str(tmp_path / "state.json"), api_key="key", cache=cache,
+                                          poll_interval=0))
+
+        assert len(stub.submitted) == 1
+        assert len(stub.files[stub.submitted[0]].splitlines()) == 5
+        by_url = {job["job_url"]: job for job in jobs}
+        assert by_url["https://acme.com/jobs/2"]["category"] == "Design"
+        assert by_url["https://acme.com/jobs/1"]["tech_stack"] == ["Python"]
+        assert by_url["https://acme.com/jobs/3"]["title_simplified"] == "Engineer"
+        assert len(cache) == 3
+
+    def test_key_from_pool(self, _no_calls, stub, tmp_path):
+        """Test a pooled key (e.g. from GOOGLE_API_KEYS) runs the batch when none is passed."""
+        with patch("openjobs.batch_enrichment.gemini_keys", KeyPool(["pooled"])):
+            assert len(list(iter_batch_enrichment(JOBS, str(tmp_path / "state.json"), poll_interval=0))) == len(JOBS)
+        with patch("openjobs.batch_enrichment.gemini_keys", KeyPool()):
+            with pytest.raises(RuntimeError):
+                list(iter_batch_enrichment(JOBS, str(tmp_path / "other.json"), poll_interval=0))
+
+    def test_cached_jobs_are_not_submitted(self, _no_calls, stub, tmp_path):
+        """Test jobs already in the enrichment cache stay out of the batch."""
+        cache = EnrichmentCache()
+        list(iter_batch_enrichment(JOBS, str(tmp_path / "first.json"), api_key="key", cache=cache, poll_interval=0))
+        jobs = list(iter_batch_enrichment(JOBS + [dict(JOBS[0], job_url="https://acme.com/jobs/4")],
+                                          str(tmp_path / "second.json"), api_key="key", cache=cache, poll_interval=0))
+
+        assert len(jobs) == 4
+        assert len(stub.files[stub.submitted[-1]].splitlines()) == 2
+
+    def test_resume_after_timeout(self, _no_calls, stub, tmp_path):
+        """Test a rerun polls the submitted batch instead of resubmitting."""
+        stub.polls_until_done = 3
+        state_path = str(tmp_path / "state.json")
+        with pytest.raises(TimeoutError):
+            list(iter_batch_enrichment(JOBS, state_path, api_key="key", poll_interval=0, max_wait=0))
+        assert BatchState.load(state_path).batch_name == "batches/1"
+
+        jobs = list(iter_batch_enrichment(JOBS, state_path, api_key="key", poll_interval=0))
+
+        assert len(stub.submitted) == 1
+        assert len(jobs) == 3
+
+    def test_failed_line_is_not_cached(self, _no_calls, stub, tmp_path):
+        """Test a request that failed in the batch gets fallback values."""
+        stub.fail_keys = {"0:enhance"}
+        cache = EnrichmentCache()
+        jobs = list(iter_batch_enrichment(JOBS, str(tmp_path / "state.json"), api_key="key", cache=cache,
+                                          poll_interval=0))
+
+        failed = next(job for job in jobs if job["job_url"] == "https://acme.com/jobs/1")
+        assert failed["tech_stack"] == []
+        assert len(cache) == 2
+
+    def test_failed_batch(self, _no_calls, stub, tmp_path):
+        """Test a failed batch raises and is resubmitted on the next run."""
+        stub.final_state = "BATCH_STATE_FAILED"
+        state_path = str(tmp_path / "state.json")
+        with pytest.raises(RuntimeError):
+            list(iter_batch_enrichment(JOBS, state_path, api_key="key", poll_interval=0))
+        assert BatchState.load(state_path).batch_name == ""
+
+    def test_matches_interactive_output(self, _no_calls, stub, tmp_path):
+        """Test batch results look like process_job's interactive output."""
+        [batch_job] = iter_batch_enrichment(JOBS[:1], str(tmp_path / "state.json"), api_key="key",
+                                            cache=EnrichmentCache(), poll_interval=0)
+        with patch("openjobs.processor.classify_job", return_value=_answer("Classify the job title Data")), \
+                patch("openjobs.processor.enhance_job_output", return_value={**_answer(""), "tech_stack": ["Python"]}):
+            interactive = process_job(JOBS[0], cache=EnrichmentCache())
+
+        assert set(batch_job) == set(interactive)
+        assert {k: v for k, v in batch_job.items() if k != "date_scraped"} == \
+               {k: v for k, v in interactive.items() if k != "date_scraped"}
@@ -0,0 +1,77 @@
+"""Tests for openjobs.content_score module."""
+
+from openjobs.content_score import (
+    JobContentScore,
+    MIN_JOB_KEYWORD_MATCHES,
+    score_job_content,
+)
+
+
+class TestScoreJobContent:
+    """Tests for score_job_content function."""
+
+    def test_empty_content(self):
+        """Test empty content scores zero."""
+        score = score_job_content("")
+        assert score.matches == 0
+        assert score.has_jobs is False
+        assert score_job_content(None).length == 0
+
+    def test_counts_keywords(self):
+        """Test keyword counts are reported per keyword."""
+        score = score_job_content("Senior Designer, Junior Designer, Data Analyst")
+        assert score.keyword_counts == {"senior": 1, "designer": 2, "junior": 1, "analyst": 1}
+        assert score.matches == 5
+        assert score.has_jobs is True
+
+    def test_whole_word_matching(self):
+        """Test keywords do not match inside longer words."""
+        score = score_job_content("Leadership, seniority and managerial skills are valued")
+        assert score.matches == 0
+
+    def test_department_headings_count(self):
+        """Test department headings keep short listing pages above the threshold."""
+        content = "## Engineering\nSenior Software Engineer\nEngineering Manager\nProduct Manager"
+        score = score_job_content(content)
+        assert score.keyword_counts["engineering"] == 2
+        assert score.has_jobs is True
+
+    def test_about_page_below_threshold(self):
+        """Test a page that only mentions departments stays below the threshold."""
+        content = "We make leadership software. Our engineering and design teams are distributed. Contact sales."
+        assert score_job_content(content).has_jobs is False
+
+    def test_plural_matches(self):
+        """Test plural forms count as the keyword."""
+        score = score_job_content("We are hiring Engineers and Managers")
+        assert score.keyword_counts == {"engineer": 1, "manager": 1}
+
+    def test_multi_word_keyword_counted_once(self):
+        """Test multi-word keywords win over their single-word suffix."""
+        score = score_job_content("Software  Engineer\nProduct Manager")
+        assert score.keyword_counts == {"software engineer": 1, "product manager": 1}
+
+    def test_case_insensitive(self):
+        """Test matching ignores case."""
+        assert score_job_content("DEVELOPER developer Developer").matches == 3
+
+    def test_custom_threshold(self):
+        """Test custom threshold controls has_jobs."""
+        assert score_job_content("Engineer", threshold=1).has_jobs is True
+        assert score_job_content("Engineer").threshold == MIN_JOB_KEYWORD_MATCHES
+
+
+class TestJobContentScore:
+    """Tests for JobContentScore helpers."""
+
+    def test_is_substantial_requires_length(self):
+        """Test short content is never substantial."""
+        score = JobContentScore(matches=10, keyword_counts={}, length=500)
+        assert score.has_jobs is True
+        assert score.is_substantial() is False
+        assert score.is_substantial(min_length=100) is True
+
+    def test_density(self):
+        """Test density is matches per 1,000 chars."""
+        assert JobContentScore(5, {}, 2500).density == 2.0
+        assert JobContentScore(0, {}, 0).density == 0.0
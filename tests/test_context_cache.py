@@ -0,0 +1,171 @@
+"""Tests for openjobs.context_cache module."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+from openjobs.context_cache import ContextCache, LocalContextCache, build_contents
+from openjobs.processor import (
+    CLASSIFY_INSTRUCTIONS,
+    ENHANCE_INSTRUCTIONS,
+    classify_job,
+    enhance_job_output,
+)
+from openjobs.scraper import PAGE_CONTENT_MARKER, _generate_extraction
+
+MODEL = "gemini-2.0-flash"
+
+
+def _response(status_code=200, body=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = body or {}
+    response.text = str(body)
+    return response
+
+
+def _answer(text):
+    return _response(body={"candidates": [{"content": {"parts": [{"text": text}]}, "finishReason": "STOP"}]})
+
+
+class TestContextCache:
+    """Tests for ContextCache."""
+
+    @patch('openjobs.context_cache.requests.post')
+    def test_small_prefix_is_inline(self, mock_post):
+        """Test prefixes below the cacheable size are not uploaded."""
+        assert build_contents(MODEL, "Instructions", "Job", "key", cache=ContextCache()) == ("Instructions\n\nJob", None)
+        assert not mock_post.called
+
+    @patch('openjobs.context_cache.requests.post')
+    def test_created_once_and_reused(self, mock_post):
+        """Test a prefix is created once per TTL and referenced by name."""
+        mock_post.return_value = _response(body={"name": "cachedContents/abc"})
+        cache = ContextCache(ttl=600, min_tokens=0)
+
+        assert build_contents(MODEL, "Instructions", "Job 1", "key", cache=cache) == ("Job 1", "cachedContents/abc")
+        assert build_contents(MODEL, "Instructions", "Job 2", "key", cache=cache) == ("Job 2", "cachedContents/abc")
+
+        assert mock_post.call_count == 1
+        body = mock_post.call_args[1]['json']
+        assert body["model"] == f"models/{MODEL}"
+        assert body["ttl"] == "600s"
+        assert cache.stats["created"] == 1 and cache.stats["reused"] == 1
+
+    @patch('openjobs.context_cache.time.monotonic')
+    def test_recreated_after_ttl(self, mock_time):
+        """Test an expired prefix is uploaded again."""
+        cache = LocalContextCache(ttl=600, min_tokens=0)
+        mock_time.return_value = 0
+        first = cache.reference(MODEL, "Instructions", "key")
+        mock_time.return_value = 590
+        assert cache.reference(MODEL, "Instructions", "key") != first
+
+    @patch('openjobs.context_cache.requests.post')
+    def test_failed_creation_is_remembered(self, mock_post):
+        """Test a rejected prefix is sent inline without retrying every call."""
+        mock_post.return_value = _response(400, {"error": "too small"})
+        cache = ContextCache(min_tokens=0)
+
+        assert cache.reference(MODEL, "Instructions", "key") is None
+        assert cache.reference(MODEL, "Instructions", "key") is None
+        assert mock_post.call_count == 1
+
+    def test_created_outside_the_lock(self):
+        """Test a slow creation holds up neither other prefixes nor a second creation of its own."""
+        release = threading.Event()
+
+        class SlowCache(LocalContextCache):
+            def _create(self, model, text, api_key):
+                if text == "Slow":
+                    release.wait(5)
+                return super()._create(model, text, api_key)
+
+        cache = SlowCache(min_tokens=0)
+        names = []
+        threads = [threading.Thread(target=lambda: names.append(cache.reference(MODEL, "Slow", "key")))
+                   for _ in range(3)]
+        for thread in threads:
+            thread.start()
+
+        assert cache.reference(MODEL, "Fast", "key") is not None
+        assert all(thread.is_alive() for thread in threads)
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert len(set(names)) == 1 and names[0] is not None
+        assert cache.stats["created"] == 2 and cache.stats["reused"] == 2
+
+    def test_per_api_key(self):
+        """Test a prefix cached for one key is not handed to another."""
+        cache = LocalContextCache(min_tokens=0)
+        assert cache.reference(MODEL, "Instructions", "key-1") != cache.reference(MODEL, "Instructions", "key-2")
+
+
+class TestEnrichmentUsesContextCache:
+    """Tests for cached taxonomy prefixes in classify_job and enhance_job_output."""
+
+    @patch('openjobs.processor.gemini_keys', MagicMock())
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_taxonomy_sent_once(self, mock_post):
+        """Test each request holds only the job while the taxonomy is cached."""
+        mock_post.return_value = _answer('{"category": "Data", "subcategory": "Data Engineer"}')
+        cache = LocalContextCache(min_tokens=0)
+
+        with patch('openjobs.context_cache.default_cache', cache):
+            classify_job("Data Engineer", api_key="key")
+            classify_job("Backend Engineer", api_key="key")
+            enhance_job_output("Backend Engineer", "Build APIs in Go.", api_key="key")
+
+        payloads = [call[1]['json'] for call in mock_post.call_args_list]
+        assert payloads[0]["cachedContent"] == payloads[1]["cachedContent"]
+        assert cache.contents[payloads[0]["cachedContent"]] == CLASSIFY_INSTRUCTIONS
+        assert cache.contents[payloads[2]["cachedContent"]] == ENHANCE_INSTRUCTIONS
+        assert payloads[1]["contents"][0]["parts"][0]["text"] == 'Job title: "Backend Engineer"'
+        assert cache.stats["created"] == 2
+
+    @patch('openjobs.processor.gemini_keys', MagicMock())
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_inline_by_default(self, mock_post):
+        """Test the taxonomy precedes the job title when it is not cached."""
+        mock_post.return_value = _answer('{"category": "Data"}')
+        classify_job("Data Engineer", api_key="key")
+
+        payload = mock_post.call_args[1]['json']
+        assert "cachedContent" not in payload
+        assert payload["contents"][0]["parts"][0]["text"] == f'{CLASSIFY_INSTRUCTIONS}\n\nJob title: "Data Engineer"'
+
+
+class TestExtractionUsesContextCache:
+    """Tests for cached extraction instructions."""
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_instructions_cached_and_invalidated(self, mock_post):
+        """Test only the page is sent, and a rejected cache is recreated."""
+        cache = LocalContextCache(min_tokens=0)
+        prompt = f"Extract jobs.{PAGE_CONTENT_MARKER}# Careers"
+
+        with patch('openjobs.context_cache.default_cache', cache):
+            mock_post.return_value = _response(404, {"error": {"message": "CachedContent not found"}})
+            _generate_extraction(prompt, "key")
+            mock_post.return_value = _answer("[]")
+            _generate_extraction(prompt, "key")
+
+        first, second = (call[1]['json'] for call in mock_post.call_args_list)
+        assert first["contents"][0]["parts"][0]["text"] == "Page content:\n# Careers"
+        assert cache.contents[first["cachedContent"]] == "Extract jobs."
+        assert second["cachedContent"] != first["cachedContent"]
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_rate_limit_keeps_cache(self, mock_post):
+        """Test errors that say nothing about the cached content do not recreate it."""
+        cache = LocalContextCache(min_tokens=0)
+        prompt = f"Extract jobs.{PAGE_CONTENT_MARKER}# Careers"
+
+        with patch('openjobs.context_cache.default_cache', cache):
+            mock_post.return_value = _response(429, {"error": {"message": "Resource exhausted"}})
+            _generate_extraction(prompt, "key")
+            mock_post.return_value = _response(400, {"error": {"message": "Invalid JSON payload"}})
+            _generate_extraction(prompt, "key")
+
+        assert len({call[1]['json']["cachedContent"] for call in mock_post.call_args_list}) == 1
+        assert len(cache.contents) == 1
@@ -0,0 +1,106 @@
+"""Tests for batched enrichment in openjobs.processor."""
+
+import re
+from unittest.mock import patch
+
+from openjobs.processor import (
+    CLASSIFY_INSTRUCTIONS,
+    _pack_batches,
+    enhance_jobs_batch,
+    process_jobs,
+)
+
+JOBS = {
+    "https://acme.com/jobs/1": ("Backend Engineer", "Build APIs in Python."),
+    "https://acme.com/jobs/2": ("Designer", "Own our design system."),
+    "https://acme.com/jobs/3": ("Data Engineer", "Run Spark pipelines."),
+    "https://acme.com/jobs/4": ("SRE", "Keep Kubernetes healthy."),
+}
+
+
+def _answer_all(prompt, api_key=None, prefix="", response_schema=None):
+    """Answer every posting ID in a batched prompt."""
+    if prefix == CLASSIFY_INSTRUCTIONS:
+        return {"category": "Data", "subcategory": "Data Engineer", "similar_job_title": "Engineer"}
+    ids = re.findall(r'\[ID: (\d+)\]', prompt)
+    if not ids:
+        return {"tech_stack": ["Python"], "contract_type": "Full-Time"}
+    return {key: {"tech_stack": ["Python", "NotATech"], "contract_type": "Full-Time"} for key in ids}
+
+
+class TestPackBatches:
+    """Tests for _pack_batches."""
+
+    def test_budget_and_oversized(self):
+        """Test batches fit the budget and large postings go alone."""
+        assert _pack_batches([100, 100, 600, 100, 100, 100], token_budget=1000, max_jobs=10) == [
+            [2], [0, 1, 3, 4, 5]
+        ]
+        assert _pack_batches([300, 300, 300, 300], token_budget=1000, max_jobs=10) == [[0, 1, 2], [3]]
+        assert _pack_batches([10] * 5, token_budget=1000, max_jobs=2) == [[0, 1], [2, 3], [4]]
+
+
+@patch('openjobs.processor._call_gemini')
+class TestEnhanceJobsBatch:
+    """Tests for enhance_jobs_batch."""
+
+    def test_one_call_keyed_by_job_id(self, mock_gemini):
+        """Test postings share a prompt and results come back under the caller's IDs."""
+        mock_gemini.side_effect = _answer_all
+
+        results = enhance_jobs_batch(JOBS, api_key="key")
+
+        assert mock_gemini.call_count == 1
+        assert list(results) == list(JOBS)
+        assert results["https://acme.com/jobs/3"]["tech_stack"] == ["Python"]
+        prompt = mock_gemini.call_args[0][0]
+        assert "[ID: 4]" in prompt and "https://acme.com/jobs" not in prompt
+        assert set(mock_gemini.call_args[1]["response_schema"]["required"]) == {"1", "2", "3", "4"}
+
+    def test_malformed_answer_bisects(self, mock_gemini):
+        """Test an unusable answer is retried in halves down to single jobs."""
+        def answer(prompt, api_key=None, prefix="", response_schema=None):
+            ids = re.findall(r'\[ID: (\d+)\]', prompt)
+            if len(ids) == 4:
+                return None
+            if len(ids) == 2 and "Designer" in prompt:
+                return {"1": {"tech_stack": ["Python"]}}
+            return _answer_all(prompt, api_key, prefix, response_schema)
+        mock_gemini.side_effect = answer
+
+        results = enhance_jobs_batch(JOBS, api_key="key")
+
+        # 4 -> 2 + 2, then the posting missing from one half on its own
+        assert mock_gemini.call_count == 4
+        assert all(result["contract_type"] in ("Full-Time", "Other") for result in results.values())
+        assert len(results) == 4
+
+    def test_fields_subset(self, mock_gemini):
+        """Test a subset of fields is requested per posting."""
+        mock_gemini.return_value = {"1": {"remote_type": "Remote", "salary_range": "x"}, "2": {"remote_type": "Hybrid"}}
+        jobs = dict(list(JOBS.items())[:2])
+
+        results = enhance_jobs_batch(jobs, api_key="key", fields=["remote_type"])
+
+        assert [r["remote_type"] for r in results.values()] == ["Remote", "Hybrid"]
+        assert "salary_range" not in results["https://acme.com/jobs/1"]
+        assert "- remote_type:" in mock_gemini.call_args[1]["prefix"]
+
+
+class TestProcessJobsBatching:
+    """Tests for enhance_jobs_batch inside process_jobs."""
+
+    @patch('openjobs.processor._call_gemini')
+    def test_descriptions_share_calls(self, mock_gemini):
+        """Test process_jobs enhances all descriptions in one call."""
+        mock_gemini.side_effect = _answer_all
+        jobs = [
+            {"title": title, "description": description, "job_url": url}
+            for url, (title, description) in JOBS.items()
+        ]
+
+        processed = process_jobs(jobs, api_key="key")
+
+        enhance_calls = [c for c in mock_gemini.call_args_list if c[1]["prefix"] != CLASSIFY_INSTRUCTIONS]
+        assert len(enhance_calls) == 1
+        assert [job["tech_stack"] for job in processed] == [["Python"]] * 4
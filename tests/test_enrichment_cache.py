@@ -0,0 +1,96 @@
+"""Tests for openjobs.enrichment_cache module."""
+
+from unittest.mock import patch
+
+from openjobs.enrichment_cache import EnrichmentCache, enrichment_key
+from openjobs.processor import _FallbackResult, process_job, process_jobs
+
+JOB = {
+    "title": "Senior Python Developer",
+    "company": "Acme",
+    "job_url": "https://acme.com/jobs/1",
+    "description": "Build APIs in Python and Django.",
+}
+
+CLASSIFICATION = {"category": "Software Engineering", "subcategory": "Backend", "similar_job_title": "Python Developer"}
+ENHANCED = {"simplified_job_title": "Python Developer", "tech_stack": ["Python", "Django"], "remote_type": "Remote"}
+
+
+class TestEnrichmentKey:
+    """Tests for enrichment_key."""
+
+    def test_inputs_change_key(self):
+        """Test the URL, title, description and taxonomy all feed the key."""
+        base = enrichment_key("u", "t", "d", "v1")
+        assert base == enrichment_key("u", "t", "d", "v1")
+        assert len({base, enrichment_key("u2", "t", "d", "v1"), enrichment_key("u", "t2", "d", "v1"),
+                    enrichment_key("u", "t", "d2", "v1"), enrichment_key("u", "t", "d", "v2")}) == 5
+
+
+class TestEnrichmentCache:
+    """Tests for EnrichmentCache."""
+
+    def test_stats(self):
+        """Test hits, misses and saved calls are counted."""
+        cache = EnrichmentCache()
+        cache.put("k", {"category": "Design"}, api_calls=2)
+        assert cache.get("k") == {"category": "Design"}
+        assert cache.get("other") is None
+        assert cache.stats == {"hits": 1, "misses": 1, "saved_calls": 2, "stored": 1}
+        assert cache.hit_rate == 0.5
+
+    def test_persists_to_file(self, tmp_path):
+        """Test entries survive a new cache instance."""
+        path = str(tmp_path / "enrichment.db")
+        EnrichmentCache(path).put("k", {"category": "Design"}, api_calls=1, taxonomy_version="v1")
+        cache = EnrichmentCache(path)
+        assert cache.get("k") == {"category": "Design"}
+        assert cache.prune("v2") == 1
+        assert len(cache) == 0
+
+
+@patch('openjobs.processor.enhance_job_output')
+@patch('openjobs.processor.classify_job')
+class TestProcessJobCache:
+    """Tests for the enrichment cache in process_job."""
+
+    def test_unchanged_job_makes_no_calls(self, mock_classify, mock_enhance):
+        """Test a recrawled job is enriched from the cache."""
+        mock_classify.return_value = CLASSIFICATION
+        mock_enhance.return_value = ENHANCED
+        cache = EnrichmentCache()
+
+        first = process_job(dict(JOB, date_scraped="2025-01-01"), cache=cache)
+        second = process_job(dict(JOB, date_scraped="2025-01-02"), cache=cache)
+
+        assert mock_classify.call_count == 1
+        assert mock_enhance.call_count == 1
+        assert second["tech_stack"] == ["Python", "Django"]
+        assert second["category"] == "Software Engineering"
+        assert second["date_scraped"] == "2025-01-02"
+        assert {k: v for k, v in second.items() if k != "date_scraped"} == \
+               {k: v for k, v in first.items() if k != "date_scraped"}
+        assert cache.stats["saved_calls"] == 2
+
+    def test_changed_description_is_re_enriched(self, mock_classify, mock_enhance):
+        """Test an edited posting misses the cache."""
+        mock_classify.return_value = CLASSIFICATION
+        mock_enhance.return_value = ENHANCED
+        cache = EnrichmentCache()
+
+        process_jobs([JOB, dict(JOB, description="Now with Go.")], cache=cache, batch_enhance=False)
+
+        assert mock_enhance.call_count == 2
+        assert cache.stats["misses"] == 2
+
+    def test_failed_enrichment_is_not_cached(self, mock_classify, mock_enhance):
+        """Test fallback results from a failed call are retried next time."""
+        mock_classify.return_value = CLASSIFICATION
+        mock_enhance.return_value = _FallbackResult(simplified_job_title=JOB["title"])
+        cache = EnrichmentCache()
+
+        process_job(JOB, cache=cache)
+        process_job(JOB, cache=cache)
+
+        assert mock_enhance.call_count == 2
+        assert len(cache) == 0
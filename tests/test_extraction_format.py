@@ -0,0 +1,113 @@
+"""Tests for openjobs.extraction_format module."""
+
+import json
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from openjobs.extraction_format import (
+    decode_compact_jobs,
+    decode_jobs,
+    parse_jobs_text,
+)
+
+LONG_URL = "https://jobs.example.com/postings/123456?utm_source=careers&utm_medium=web&gh_src=abc"
+
+
+class TestDecodeCompactJobs:
+    """Tests for decode_compact_jobs function."""
+
+    def test_rows_resolve_tables(self):
+        """Test department/location indexes resolve against the tables."""
+        data = {
+            "d": ["Engineering"],
+            "l": ["Remote", "Berlin"],
+            "j": [["Backend Engineer", 0, 1, "https://x.com/1"], ["Designer", None, 0, None]],
+        }
+        assert decode_compact_jobs(data) == [
+            {"title": "Backend Engineer", "department": "Engineering", "location": "Berlin",
+             "url": "https://x.com/1"},
+            {"title": "Designer", "department": None, "location": "Remote", "url": None},
+        ]
+
+    def test_short_rows_and_bad_indexes(self):
+        """Test short rows are padded and out-of-range indexes become None."""
+        jobs = decode_compact_jobs({"d": [], "l": ["Remote"], "j": [["Analyst"], ["PM", 5, True]]})
+        assert jobs[0] == {"title": "Analyst", "department": None, "location": None, "url": None}
+        assert jobs[1]["department"] is None and jobs[1]["location"] is None
+
+    def test_inline_names_kept(self):
+        """Test names given instead of indexes are used as-is."""
+        jobs = decode_compact_jobs({"j": [["SRE", "Platform", "Remote"]]})
+        assert jobs[0]["department"] == "Platform"
+        assert jobs[0]["location"] == "Remote"
+
+
+class TestDecodeJobs:
+    """Tests for decode_jobs and parse_jobs_text."""
+
+    def test_accepts_object_array(self):
+        """Test the verbose one-object-per-job format still decodes."""
+        assert decode_jobs([{"title": "Engineer"}, {"location": "x"}, "junk"]) == [{"title": "Engineer"}]
+
+    def test_parse_compact_text_with_fence(self):
+        """Test compact output wrapped in a code fence."""
+        text = '```json\n{"d": ["Sales"], "l": [], "j": [["Account Executive", 0, null, null]]}\n```'
+        assert parse_jobs_text(text)[0]["department"] == "Sales"
+
+    def test_parse_no_json(self):
+        """Test text without a JSON value yields no jobs."""
+        assert parse_jobs_text("No jobs here") == []
+
+    def test_parse_malformed_raises(self):
+        """Test malformed JSON is reported to the caller."""
+        with pytest.raises(json.JSONDecodeError):
+            parse_jobs_text('{"j": [["Engineer", 0}')
+
+    def test_compact_is_smaller(self):
+        """Test the compact encoding of a listing is much smaller than objects."""
+        jobs = [{"title": f"Engineer {i}", "department": "Engineering", "location": "Remote",
+                 "url": f"L{i}"} for i in range(30)]
+        compact = {"d": ["Engineering"], "l": ["Remote"],
+                   "j": [[j["title"], 0, 0, j["url"]] for j in jobs]}
+        assert len(json.dumps(compact)) < len(json.dumps(jobs)) / 2
+        assert decode_jobs(compact) == jobs
+
+
+class TestExtractionUsesCompactFormat:
+    """Tests for the compact format inside extract_jobs_from_markdown."""
+
+    def _mock_response(self, text):
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {'candidates': [{'content': {'parts': [{'text': text}]}}]}
+        return response
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_compact_rows_decoded_and_links_restored(self, mock_post):
+        """Test compact rows become job dicts with real URLs."""
+        from openjobs.scraper import extract_jobs_from_markdown
+        mock_post.return_value = self._mock_response(
+            '{"d": ["Engineering"], "l": ["Remote"], "j": [["Engineer", 0, 0, "L1"]]}'
+        )
+
+        markdown = f"# Careers\n\n## Engineering\n- [Engineer]({LONG_URL}) - Remote"
+        jobs = extract_jobs_from_markdown(markdown, api_key='test-key', output_format='compact')
+
+        prompt = mock_post.call_args[1]['json']['contents'][0]['parts'][0]['text']
+        assert '"j"' in prompt
+        assert jobs == [{"title": "Engineer", "department": "Engineering",
+                         "location": "Remote", "url": LONG_URL}]
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_json_format_uses_object_prompt(self, mock_post):
+        """Test output_format='json' keeps the one-object-per-job prompt."""
+        from openjobs.scraper import extract_jobs_from_markdown
+        mock_post.return_value = self._mock_response('[{"title": "Engineer"}]')
+
+        markdown = "# Careers\n\n## Engineering\n- Engineer - Remote\n- Designer - Berlin"
+        jobs = extract_jobs_from_markdown(markdown, api_key='test-key', output_format='json')
+
+        prompt = mock_post.call_args[1]['json']['contents'][0]['parts'][0]['text']
+        assert 'valid JSON array' in prompt
+        assert jobs == [{"title": "Engineer"}]
@@ -0,0 +1,165 @@
+"""Tests for openjobs.extraction_templates module."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+from openjobs.extraction_templates import (
+    LOCATION_NEXT_LINE,
+    LOCATION_SAME_LINE,
+    TemplateStore,
+    apply_template,
+    induce_template,
+    learn_template,
+    template_key,
+)
+from openjobs.scrape_result import ScrapeResult
+from openjobs.scraper import extract_jobs_from_markdown
+
+URL = "https://acme.com/careers"
+
+
+def _page(rows):
+    lines = ["# Careers at Acme", "", "- [Home](https://acme.com/)", "- [Blog](https://acme.com/blog)", ""]
+    for department, jobs in rows:
+        lines += [f"## {department}", ""]
+        lines += [f"- [{title}](https://acme.com/jobs/{slug}) · {location}" for title, slug, location in jobs]
+        lines.append("")
+    return "\n".join(lines)
+
+
+ROWS = [
+    ("Engineering", [("Backend Engineer", "1", "Remote"), ("Site Reliability Engineer", "2", "Berlin")]),
+    ("Design", [("Product Designer", "3", "New York")]),
+]
+PAGE = _page(ROWS)
+JOBS = [
+    {"title": title, "department": department, "location": location, "url": f"https://acme.com/jobs/{slug}"}
+    for department, jobs in ROWS for title, slug, location in jobs
+]
+
+
+def _gemini_response(jobs):
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {
+        'candidates': [{'content': {'parts': [{'text': json.dumps(jobs)}]}, 'finishReason': 'STOP'}]
+    }
+    return response
+
+
+class TestInduceTemplate:
+    """Tests for induce_template and apply_template."""
+
+    def test_round_trip(self):
+        """Test the learned template reproduces every field."""
+        template = induce_template("acme.com/careers", PAGE, JOBS)
+
+        assert template.url_prefix == "https://acme.com/jobs/"
+        assert template.department_level == 2
+        assert (template.location, template.location_separator) == (LOCATION_SAME_LINE, " · ")
+        assert apply_template(template, PAGE) == JOBS
+
+    def test_applies_to_changed_listings(self):
+        """Test new jobs on the same layout are found and nav links are not."""
+        template = induce_template("acme.com/careers", PAGE, JOBS)
+        rows = ROWS + [("Sales", [("Account Executive", "9", "London")])]
+
+        jobs = apply_template(template, _page(rows))
+
+        assert jobs[-1] == {"title": "Account Executive", "department": "Sales",
+                            "location": "London", "url": "https://acme.com/jobs/9"}
+        assert all("Home" != job["title"] for job in jobs)
+
+    def test_location_on_next_line_and_numbered_list(self):
+        """Test numbered headings with the location on the following line."""
+        page = "\n".join(f"### {i}. [Role {i}](/jobs/{i})\nCity {i}\n" for i in range(1, 5))
+        jobs = [{"title": f"Role {i}", "location": f"City {i}", "url": f"/jobs/{i}"} for i in range(1, 5)]
+
+        template = induce_template("x", page, jobs)
+
+        assert template.location == LOCATION_NEXT_LINE
+        assert [j["location"] for j in apply_template(template, page)] == [f"City {i}" for i in range(1, 5)]
+
+    def test_no_template_when_jobs_not_reproducible(self):
+        """Test jobs that are not links in the page yield no template."""
+        page = "\n".join(f"- {title}" for title in ("A role", "B role", "C role"))
+        assert induce_template("x", page, [{"title": t} for t in ("A role", "B role", "C role")]) is None
+        assert induce_template("x", PAGE, JOBS[:2]) is None
+
+
+class TestTemplateStore:
+    """Tests for TemplateStore and learn_template."""
+
+    def test_persists_to_file(self, tmp_path):
+        """Test templates survive a new store instance."""
+        path = str(tmp_path / "templates.json")
+        store = TemplateStore(path)
+        learn_template(URL, PAGE, JOBS, store=store)
+        store.flush()
+
+        template = TemplateStore(path).get(template_key(URL))
+        assert template is not None
+        assert apply_template(template, PAGE) == JOBS
+
+    def test_writes_are_batched(self, tmp_path):
+        """Test reuse counts are not written to the file on every hit."""
+        path = tmp_path / "templates.json"
+        store = TemplateStore(str(path), save_interval=3600)
+        learn_template(URL, PAGE, JOBS, store=store)
+        for _ in range(5):
+            store.record(template_key(URL), True)
+        assert not path.exists()
+
+        store.flush()
+        assert TemplateStore(str(path)).get(template_key(URL)).hits == 5
+
+    def test_failed_learning_drops_stale_template(self):
+        """Test a redesign that cannot be learned removes the old template."""
+        store = TemplateStore()
+        learn_template(URL, PAGE, JOBS, store=store)
+        learn_template(URL, "Jobs are listed in plain text now", JOBS, store=store)
+        assert len(store) == 0
+
+    def test_key_includes_path(self):
+        """Test hosted boards for different companies get different keys."""
+        assert template_key("https://Boards.greenhouse.io/acme/") == "boards.greenhouse.io/acme"
+        assert template_key("https://boards.greenhouse.io/other") != template_key("https://boards.greenhouse.io/acme")
+
+
+@patch('openjobs.scraper.HEURISTIC_EXTRACTION', False)
+class TestExtractionUsesTemplates:
+    """Tests for templates inside extract_jobs_from_markdown."""
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_second_run_skips_gemini(self, mock_post):
+        """Test Gemini is called once and later runs parse locally."""
+        mock_post.return_value = _gemini_response(JOBS)
+        page = ScrapeResult(url=URL, content=PAGE)
+
+        first = extract_jobs_from_markdown(page, api_key="key")
+        second = extract_jobs_from_markdown(page, api_key="key")
+
+        assert first == second == JOBS
+        assert mock_post.call_count == 1
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_falls_back_to_gemini_when_validation_fails(self, mock_post):
+        """Test a page the template no longer matches goes to Gemini."""
+        mock_post.return_value = _gemini_response(JOBS)
+        extract_jobs_from_markdown(ScrapeResult(url=URL, content=PAGE), api_key="key")
+
+        redesigned = PAGE.replace("- [", "* [")
+        extract_jobs_from_markdown(ScrapeResult(url=URL, content=redesigned), api_key="key")
+
+        assert mock_post.call_count == 2
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_custom_prompt_and_plain_text_not_templated(self, mock_post):
+        """Test templates are only used for pages with a URL and the default prompt."""
+        mock_post.return_value = _gemini_response(JOBS)
+        extract_jobs_from_markdown(ScrapeResult(url=URL, content=PAGE), api_key="key")
+
+        extract_jobs_from_markdown(ScrapeResult(url=URL, content=PAGE), prompt="Custom", api_key="key")
+        extract_jobs_from_markdown(PAGE, api_key="key")
+
+        assert mock_post.call_count == 3
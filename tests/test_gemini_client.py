@@ -0,0 +1,158 @@
+"""Tests for openjobs.gemini_client module."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from openjobs.gemini_client import MODEL_ROUTES, GeminiClient, default_client, parse_json
+from openjobs.key_pool import KeyPool
+from openjobs.processor import _call_gemini
+
+USAGE = {"promptTokenCount": 120, "cachedContentTokenCount": 100, "candidatesTokenCount": 8, "totalTokenCount": 128}
+CONTENTS = [{"role": "user", "parts": [{"text": "prompt"}]}]
+
+
+def _response(status_code=200, text='{"category": "Data"}', usage=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = "error"
+    body = {"candidates": [{"content": {"parts": [{"text": text}]}, "finishReason": "STOP"}]}
+    if usage:
+        body["usageMetadata"] = usage
+    response.json.return_value = body
+    return response
+
+
+def _client(*keys):
+    return GeminiClient(keys=KeyPool(keys or ["key-a"]), backoff=0)
+
+
+def _keys_used(mock_post):
+    return [call[0][0].rsplit("key=", 1)[1] for call in mock_post.call_args_list]
+
+
+class TestGeminiClient:
+    """Tests for GeminiClient."""
+
+    def test_routes_model_and_captures_usage(self):
+        """Test the task picks the model and token usage is counted per model."""
+        client = _client()
+        with patch.object(client.session, "post", return_value=_response(usage=USAGE)) as mock_post:
+            response = client.generate(CONTENTS, task="search", tools=[{"google_search": {}}],
+                                       response_schema={"type": "OBJECT"})
+
+        url = mock_post.call_args[0][0]
+        payload = mock_post.call_args[1]["json"]
+        assert f"/models/{MODEL_ROUTES['search']}:generateContent?key=key-a" in url
+        assert payload["tools"] == [{"google_search": {}}]
+        assert payload["generationConfig"]["responseMimeType"] == "application/json"
+        assert response.text == '{"category": "Data"}'
+        assert response.usage == {"prompt_tokens": 120, "cached_tokens": 100, "output_tokens": 8, "total_tokens": 128}
+        assert client.usage[MODEL_ROUTES["search"]]["calls"] == 1
+
+    def test_retries_server_errors(self):
+        """Test a 503 is retried with backoff."""
+        client = _client()
+        with patch.object(client.session, "post", side_effect=[_response(503), _response()]), \
+                patch("openjobs.gemini_client.time.sleep") as mock_sleep:
+            assert client.generate(CONTENTS).text == '{"category": "Data"}'
+
+        mock_sleep.assert_called_once_with(0)
+        assert client.stats == {"requests": 2, "retries": 1, "errors": 0}
+
+    def test_gives_up_after_retries(self):
+        """Test a persistent error returns an empty response."""
+        client = _client()
+        with patch.object(client.session, "post", return_value=_response(500)) as mock_post:
+            response = client.generate(CONTENTS)
+
+        assert response.text == ""
+        assert response.status_code == 500
+        assert mock_post.call_count == client.retries + 1
+        assert client.stats["errors"] == 1
+
+    def test_rate_limited_key_rotates(self):
+        """Test a 429 on a pooled key moves the request to another key."""
+        client = _client("key-a", "key-b")
+        with patch.object(client.session, "post", side_effect=[_response(429), _response(), _response()]) as mock_post:
+            client.generate(CONTENTS)
+            client.generate(CONTENTS)
+
+        assert _keys_used(mock_post) == ["key-a", "key-b", "key-b"]
+
+    def test_explicit_key_is_kept(self):
+        """Test a request with api_key retries on the same key."""
+        client = _client("key-a", "key-b")
+        with patch.object(client.session, "post", side_effect=[_response(429), _response()]) as mock_post:
+            client.generate(CONTENTS, api_key="mine")
+
+        assert _keys_used(mock_post) == ["mine", "mine"]
+
+    def test_forbidden_single_key_is_not_retried(self):
+        """Test a 403 is final when no other key is left."""
+        client = _client()
+        with patch.object(client.session, "post", return_value=_response(403)) as mock_post:
+            assert client.generate(CONTENTS).text == ""
+
+        assert mock_post.call_count == 1
+
+    def test_connection_errors_are_retried(self):
+        """Test dropped connections are retried and re-raised once retries run out."""
+        client = _client()
+        with patch.object(client.session, "post", side_effect=requests.ConnectionError("reset")) as mock_post:
+            with pytest.raises(requests.ConnectionError):
+                client.generate(CONTENTS)
+
+        assert mock_post.call_count == client.retries + 1
+
+    def test_stream_captures_usage(self):
+        """Test streamed deltas are yielded and the final usage is recorded."""
+        response = MagicMock(status_code=200)
+        events = [{"candidates": [{"content": {"parts": [{"text": "[{"}]}}]},
+                  {"candidates": [{"content": {"parts": [{"text": "}]"}]}, "finishReason": "STOP"}],
+                   "usageMetadata": USAGE}]
+        response.iter_lines.return_value = [f"data: {json.dumps(event)}" for event in events]
+        client = _client()
+        with patch.object(client.session, "post", return_value=response) as mock_post:
+            assert list(client.stream(CONTENTS)) == [("[{", None), ("}]", "STOP")]
+
+        assert ":streamGenerateContent?alt=sse&key=key-a" in mock_post.call_args[0][0]
+        assert client.usage[MODEL_ROUTES["extraction"]]["output_tokens"] == 8
+        response.close.assert_called_once()
+
+
+class TestParseJson:
+    """Tests for parse_json."""
+
+    def test_strips_code_fences(self):
+        """Test fenced and truncated answers parse."""
+        assert parse_json('```json\n{"a": 1}\n```').value == {"a": 1}
+        assert parse_json('{"a": 1, "b": [').complete is False
+
+
+class TestCallSites:
+    """Tests for the processor and scraper going through the shared client."""
+
+    @patch("openjobs.gemini_client.default_client.session.post")
+    def test_call_gemini_uses_pool(self, mock_post):
+        """Test enrichment calls share the client's key rotation and usage counters."""
+        pool = KeyPool(["key-a", "key-b"])
+        mock_post.side_effect = [_response(429), _response(usage=USAGE), _response(usage=USAGE)]
+
+        with patch.object(default_client, "keys", pool), patch("openjobs.processor.gemini_keys", pool):
+            assert _call_gemini("prompt") == {"category": "Data"}
+            assert _call_gemini("prompt") == {"category": "Data"}
+
+        assert _keys_used(mock_post) == ["key-a", "key-b", "key-b"]
+        assert default_client.usage[MODEL_ROUTES["enrichment"]]["calls"] == 2
+
+    @patch("openjobs.gemini_client.default_client.session.post")
+    def test_careers_search(self, mock_post):
+        """Test the careers-page search is routed to the search model with grounding."""
+        from openjobs.scraper import _search_careers_with_gemini
+
+        mock_post.return_value = _response(text="https://stripe.com/jobs/search")
+        assert _search_careers_with_gemini("stripe.com", "key") == "https://stripe.com/jobs/search"
+        assert mock_post.call_args[1]["json"]["tools"] == [{"google_search": {}}]
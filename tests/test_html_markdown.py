@@ -0,0 +1,76 @@
+"""Tests for openjobs.html_markdown module."""
+
+from unittest.mock import patch, MagicMock
+
+from openjobs.html_markdown import HtmlConversion, html_to_markdown
+
+
+class TestHtmlToMarkdown:
+    """Tests for html_to_markdown function."""
+
+    def test_empty_html(self):
+        """Test empty input converts to empty markdown."""
+        assert html_to_markdown('') == HtmlConversion('', 0, 0)
+
+    def test_strips_non_content_nodes(self):
+        """Test scripts, styles and SVG are removed."""
+        html = ('<head><title>T</title></head><style>.a{color:red}</style>'
+                '<script>var jobs = 1;</script><svg><path d="M0 0"/></svg><p>Visible</p>')
+        assert html_to_markdown(html).markdown == 'Visible'
+
+    def test_headings_and_list_items(self):
+        """Test headings and list items become markdown."""
+        html = '<h2 class="dept">Engineering</h2><ul><li>Backend Engineer</li><li>SRE</li></ul>'
+        assert html_to_markdown(html).markdown == '## Engineering\n- Backend Engineer\n- SRE'
+
+    def test_links_resolved_against_base_url(self):
+        """Test relative links are kept and resolved."""
+        html = '<a class="job" href="/jobs/42">Data Scientist</a>'
+        result = html_to_markdown(html, base_url='https://acme.com/careers')
+        assert result.markdown == '[Data Scientist](https://acme.com/jobs/42)'
+
+    def test_skips_anchor_and_script_links(self):
+        """Test fragment and javascript: links keep only their text."""
+        html = '<p><a href="#top">Top</a> <a href="javascript:void(0)">Apply</a></p>'
+        assert '(' not in html_to_markdown(html).markdown
+
+    def test_table_cells(self):
+        """Test table rows become pipe-separated lines."""
+        html = '<table><tr><td>Designer</td><td>London</td></tr></table>'
+        assert html_to_markdown(html).markdown == 'Designer | London'
+
+    def test_entities_decoded(self):
+        """Test HTML entities are decoded."""
+        assert html_to_markdown('<p>R&amp;D Engineer</p>').markdown == 'R&D Engineer'
+
+    def test_reduction_ratio_reported(self):
+        """Test reduction ratio and token savings are reported."""
+        html = '<div class="' + 'x' * 400 + '"><p>Engineer</p></div>'
+        result = html_to_markdown(html)
+        assert result.output_chars == len('Engineer')
+        assert result.reduction_ratio > 50
+        assert result.tokens_saved > 0
+
+
+class TestHtmlFallbackUsesMarkdown:
+    """Tests for the HTML fallback in extract_jobs_from_markdown."""
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_converted_markdown_sent_to_gemini(self, mock_post):
+        """Test raw HTML is reduced to markdown before the Gemini call."""
+        from openjobs.scraper import extract_jobs_from_markdown
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            'candidates': [{'content': {'parts': [{'text': '[{"title": "Engineer"}]'}]}}]
+        }
+        mock_post.return_value = mock_response
+
+        rows = ''.join(f'<li class="job-row"><a href="/j/{i}">Engineer {i}</a></li>' for i in range(20))
+        html = '<!-- RAW_HTML -->\n<script>' + 'x' * 5000 + '</script><ul>' + rows + '</ul>'
+        extract_jobs_from_markdown(html, api_key='test-key')
+
+        prompt = mock_post.call_args[1]['json']['contents'][0]['parts'][0]['text']
+        assert '- [Engineer 0](/j/0)' in prompt
+        assert '<script>' not in prompt
+        assert 'class=' not in prompt
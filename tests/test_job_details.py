@@ -0,0 +1,119 @@
+"""Tests for openjobs.job_details module."""
+
+import json
+import threading
+import time
+from unittest.mock import patch
+
+from openjobs.job_details import (
+    SOURCE_FIRECRAWL,
+    SOURCE_HTML,
+    SOURCE_JSON_LD,
+    DetailFetcher,
+    normalize_job_url,
+)
+
+DESCRIPTION = "<p>We are hiring a backend engineer to build APIs in Python and Go.</p>" * 8
+
+
+def _ld_page(data):
+    return f'<html><script type="application/ld+json">{json.dumps(data)}</script><body>nav</body></html>'
+
+
+class TestNormalizeJobUrl:
+    """Tests for normalize_job_url."""
+
+    def test_drops_fragment_and_lowercases_host(self):
+        """Test equivalent URLs normalize to one key."""
+        assert normalize_job_url("HTTPS://Jobs.Acme.com/Role/1#apply") == "https://jobs.acme.com/Role/1"
+
+
+class TestDetailFetcher:
+    """Tests for DetailFetcher."""
+
+    @patch('openjobs.job_details.firecrawl_request')
+    @patch('openjobs.job_details.fetch_raw_html')
+    def test_json_ld_tier_skips_firecrawl(self, mock_raw, mock_firecrawl):
+        """Test a JSON-LD description is used without rendering."""
+        mock_raw.return_value = _ld_page({"@type": "JobPosting", "description": DESCRIPTION})
+
+        job = DetailFetcher().fetch({"title": "Engineer", "job_url": "https://acme.com/jobs/1"})
+
+        assert job["description_source"] == SOURCE_JSON_LD
+        mock_firecrawl.assert_not_called()
+
+    @patch('openjobs.job_details.firecrawl_request')
+    @patch('openjobs.job_details.fetch_raw_html')
+    def test_tiers_fall_through(self, mock_raw, mock_firecrawl):
+        """Test page text is used next, and Firecrawl only for empty shells."""
+        mock_raw.side_effect = lambda url, max_bytes: (
+            f"<main>{DESCRIPTION}</main>" if url.endswith("/1") else '<div id="root"></div>'
+        )
+        mock_firecrawl.return_value = "Rendered description " * 30
+
+        fetcher = DetailFetcher()
+        assert fetcher.fetch({"job_url": "https://acme.com/jobs/1"})["description_source"] == SOURCE_HTML
+        assert fetcher.fetch({"job_url": "https://acme.com/jobs/2"})["description_source"] == SOURCE_FIRECRAWL
+        assert mock_firecrawl.call_count == 1
+
+    @patch('openjobs.job_details.fetch_raw_html')
+    def test_skips_listing_fallback_and_existing_description(self, mock_raw):
+        """Test jobs without their own page or with a description are not fetched."""
+        fetcher = DetailFetcher()
+        listing = {"job_url": "https://acme.com/careers#job-3", "source_url": "https://acme.com/careers"}
+        described = {"job_url": "https://acme.com/jobs/1", "description": "Already here"}
+
+        assert fetcher.fetch(listing) is listing
+        assert fetcher.fetch(described) is described
+        mock_raw.assert_not_called()
+
+    @patch('openjobs.job_details.firecrawl_request')
+    @patch('openjobs.job_details.fetch_raw_html')
+    def test_blocked_urls_are_not_fetched(self, mock_raw, mock_firecrawl):
+        """Test job URLs pointing at internal addresses reach no tier."""
+        fetcher = DetailFetcher()
+        for url in ("http://169.254.169.254/latest/meta-data/", "http://localhost:8080/jobs/1", "http://10.0.0.5/"):
+            job = {"job_url": url}
+            assert fetcher.fetch(job) is job
+
+        mock_raw.assert_not_called()
+        mock_firecrawl.assert_not_called()
+        assert fetcher.stats["invalid"] == 3
+
+    @patch('openjobs.job_details.fetch_raw_html')
+    def test_dedup_and_cache(self, mock_raw):
+        """Test concurrent and repeated requests for one URL fetch it once."""
+        def slow_fetch(url, max_bytes):
+            time.sleep(0.05)
+            return f"<main>{DESCRIPTION}</main>"
+        mock_raw.side_effect = slow_fetch
+
+        fetcher = DetailFetcher(max_workers=8)
+        jobs = [{"job_url": "https://acme.com/jobs/1#x"}, {"job_url": "https://ACME.com/jobs/1"}] * 4
+        results = fetcher.fetch_all(jobs)
+        fetcher.fetch({"job_url": "https://acme.com/jobs/1"})
+
+        assert all(r["description"] for r in results)
+        assert mock_raw.call_count == 1
+        assert fetcher.stats["fetched"] == 1
+        assert fetcher.stats["cache_hits"] + fetcher.stats["deduplicated"] == 8
+
+    @patch('openjobs.job_details.fetch_raw_html')
+    def test_per_host_limit(self, mock_raw):
+        """Test no more than max_per_host fetches hit one host at once."""
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def track(url, max_bytes):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return f"<main>{DESCRIPTION}</main>"
+        mock_raw.side_effect = track
+
+        fetcher = DetailFetcher(max_per_host=2, max_workers=8)
+        fetcher.fetch_all([{"job_url": f"https://acme.com/jobs/{i}"} for i in range(8)])
+
+        assert peak[0] == 2
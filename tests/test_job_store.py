@@ -0,0 +1,135 @@
+"""Tests for openjobs.job_store module."""
+
+import threading
+from unittest.mock import patch
+
+from openjobs.job_store import (
+    CHANGE_NEW,
+    CHANGE_REMOVED,
+    CHANGE_UPDATED,
+    JobStore,
+    job_key,
+)
+
+SOURCE = "https://acme.com/careers"
+
+
+def _job(slug, title, location="Remote", date_scraped="2025-01-01T00:00:00"):
+    return {
+        "company": "Acme", "title": title, "location": location, "slug": f"acme-{slug}",
+        "job_url": f"https://acme.com/jobs/{slug}", "source_url": SOURCE, "date_scraped": date_scraped,
+    }
+
+
+class TestJobKey:
+    """Tests for job_key."""
+
+    def test_job_url_or_slug(self):
+        """Test job URLs identify jobs and listing-page fallbacks use the slug."""
+        assert job_key({"job_url": "https://ACME.com/jobs/1#apply"}) == "https://acme.com/jobs/1"
+        assert job_key({"job_url": f"{SOURCE}#job-3", "source_url": SOURCE, "slug": "acme-pm"}) == "acme-pm"
+
+
+class TestJobStore:
+    """Tests for JobStore."""
+
+    def test_change_feed(self, tmp_path):
+        """Test new, updated, unchanged and removed jobs across scrapes."""
+        store = JobStore(str(tmp_path / "jobs.db"))
+        first = store.sync_source(SOURCE, [_job("1", "Engineer"), _job("2", "Designer")], "2025-01-01T00:00:00")
+        assert first == (2, 0, 0, 0)
+
+        # Same jobs with a new date_scraped, one moved, one gone, one added
+        second = store.sync_source(SOURCE, [
+            _job("1", "Engineer", date_scraped="2025-01-02T00:00:00"),
+            _job("3", "Analyst"),
+        ], "2025-01-02T00:00:00")
+        assert second == (1, 0, 1, 1)
+
+        third = store.sync_source(SOURCE, [
+            _job("1", "Engineer", location="Berlin"), _job("3", "Analyst"),
+        ], "2025-01-03T00:00:00")
+        assert third == (0, 1, 1, 0)
+
+        changes = {c.job_key: c.kind for c in store.changes_since("2025-01-01T12:00:00")}
+        assert changes == {
+            "https://acme.com/jobs/1": CHANGE_UPDATED,
+            "https://acme.com/jobs/2": CHANGE_REMOVED,
+            "https://acme.com/jobs/3": CHANGE_NEW,
+        }
+        assert store.changes_since("2025-01-03T00:00:00") == []
+
+        engineer = store.jobs(company="Acme")[0]
+        assert engineer["location"] == "Berlin"
+        assert engineer["first_seen"].startswith("2025-01-01")
+        assert engineer["last_seen"].startswith("2025-01-03")
+        assert len(store) == 2
+
+    def test_relisted_job_is_updated(self):
+        """Test a removed job that comes back is reported again."""
+        store = JobStore(":memory:")
+        store.sync_source(SOURCE, [_job("1", "Engineer"), _job("2", "Designer")], "2025-01-01T00:00:00")
+        store.sync_source(SOURCE, [_job("1", "Engineer")], "2025-01-02T00:00:00")
+        store.sync_source(SOURCE, [_job("1", "Engineer"), _job("2", "Designer")], "2025-01-03T00:00:00")
+
+        assert [(c.job_key, c.kind) for c in store.changes_since("2025-01-02T12:00:00")] == [
+            ("https://acme.com/jobs/2", CHANGE_UPDATED)
+        ]
+        assert len(store.jobs(source_url=SOURCE)) == 2
+
+    def test_wal_and_indexes(self, tmp_path):
+        """Test the database uses WAL and indexes the filter columns."""
+        store = JobStore(str(tmp_path / "jobs.db"))
+        assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[1] for row in store._conn.execute("PRAGMA index_list(jobs)")}
+        assert {"idx_jobs_company", "idx_jobs_category", "idx_jobs_source_url"} <= indexes
+
+    def test_concurrent_writers(self, tmp_path):
+        """Test threads sharing a store do not lose writes."""
+        store = JobStore(str(tmp_path / "jobs.db"))
+
+        def write(n):
+            store.upsert_jobs([_job(f"{n}-{i}", f"Role {n}-{i}") for i in range(20)])
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(store) == 80
+
+
+class TestPipelineStore:
+    """Tests for run_careers_pipeline(store=...)."""
+
+    def _run(self, store, titles, process=None):
+        from openjobs.pipeline import run_careers_pipeline
+        from openjobs.scrape_result import ScrapeResult
+        extracted = [{"title": title, "url": f"https://acme.com/jobs/{i}"} for i, title in titles]
+        with patch('openjobs.pipeline.scrape_with_firecrawl', return_value=ScrapeResult(url=SOURCE, content="# Jobs")), \
+                patch('openjobs.pipeline.extract_jobs_from_markdown', return_value=extracted), \
+                patch('openjobs.pipeline.process_job', side_effect=process or (lambda job, enrich, api_key: job)), \
+                patch('openjobs.scraper.is_valid_url', return_value=(True, "OK")):
+            return run_careers_pipeline([SOURCE], store=store, enrich=False)
+
+    def test_syncs_each_source(self):
+        """Test pipeline results are synced per careers page."""
+        store = JobStore(":memory:")
+
+        self._run(store, [("1", "Engineer"), ("2", "Designer")])
+
+        assert [c.kind for c in store.changes_since("2000-01-01")] == [CHANGE_NEW, CHANGE_NEW]
+
+    def test_failed_or_filtered_jobs_are_not_removed(self):
+        """Test a job still on the page stays when its enrichment fails."""
+        store = JobStore(":memory:")
+        self._run(store, [("1", "Engineer"), ("2", "Designer")])
+
+        def fail_designer(job, enrich, api_key):
+            return None if job["title"] == "Designer" else job
+        jobs = self._run(store, [("1", "Engineer"), ("2", "Designer")], process=fail_designer)
+
+        assert [job["title"] for job in jobs] == ["Engineer"]
+        assert CHANGE_REMOVED not in [c.kind for c in store.changes_since("2000-01-01")]
+        self._run(store, [("1", "Engineer")])
+        assert [c.kind for c in store.changes_since("2000-01-01")][-1] == CHANGE_REMOVED
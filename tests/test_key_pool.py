@@ -0,0 +1,126 @@
+"""Tests for openjobs.key_pool module."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from openjobs.key_pool import KeyPool, keys_from_env
+from openjobs.scraper import FIRECRAWL_RETRIES, firecrawl_request
+
+
+class FakeClock:
+    """Stand-in for the time module whose sleep advances monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with patch("openjobs.key_pool.time", fake):
+        yield fake
+
+
+class TestKeyPool:
+    """Tests for KeyPool."""
+
+    def test_keys_from_env(self):
+        """Test the single and comma-separated variables are merged without duplicates."""
+        with patch.dict("os.environ", {"GOOGLE_API_KEY": "a", "GOOGLE_API_KEYS": "b, a,,c"}):
+            assert keys_from_env("GOOGLE_API_KEY") == ["a", "b", "c"]
+
+    def test_least_loaded_key(self, clock):
+        """Test requests spread across keys."""
+        pool = KeyPool(["a", "b", "c"])
+        assert [pool.wait() for _ in range(6)] == ["a", "b", "c", "a", "b", "c"]
+
+    def test_per_key_bucket(self, clock):
+        """Test a key waits only for its own bucket and the pool's capacity adds up."""
+        pool = KeyPool(["a", "b"], requests_per_minute=2)
+        for _ in range(4):
+            pool.wait()
+        assert clock.slept == []
+
+        pool.wait()
+        assert clock.slept == [60]
+        assert pool.stats == {"requests": 5, "waits": 1, "cooldowns": 0}
+
+    def test_rate_limited_key_cools_down(self, clock):
+        """Test a 429 takes a key out of rotation until its cooldown ends."""
+        pool = KeyPool(["a", "b"], cooldown=30)
+        pool.report("a", 429)
+
+        assert not pool.healthy("a")
+        assert [pool.wait() for _ in range(3)] == ["b", "b", "b"]
+        clock.now += 30
+        assert pool.healthy("a")
+        assert pool.select() == "a"
+
+    def test_cooldown_doubles_until_success(self, clock):
+        """Test repeated failures back off and a success resets them."""
+        pool = KeyPool(["a"], cooldown=10)
+        pool.report("a", 403)
+        pool.report("a", 403)
+
+        assert pool.wait() == "a"
+        assert clock.slept == [20]
+        pool.report("a", 200)
+        pool.report("a", 429)
+        clock.now += 10
+        assert pool.healthy("a")
+
+    def test_explicit_key(self, clock):
+        """Test a caller's key is rate limited without joining the rotation."""
+        pool = KeyPool(["a"], requests_per_minute=1)
+        assert pool.wait("mine") == "mine"
+        assert pool.wait() == "a"
+        assert pool.keys == ["a"]
+        assert clock.slept == []
+
+    def test_empty_pool(self, clock):
+        """Test keyless endpoints share one bucket."""
+        pool = KeyPool(requests_per_minute=1)
+        assert pool.select() == ""
+        assert pool.wait() == ""
+        pool.wait()
+        assert clock.slept == [60]
+
+
+class TestFirecrawlKeys:
+    """Tests for the key pool behind Firecrawl requests."""
+
+    @patch("openjobs.scraper.requests.post")
+    def test_forbidden_key_rotates(self, mock_post, clock):
+        """Test a Firecrawl key answering 403 leaves the rotation and the request moves on."""
+        pool = KeyPool(["fc-a", "fc-b"], requests_per_minute=30)
+        ok = MagicMock(status_code=200)
+        ok.json.return_value = {"data": {"markdown": "# Jobs"}}
+        mock_post.side_effect = [MagicMock(status_code=403), ok]
+
+        with patch("openjobs.scraper.firecrawl_keys", pool):
+            assert firecrawl_request("https://acme.com/careers", 1000) == "# Jobs"
+
+        headers = [call[1]["headers"]["Authorization"] for call in mock_post.call_args_list]
+        assert headers == ["Bearer fc-a", "Bearer fc-b"]
+        assert not pool.healthy("fc-a")
+
+    @patch("openjobs.scraper.time.sleep")
+    @patch("openjobs.scraper.requests.post")
+    def test_rate_limit_retries_take_a_slot(self, mock_post, mock_sleep, clock):
+        """Test every retry after a 429 is metered by the pool."""
+        pool = KeyPool(["fc-a"], requests_per_minute=30)
+        mock_post.return_value = MagicMock(status_code=429)
+
+        with patch("openjobs.scraper.firecrawl_keys", pool):
+            assert firecrawl_request("https://acme.com/careers", 1000) == ""
+
+        assert mock_post.call_count == pool.stats["requests"] == FIRECRAWL_RETRIES + 1
@@ -0,0 +1,144 @@
+"""Tests for openjobs.main_content module."""
+
+import json
+from unittest.mock import patch
+
+from openjobs.main_content import (
+    SOURCE_DENSITY,
+    SOURCE_FULL,
+    SOURCE_JSON_LD,
+    SOURCE_MARKDOWN,
+    extract_main_content,
+    is_html_page,
+    json_ld_description,
+)
+
+PARAGRAPH = "You will design, build and operate APIs in Python, working with product, data and design teams."
+DESCRIPTION_HTML = "".join(f"<p>{PARAGRAPH}</p>" for _ in range(6))
+
+NAV = '<nav><ul>' + ''.join(f'<li><a href="/p{i}">Product page number {i}</a></li>' for i in range(30)) + '</ul></nav>'
+RELATED = (
+    '<div class="related-jobs">'
+    + ''.join(f'<p><a href="/j/{i}">Similar role, Senior Engineer number {i}, Remote</a></p>' for i in range(10))
+    + '</div>'
+)
+PAGE = (
+    f'<html><head><title>Job</title><style>.x{{}}</style></head><body>{NAV}'
+    f'<div class="wrapper"><div class="job-description"><h2>About the role</h2>{DESCRIPTION_HTML}</div>'
+    f'{RELATED}</div><footer><p>© Acme, Inc. All rights reserved, privacy, terms, cookies.</p></footer>'
+    '</body></html>'
+)
+
+
+def _ld_page(data):
+    return f'<html><script type="application/ld+json">{json.dumps(data)}</script><body>nav</body></html>'
+
+
+class TestJsonLdDescription:
+    """Tests for json_ld_description."""
+
+    def test_job_posting_description_as_text(self):
+        """Test the HTML description is converted to text."""
+        text = json_ld_description(_ld_page({"@type": "JobPosting", "description": DESCRIPTION_HTML}))
+        assert text.startswith("You will design")
+        assert "<p>" not in text
+
+    def test_graph_and_type_list(self):
+        """Test JobPosting nodes inside @graph with a list @type."""
+        page = _ld_page({"@graph": [{"@type": "Organization"},
+                                    {"@type": ["JobPosting"], "description": "Build things"}]})
+        assert json_ld_description(page) == "Build things"
+
+    def test_no_posting(self):
+        """Test pages without a JobPosting yield nothing."""
+        assert json_ld_description(_ld_page({"@type": "Organization"})) == ""
+        assert json_ld_description('<script type="application/ld+json">{bad</script>') == ""
+
+
+class TestExtractMainContentHtml:
+    """Tests for extract_main_content on HTML."""
+
+    def test_density_picks_description_block(self):
+        """Test nav, related jobs and footer are left out."""
+        result = extract_main_content(PAGE)
+
+        assert result.source == SOURCE_DENSITY
+        assert result.text.startswith("## About the role")
+        assert PARAGRAPH in result.text
+        assert "Product page" not in result.text
+        assert "Similar role" not in result.text
+        assert "rights reserved" not in result.text
+        assert result.reduction_ratio > 1
+
+    def test_json_ld_preferred(self):
+        """Test a JSON-LD description wins over page text."""
+        ld = f'<script type="application/ld+json">{json.dumps({"@type": "JobPosting", "description": DESCRIPTION_HTML})}</script>'
+        result = extract_main_content(PAGE.replace("<head>", f"<head>{ld}"))
+        assert result.source == SOURCE_JSON_LD
+
+    def test_unclosed_paragraphs(self):
+        """Test <p> tags without end tags still score their container."""
+        page = f'<body>{NAV}<article>' + f'<p>{PARAGRAPH}' * 5 + '</article></body>'
+        result = extract_main_content(page)
+        assert result.source == SOURCE_DENSITY
+        assert "Product page" not in result.text
+
+    def test_short_page_falls_back_to_full_text(self):
+        """Test pages without a substantial block return all their text."""
+        result = extract_main_content('<div><p>Short</p></div>')
+        assert result == ("Short", SOURCE_FULL, len('<div><p>Short</p></div>'))
+
+
+class TestExtractMainContentMarkdown:
+    """Tests for extract_main_content on markdown and plain text."""
+
+    def test_skips_link_lists(self):
+        """Test menus and related-job link lists around the description are dropped."""
+        menu = "\n".join(f"- [Menu item {i}](/m{i})" for i in range(10))
+        related = "\n".join(f"- [Related job {i}](/j{i})" for i in range(10))
+        second = "You will mentor engineers, review designs and share on-call duty for the services you own."
+        markdown = f"{menu}\n\n# Backend Engineer\n\n{PARAGRAPH}\n\n{second}\n\n- Python\n- SQL\n\n{related}"
+
+        result = extract_main_content(markdown)
+
+        assert result.source == SOURCE_MARKDOWN
+        assert result.text.startswith("# Backend Engineer")
+        assert "Menu item" not in result.text
+        assert "Related job" not in result.text
+
+    def test_plain_description_unchanged(self):
+        """Test a short plain description passes through."""
+        assert extract_main_content("Build APIs in Go.").text == "Build APIs in Go."
+        assert extract_main_content("") == ("", SOURCE_FULL, 0)
+
+
+class TestEnhanceUsesMainContent:
+    """Tests for main-content extraction inside enhance_job_output."""
+
+    @patch('openjobs.processor._call_gemini', return_value=None)
+    def test_prompt_holds_description_not_chrome(self, mock_call):
+        """Test page chrome does not reach the enrichment prompt."""
+        from openjobs.processor import enhance_job_output
+        enhance_job_output("Backend Engineer", PAGE)
+
+        prompt = mock_call.call_args[0][0]
+        assert PARAGRAPH in prompt
+        assert "Product page" not in prompt
+
+    @patch('openjobs.processor._call_gemini', return_value=None)
+    def test_plain_description_kept_whole(self, mock_call):
+        """Test description text is not pruned or cut to its largest run."""
+        from openjobs.processor import enhance_job_output
+        description = "\n\n".join([
+            "About us", PARAGRAPH, "- [Benefits](https://acme.com/benefits)", "- Remote", PARAGRAPH * 2,
+        ])
+        enhance_job_output("Backend Engineer", description)
+
+        assert " ".join(description.split()) in mock_call.call_args[0][0]
+
+    def test_is_html_page(self):
+        """Test only whole documents count as pages."""
+        assert is_html_page(PAGE)
+        assert is_html_page("<!DOCTYPE html><title>Job</title>")
+        assert not is_html_page(DESCRIPTION_HTML)
+        assert not is_html_page("Build APIs in Go.")
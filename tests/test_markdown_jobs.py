@@ -0,0 +1,99 @@
+"""Tests for openjobs.markdown_jobs module."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from openjobs.markdown_jobs import parse_job_list
+from openjobs.scraper import extract_jobs_from_markdown
+
+FIXTURES = Path(__file__).parent / "fixtures" / "job_pages"
+PAGES = sorted(path.stem for path in FIXTURES.glob("*.md"))
+
+# Recorded careers pages the parser must handle on its own
+CONFIDENT_PAGES = {"ashby_cards", "company_list", "greenhouse_board", "table_listing"}
+
+
+def _load(name):
+    markdown = (FIXTURES / f"{name}.md").read_text(encoding="utf-8")
+    expected = json.loads((FIXTURES / f"{name}.json").read_text(encoding="utf-8"))
+    return markdown, expected
+
+
+def _precision_recall(jobs, expected):
+    found = {(j["title"], j["url"]) for j in jobs}
+    truth = {(j["title"], j["url"]) for j in expected}
+    agreed = len(found & truth)
+    precision = agreed / len(found) if found else 1.0
+    recall = agreed / len(truth) if truth else 1.0
+    return precision, recall
+
+
+class TestParseJobList:
+    """Tests for parse_job_list."""
+
+    def test_heading_links_and_locations(self):
+        """Test departments from headings and locations after a separator."""
+        markdown = (
+            "- [Home](/)\n- [Blog](/blog)\n\n## Engineering\n\n"
+            "- [Backend Engineer](/jobs/1) · Remote\n- [Data Engineer](/jobs/2) | Berlin\n\n"
+            "## Sales\n\n- [Account Executive](/jobs/3) - London\n"
+        )
+        result = parse_job_list(markdown)
+
+        assert result.confident
+        assert result.jobs == [
+            {"title": "Backend Engineer", "department": "Engineering", "location": "Remote", "url": "/jobs/1"},
+            {"title": "Data Engineer", "department": "Engineering", "location": "Berlin", "url": "/jobs/2"},
+            {"title": "Account Executive", "department": "Sales", "location": "London", "url": "/jobs/3"},
+        ]
+
+    def test_unlisted_job_vocabulary_lowers_confidence(self):
+        """Test jobs written outside the link list keep the page on Gemini."""
+        listed = "\n".join(f"- [Engineer {i}](/jobs/{i})" for i in range(3))
+        unlisted = "\n\n".join(f"**Senior Designer {i}** - Remote" for i in range(6))
+        assert not parse_job_list(f"{listed}\n\n{unlisted}").confident
+
+    def test_empty(self):
+        """Test pages without links yield nothing."""
+        assert parse_job_list("") == ([], 0.0)
+        assert parse_job_list("# Careers\n\nNo open roles right now.") == ([], 0.0)
+
+
+class TestRecordedPagesBenchmark:
+    """Precision/recall of the parser on recorded careers pages."""
+
+    @pytest.mark.parametrize("name", PAGES)
+    def test_confidence_matches_page_kind(self, name):
+        """Test the parser is confident exactly on the pages it can read."""
+        markdown, _ = _load(name)
+        assert parse_job_list(markdown).confident == (name in CONFIDENT_PAGES)
+
+    def test_precision_and_recall(self):
+        """Test confident results agree with the recorded extractions, fields included."""
+        for name in sorted(CONFIDENT_PAGES):
+            markdown, expected = _load(name)
+            jobs = parse_job_list(markdown).jobs
+
+            assert _precision_recall(jobs, expected) == (1.0, 1.0), name
+            assert jobs == expected, name
+
+
+class TestExtractionUsesParser:
+    """Tests for the parser tier inside extract_jobs_from_markdown."""
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_confident_page_skips_gemini(self, mock_post):
+        """Test a clean job list is returned without an API call."""
+        markdown, expected = _load("greenhouse_board")
+        assert extract_jobs_from_markdown(markdown, api_key="key") == expected
+        mock_post.assert_not_called()
+
+    @patch('openjobs.scraper._generate_extraction', return_value=('[]', 'STOP'))
+    def test_unsure_page_uses_gemini(self, mock_generate):
+        """Test pages the parser cannot read still go to Gemini."""
+        markdown, _ = _load("plain_titles")
+        extract_jobs_from_markdown(markdown, api_key="key")
+        assert mock_generate.called
@@ -0,0 +1,148 @@
+"""Tests for openjobs.page_diff module."""
+
+from unittest.mock import patch
+
+from openjobs.page_diff import (
+    PageSnapshot,
+    SnapshotStore,
+    diff_page,
+    extract_changed_blocks,
+    split_blocks,
+)
+from openjobs.scrape_result import ScrapeResult
+from openjobs.scraper import extract_jobs_from_markdown
+
+URL = "https://acme.com/careers"
+INTRO = "We build payment infrastructure for small businesses. " * 10
+
+
+def _page(jobs):
+    blocks = ["# Careers", INTRO, "## Engineering"]
+    blocks += [f"**{title}** - {location} ([details](https://acme.com/jobs/{slug}))" for title, slug, location in jobs]
+    blocks.append("© Acme. All rights reserved.")
+    return "\n\n".join(blocks)
+
+
+ROLES = [("Backend Engineer", "1", "Remote"), ("Data Engineer", "2", "Berlin"), ("Designer", "3", "London")]
+
+
+def _job(title, slug, location):
+    return {"title": title, "department": "Engineering", "location": location, "url": f"https://acme.com/jobs/{slug}"}
+
+
+def _fake_extract(calls):
+    """Extract jobs from markdown by looking for the known roles, recording each call."""
+    def extract(markdown):
+        calls.append(markdown)
+        roles = ROLES + [("SRE", "4", "Remote")]
+        return [_job(*role) for role in roles if f"/jobs/{role[1]})" in markdown]
+    return extract
+
+
+class TestDiffPage:
+    """Tests for diff_page."""
+
+    def test_only_changed_blocks_with_context(self):
+        """Test an added job is sent with its heading and the block before it."""
+        old = _page(ROLES)
+        new = _page(ROLES[:1] + [("SRE", "4", "Remote")] + ROLES[1:])
+        snapshot = PageSnapshot.build(URL, old, [_job(*role) for role in ROLES])
+
+        delta = diff_page(snapshot, split_blocks(new))
+
+        assert delta.changed_blocks == 1
+        assert delta.markdown.startswith("## Engineering\n\n**Backend Engineer**")
+        assert "/jobs/4" in delta.markdown
+        assert INTRO.strip() not in delta.markdown
+        assert delta.ratio < 0.2
+
+    def test_unchanged_page(self):
+        """Test an identical page (whitespace aside) has an empty delta."""
+        snapshot = PageSnapshot.build(URL, _page(ROLES), [])
+        assert diff_page(snapshot, split_blocks(_page(ROLES).replace("\n\n", "\n  \n"))).markdown == ""
+
+    def test_url_attribution_is_exact(self):
+        """Test /jobs/1 is not attributed to the block holding /jobs/12."""
+        blocks = ["[A](https://acme.com/jobs/12)", "[A](https://acme.com/jobs/1)"]
+        snapshot = PageSnapshot.build(URL, "\n\n".join(blocks), [{"title": "A", "url": "https://acme.com/jobs/1"}])
+        assert snapshot.job_blocks == [snapshot.block_hashes[1]]
+
+
+class TestExtractChangedBlocks:
+    """Tests for extract_changed_blocks."""
+
+    def test_merges_delta_into_previous_jobs(self):
+        """Test added and removed roles without re-extracting the whole page."""
+        store, calls = SnapshotStore(), []
+        extract = _fake_extract(calls)
+        extract_changed_blocks(URL, _page(ROLES), extract, store=store)
+
+        new_roles = [ROLES[0], ("SRE", "4", "Remote"), ROLES[2]]
+        jobs = extract_changed_blocks(URL, _page(new_roles), extract, store=store)
+
+        assert jobs == [_job(*role) for role in new_roles]
+        assert len(calls) == 2
+        assert INTRO.strip() not in calls[1]
+
+    def test_unchanged_page_skips_extraction(self):
+        """Test a page without changes reuses the stored jobs."""
+        store, calls = SnapshotStore(), []
+        first = extract_changed_blocks(URL, _page(ROLES), _fake_extract(calls), store=store)
+        second = extract_changed_blocks(URL, _page(ROLES), _fake_extract(calls), store=store)
+        assert first == second
+        assert len(calls) == 1
+
+    def test_large_change_re_extracts_whole_page(self):
+        """Test a redesign sends the full page."""
+        store, calls = SnapshotStore(), []
+        extract_changed_blocks(URL, _page(ROLES), _fake_extract(calls), store=store)
+        redesigned = _page(ROLES).replace(INTRO, INTRO.upper())
+        extract_changed_blocks(URL, redesigned, _fake_extract(calls), store=store)
+        assert calls[1] == redesigned
+
+    def test_failed_delta_keeps_jobs_still_on_page(self):
+        """Test an empty delta result does not drop listings the page still shows."""
+        store = SnapshotStore()
+        extract_changed_blocks(URL, _page(ROLES), _fake_extract([]), store=store)
+        changed = _page([("Backend Engineer", "1", "Hybrid")] + ROLES[1:])
+        jobs = extract_changed_blocks(URL, changed, lambda markdown: [], store=store)
+        assert [job["title"] for job in jobs] == [role[0] for role in ROLES]
+
+    def test_removed_job_is_not_kept_by_title(self):
+        """Test a deleted listing is dropped even if its title appears in another one."""
+        roles = [("Engineer", "1", "Remote"), ("Senior Engineer", "2", "Berlin"), ("Designer", "3", "London")]
+        store = SnapshotStore()
+        extract_changed_blocks(URL, _page(roles), lambda markdown: [_job(*role) for role in roles], store=store)
+        jobs = extract_changed_blocks(URL, _page(roles[1:]), lambda markdown: [], store=store)
+        assert [job["title"] for job in jobs] == ["Senior Engineer", "Designer"]
+
+    def test_persists_to_file(self, tmp_path):
+        """Test snapshots survive a new store instance."""
+        path = str(tmp_path / "snapshots.json")
+        store = SnapshotStore(path)
+        extract_changed_blocks(URL, _page(ROLES), _fake_extract([]), store=store)
+        store.flush()
+        assert len(SnapshotStore(path).get(URL).jobs) == 3
+
+
+@patch('openjobs.scraper.HEURISTIC_EXTRACTION', False)
+@patch('openjobs.scraper.TEMPLATE_EXTRACTION', False)
+class TestExtractionUsesDiff:
+    """Tests for differential extraction inside extract_jobs_from_markdown."""
+
+    @patch('openjobs.scraper._generate_extraction')
+    def test_second_crawl_sends_only_changes(self, mock_generate):
+        """Test the second prompt holds the new block but not the unchanged intro."""
+        mock_generate.side_effect = [
+            ('[{"title": "Backend Engineer", "url": "https://acme.com/jobs/1"}]', 'STOP'),
+            ('[{"title": "SRE", "url": "https://acme.com/jobs/4"}]', 'STOP'),
+        ]
+        extract_jobs_from_markdown(ScrapeResult(url=URL, content=_page(ROLES[:1])), api_key="key")
+        jobs = extract_jobs_from_markdown(
+            ScrapeResult(url=URL, content=_page(ROLES[:1] + [("SRE", "4", "Remote")])), api_key="key"
+        )
+
+        assert [job["title"] for job in jobs] == ["Backend Engineer", "SRE"]
+        second_prompt = mock_generate.call_args_list[1][0][0]
+        assert "/jobs/4" in second_prompt
+        assert INTRO.strip() not in second_prompt
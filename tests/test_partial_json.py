@@ -0,0 +1,123 @@
+"""Tests for openjobs.partial_json module and truncation handling."""
+
+import json
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from openjobs.extraction_format import parse_partial_jobs
+from openjobs.partial_json import parse_partial_json
+
+
+def _gemini_response(text, finish_reason='STOP'):
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {
+        'candidates': [{'content': {'parts': [{'text': text}]}, 'finishReason': finish_reason}]
+    }
+    return response
+
+
+class TestParsePartialJson:
+    """Tests for parse_partial_json function."""
+
+    def test_complete_value(self):
+        """Test complete JSON parses like json.loads."""
+        assert parse_partial_json('Here: {"a": [1, 2], "b": null}') == ({"a": [1, 2], "b": None}, True)
+
+    def test_truncated_array_keeps_complete_objects(self):
+        """Test a half-written object at the end is dropped."""
+        parsed = parse_partial_json('[{"title": "A"}, {"title": "B", "location": "Re')
+        assert parsed.value == [{"title": "A"}]
+        assert parsed.complete is False
+
+    def test_truncated_object_keeps_partial_members(self):
+        """Test complete members and partial nested arrays are kept."""
+        parsed = parse_partial_json('{"category": "Data", "tech_stack": ["Python", "SQL", "Sp')
+        assert parsed.value == {"category": "Data", "tech_stack": ["Python", "SQL"]}
+
+    def test_truncated_scalars_dropped(self):
+        """Test numbers and literals cut at the end are not trusted."""
+        assert parse_partial_json('[1, 2, 3').value == [1, 2]
+        assert parse_partial_json('{"a": tr').value == {}
+        assert parse_partial_json('["a\\"b", "c').value == ['a"b']
+
+    def test_no_json(self):
+        """Test text without JSON yields None."""
+        assert parse_partial_json('no json here') == (None, False)
+
+    def test_malformed_raises(self):
+        """Test malformed JSON before the end is still an error."""
+        with pytest.raises(json.JSONDecodeError):
+            parse_partial_json('[1 2]')
+
+    def test_compact_rows(self):
+        """Test truncated compact output keeps tables and complete rows."""
+        text = '```json\n{"d": ["Eng"], "l": ["Remote"], "j": [["A", 0, 0, null], ["B", 0'
+        jobs, complete = parse_partial_jobs(text)
+        assert jobs == [{"title": "A", "department": "Eng", "location": "Remote", "url": None}]
+        assert complete is False
+
+
+class TestExtractionContinuation:
+    """Tests for MAX_TOKENS handling in extract_jobs_from_markdown."""
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_continuation_requests_remaining_jobs(self, mock_post):
+        """Test a truncated response is kept and followed by a continuation."""
+        from openjobs.scraper import extract_jobs_from_markdown
+        mock_post.side_effect = [
+            _gemini_response('[{"title": "Engineer"}, {"title": "Designer"}, {"tit', 'MAX_TOKENS'),
+            _gemini_response('[{"title": "Designer"}, {"title": "Analyst"}]'),
+        ]
+
+        markdown = "# Careers\n\n- Engineer\n- Designer\n- Analyst\n- Product Manager"
+        jobs = extract_jobs_from_markdown(markdown, api_key='test-key', output_format='json')
+
+        assert [j['title'] for j in jobs] == ['Engineer', 'Designer', 'Analyst']
+        assert mock_post.call_count == 2
+        follow_up = mock_post.call_args[1]['json']['contents'][0]['parts'][0]['text']
+        assert 'already extracted' in follow_up
+        assert '- Designer' in follow_up
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_no_continuation_without_progress(self, mock_post):
+        """Test continuation stops when a capped response adds no new jobs."""
+        from openjobs.scraper import extract_jobs_from_markdown
+        mock_post.return_value = _gemini_response('[{"title": "Engineer"}, {"ti', 'MAX_TOKENS')
+
+        markdown = "# Careers\n\n- Engineer\n- Designer\n- Analyst\n- Product Manager"
+        jobs = extract_jobs_from_markdown(markdown, api_key='test-key', output_format='json')
+
+        assert jobs == [{"title": "Engineer"}]
+        assert mock_post.call_count == 2
+
+
+class TestCallGeminiContinuation:
+    """Tests for MAX_TOKENS handling in processor._call_gemini."""
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    @patch('openjobs.processor.gemini_keys')
+    def test_continuation_joined(self, mock_limiter, mock_post):
+        """Test the continuation text is appended to the cut-off answer."""
+        from openjobs.processor import _call_gemini
+        mock_post.side_effect = [
+            _gemini_response('{"category": "Data", "tech_stack": ["Pyt', 'MAX_TOKENS'),
+            _gemini_response('hon"]}'),
+        ]
+
+        assert _call_gemini('prompt', api_key='test-key') == {"category": "Data", "tech_stack": ["Python"]}
+        contents = mock_post.call_args[1]['json']['contents']
+        assert contents[1] == {"role": "model", "parts": [{"text": '{"category": "Data", "tech_stack": ["Pyt'}]}
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    @patch('openjobs.processor.gemini_keys')
+    def test_misaligned_continuation_keeps_partial(self, mock_limiter, mock_post):
+        """Test a continuation that repeats the answer falls back to the complete fields."""
+        from openjobs.processor import _call_gemini
+        mock_post.side_effect = [
+            _gemini_response('{"category": "Data", "tech_stack": ["Pyt', 'MAX_TOKENS'),
+            _gemini_response('{"category": "Data"}'),
+        ]
+
+        assert _call_gemini('prompt', api_key='test-key') == {"category": "Data", "tech_stack": []}
@@ -0,0 +1,138 @@
+"""Tests for openjobs.pipeline module."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from openjobs.pipeline import Pipeline, Stage, build_careers_pipeline, run_careers_pipeline
+from openjobs.scrape_result import ScrapeResult
+
+
+class TestPipeline:
+    """Tests for Pipeline and Stage."""
+
+    def test_fan_out_and_drop(self):
+        """Test stages can emit several items or none."""
+        pipeline = Pipeline([
+            Stage("split", lambda x: [x] * x, workers=2),
+            Stage("odd", lambda x: [x] if x % 2 else [], workers=3),
+        ])
+        assert sorted(pipeline.run([1, 2, 3])) == [1, 3, 3, 3]
+
+        split, odd = pipeline.metrics()
+        assert (split.processed, split.emitted) == (3, 6)
+        assert (odd.processed, odd.emitted) == (6, 4)
+
+    def test_errors_counted_and_skipped(self):
+        """Test a failing item is logged and counted without stopping the run."""
+        def fragile(x):
+            if x == 2:
+                raise RuntimeError("boom")
+            return [x]
+
+        pipeline = Pipeline([Stage("fragile", fragile)])
+        assert sorted(pipeline.run([1, 2, 3])) == [1, 3]
+        assert pipeline.metrics()[0].errors == 1
+
+    def test_bounded_queue_applies_backpressure(self):
+        """Test a slow stage keeps its input queue at the configured bound."""
+        pipeline = Pipeline([
+            Stage("fast", lambda x: [x], workers=1),
+            Stage("slow", lambda x: time.sleep(0.01) or [x], workers=1, queue_size=2),
+        ])
+        assert len(list(pipeline.run(range(20)))) == 20
+
+        fast, slow = pipeline.metrics()
+        assert slow.max_queue_depth <= 2
+        assert pipeline.bottleneck().name == "slow"
+        assert slow.utilization > fast.utilization
+
+    def test_stage_concurrency(self):
+        """Test a stage runs up to its worker count at once."""
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def track(x):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return [x]
+
+        list(Pipeline([Stage("io", track, workers=3)]).run(range(9)))
+        assert peak[0] == 3
+
+    def test_feed_error_is_raised(self):
+        """Test an error from the input iterable ends the run instead of hanging it."""
+        def items():
+            yield 1
+            raise RuntimeError("bad input")
+
+        pipeline = Pipeline([Stage("echo", lambda x: [x], workers=2)])
+        outputs = []
+        with pytest.raises(RuntimeError, match="bad input"):
+            for output in pipeline.run(items()):
+                outputs.append(output)
+        assert outputs == [1]
+
+    def test_closing_early_cancels(self):
+        """Test stopping iteration stops feeding and lets every stage thread exit."""
+        fed = []
+
+        def items():
+            for x in range(1000):
+                fed.append(x)
+                yield x
+
+        pipeline = Pipeline([Stage("slow", lambda x: time.sleep(0.001) or [x], workers=2, queue_size=2)])
+        results = pipeline.run(items())
+        assert next(results) is not None
+        results.close()
+
+        def running():
+            return [t for t in threading.enumerate() if t.name.startswith(("openjobs-slow", "openjobs-feeder"))]
+
+        deadline = time.time() + 2
+        while running() and time.time() < deadline:
+            time.sleep(0.01)
+        assert running() == []
+        assert len(fed) < 1000
+
+    def test_requires_stages(self):
+        """Test an empty pipeline is rejected."""
+        with pytest.raises(ValueError):
+            Pipeline([])
+
+
+class TestCareersPipeline:
+    """Tests for build_careers_pipeline and run_careers_pipeline."""
+
+    @patch('openjobs.pipeline.process_job', side_effect=lambda job, enrich, api_key: dict(job, category="Data"))
+    @patch('openjobs.pipeline.extract_jobs_from_markdown')
+    @patch('openjobs.pipeline.scrape_with_firecrawl')
+    @patch('openjobs.scraper.is_valid_url', return_value=(True, "OK"))
+    def test_end_to_end(self, mock_valid, mock_scrape, mock_extract, mock_process):
+        """Test URLs flow through render, extract, details and enrich."""
+        mock_scrape.side_effect = lambda url, api_key=None: ScrapeResult(url=url, content="# Jobs")
+        mock_extract.return_value = [{"title": "Engineer"}, {"title": "Analyst"}]
+
+        pipeline = build_careers_pipeline(detail_fetcher=lambda job: dict(job, description="d"))
+        jobs = list(pipeline.run(["acme.com/careers", "globex.com/jobs", ""]))
+
+        assert len(jobs) == 4
+        assert {j["company"] for j in jobs} == {"acme", "globex"}
+        assert all(j["description"] == "d" for j in jobs)
+        assert [m.name for m in pipeline.metrics()] == ["render", "extract", "details", "enrich"]
+        assert pipeline.metrics()[0].processed == 3
+
+    @patch('openjobs.pipeline.process_job', side_effect=lambda job, enrich, api_key: dict(job, category="Sales"))
+    @patch('openjobs.pipeline.extract_jobs_from_markdown', return_value=[{"title": "Engineer"}])
+    @patch('openjobs.pipeline.scrape_with_firecrawl')
+    @patch('openjobs.scraper.is_valid_url', return_value=(True, "OK"))
+    def test_filter_categories(self, mock_valid, mock_scrape, mock_extract, mock_process):
+        """Test jobs outside filter_categories are dropped."""
+        mock_scrape.return_value = ScrapeResult(url="x", content="# Jobs")
+        assert run_careers_pipeline(["acme.com"], filter_categories=["Data"]) == []
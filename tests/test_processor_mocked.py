@@ -9,26 +9,16 @@ from openjobs.processor import (
     classify_job,
     enhance_job_output,
     _call_gemini,
-    RateLimiter,
     ALLOWED_CATEGORIES,
     ALLOWED_TECH_STACKS,
 )
 
 
-class TestRateLimiterProcessor:
-    """Tests for processor's RateLimiter."""
-
-    def test_rate_limiter_creation(self):
-        """Test rate limiter initialization."""
-        limiter = RateLimiter(requests_per_minute=60)
-        assert limiter.requests_per_minute == 60
-
-
 class TestCallGeminiMocked:
     """Mocked tests for _call_gemini."""
 
-    @patch('openjobs.processor.requests.post')
-    @patch('openjobs.processor.gemini_rate_limiter')
+    @patch('openjobs.gemini_client.default_client.session.post')
+    @patch('openjobs.processor.gemini_keys')
     def test_successful_call(self, mock_limiter, mock_post):
         """Test successful Gemini API call."""
         mock_response = MagicMock()
@@ -48,8 +38,8 @@ class TestCallGeminiMocked:
 
         assert result == {'category': 'Software Engineering'}
 
-    @patch('openjobs.processor.requests.post')
-    @patch('openjobs.processor.gemini_rate_limiter')
+    @patch('openjobs.gemini_client.default_client.session.post')
+    @patch('openjobs.processor.gemini_keys')
     def test_call_with_markdown_response(self, mock_limiter, mock_post):
         """Test handling of markdown-wrapped JSON response."""
         mock_response = MagicMock()
@@ -69,8 +59,8 @@ class TestCallGeminiMocked:
 
         assert result == {'result': 'value'}
 
-    @patch('openjobs.processor.requests.post')
-    @patch('openjobs.processor.gemini_rate_limiter')
+    @patch('openjobs.gemini_client.default_client.session.post')
+    @patch('openjobs.processor.gemini_keys')
     def test_call_api_error(self, mock_limiter, mock_post):
         """Test handling of API error."""
         mock_response = MagicMock()
@@ -88,8 +78,8 @@ class TestCallGeminiMocked:
             result = _call_gemini('Test prompt')
             assert result is None
 
-    @patch('openjobs.processor.requests.post')
-    @patch('openjobs.processor.gemini_rate_limiter')
+    @patch('openjobs.gemini_client.default_client.session.post')
+    @patch('openjobs.processor.gemini_keys')
     def test_call_invalid_json(self, mock_limiter, mock_post):
         """Test handling of invalid JSON response."""
         mock_response = MagicMock()
@@ -109,8 +99,8 @@ class TestCallGeminiMocked:
 
         assert result is None
 
-    @patch('openjobs.processor.requests.post')
-    @patch('openjobs.processor.gemini_rate_limiter')
+    @patch('openjobs.gemini_client.default_client.session.post')
+    @patch('openjobs.processor.gemini_keys')
     def test_call_empty_candidates(self, mock_limiter, mock_post):
         """Test handling of empty candidates."""
         mock_response = MagicMock()
@@ -330,3 +320,85 @@ class TestProcessJobsMocked:
         )
 
         assert len(result) == 2
+
+
+class TestFieldSelection:
+    """Tests for fields= in enhance_job_output, process_job and process_jobs."""
+
+    @patch('openjobs.processor._call_gemini')
+    def test_enhance_asks_for_requested_fields_only(self, mock_gemini):
+        """Test a subset gets a minimal prompt and response schema."""
+        mock_gemini.return_value = {'remote_type': 'Hybrid', 'benefits': ['Gym']}
+
+        result = enhance_job_output('Engineer', 'Description', fields=['remote_type'])
+
+        assert result == {'remote_type': 'Hybrid'}
+        kwargs = mock_gemini.call_args[1]
+        assert '- remote_type:' in kwargs['prefix']
+        assert 'benefits' not in kwargs['prefix']
+        assert list(kwargs['response_schema']['properties']) == ['remote_type']
+
+    def test_unknown_field(self):
+        """Test unknown field names are rejected."""
+        with pytest.raises(ValueError):
+            enhance_job_output('Engineer', 'Description', fields=['salary'])
+        with pytest.raises(ValueError):
+            process_job({'title': 'Engineer'}, fields=['salary'])
+
+    @patch('openjobs.processor.enhance_job_output')
+    @patch('openjobs.processor.classify_job')
+    def test_local_fields_skip_calls(self, mock_classify, mock_enhance):
+        """Test fields stated in the title and location need no API call."""
+        job = {'title': 'Marketing Intern', 'location': 'Remote - EU', 'description': 'Help our team.'}
+
+        result = process_job(job, fields=['remote_type', 'contract_type'])
+
+        assert result['remote_type'] == 'Remote'
+        assert result['contract_type'] == 'Internship'
+        assert 'category' not in result
+        assert not mock_classify.called
+        assert not mock_enhance.called
+
+    @patch('openjobs.processor.enhance_job_output')
+    @patch('openjobs.processor.classify_job')
+    def test_category_and_remote_type(self, mock_classify, mock_enhance):
+        """Test classification plus a one-field enhancement call."""
+        mock_classify.return_value = {'category': 'Data', 'subcategory': 'Data Engineer', 'similar_job_title': 'DE'}
+        mock_enhance.return_value = {'remote_type': 'Hybrid'}
+        job = {'title': 'Data Engineer', 'location': 'Berlin', 'description': 'Two days in the office.'}
+
+        result = process_job(job, fields=['category', 'remote_type'])
+
+        assert mock_enhance.call_args[1]['fields'] == ['remote_type']
+        assert result['category'] == 'Data'
+        assert result['remote_type'] == 'Hybrid'
+        assert 'tech_stack' not in result and 'subcategory' not in result
+        assert result['location'] == 'Berlin'
+
+    @patch('openjobs.processor.enhance_job_output')
+    @patch('openjobs.processor.classify_job')
+    def test_filter_adds_category(self, mock_classify, mock_enhance):
+        """Test process_jobs classifies when filtering by category."""
+        mock_classify.return_value = {'category': 'Data', 'subcategory': 'ML', 'similar_job_title': 'DS'}
+        jobs = [{'title': 'Data Scientist (Remote)', 'description': 'Models.'}]
+
+        result = process_jobs(jobs, fields=['remote_type'], filter_categories=['Data'])
+
+        assert [(job['category'], job['remote_type']) for job in result] == [('Data', 'Remote')]
+        assert not mock_enhance.called
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    @patch('openjobs.processor.gemini_keys')
+    def test_response_schema_in_payload(self, mock_limiter, mock_post):
+        """Test the response schema is sent as JSON generation config."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'candidates': [{'content': {'parts': [{'text': '{"remote_type": "Remote"}'}]}}]}
+        mock_post.return_value = mock_response
+        schema = {'type': 'OBJECT', 'properties': {'remote_type': {'type': 'STRING'}}}
+
+        _call_gemini('Test prompt', api_key='test-key', response_schema=schema)
+
+        config = mock_post.call_args[1]['json']['generationConfig']
+        assert config['responseMimeType'] == 'application/json'
+        assert config['responseSchema'] == schema
@@ -0,0 +1,94 @@
+"""Tests for openjobs.prompt_compaction module."""
+
+from unittest.mock import patch, MagicMock
+
+from openjobs.prompt_compaction import (
+    compact_links,
+    compact_markdown,
+    prune_boilerplate,
+    restore_links,
+)
+
+LONG_URL = "https://jobs.example.com/postings/123456?utm_source=careers&utm_medium=web&gh_src=abc"
+
+
+class TestPruneBoilerplate:
+    """Tests for prune_boilerplate function."""
+
+    def test_drops_repeated_blocks(self):
+        """Test a nav block repeated in the footer is kept only once."""
+        nav = "[Home](/) [About](/about) [Blog](/blog)"
+        markdown = f"{nav}\n\n## Open roles\n- Backend Engineer\n\n{nav}"
+        assert prune_boilerplate(markdown) == f"{nav}\n\n## Open roles\n- Backend Engineer"
+
+    def test_drops_cookie_banner(self):
+        """Test cookie and copyright blocks are removed."""
+        markdown = "We use cookies. Accept all?\n\n- Designer\n\n© 2025 Acme. All rights reserved."
+        assert prune_boilerplate(markdown) == "- Designer"
+
+    def test_keeps_boilerplate_block_with_jobs(self):
+        """Test a block with job keywords survives even if it mentions privacy."""
+        markdown = "Senior Engineer - read our privacy policy before applying"
+        assert prune_boilerplate(markdown) == markdown
+
+    def test_removes_images(self):
+        """Test image markdown is dropped."""
+        assert prune_boilerplate("![logo](https://cdn.example.com/logo.png)\n\n- Analyst") == "- Analyst"
+
+    def test_empty(self):
+        """Test empty input."""
+        assert prune_boilerplate("") == ""
+
+
+class TestCompactLinks:
+    """Tests for compact_links and restore_links."""
+
+    def test_long_links_replaced(self):
+        """Test long link targets become reference IDs."""
+        result = compact_links(f"- [Engineer]({LONG_URL})\n- [Designer](/jobs/2)")
+        assert result.text == "- [Engineer](L1)\n- [Designer](/jobs/2)"
+        assert result.links == {"L1": LONG_URL}
+        assert result.saved_chars > 0
+
+    def test_same_url_same_id(self):
+        """Test repeated URLs share one ID, including bare URLs."""
+        result = compact_links(f"[Apply]({LONG_URL}) or visit {LONG_URL}")
+        assert result.text == "[Apply](L1) or visit L1"
+        assert len(result.links) == 1
+
+    def test_restore_links(self):
+        """Test reference IDs in extracted jobs map back to URLs."""
+        jobs = [{"title": "Engineer", "url": "L1"}, {"title": "Designer", "url": "(L2)"},
+                {"title": "PM", "url": "/jobs/3"}, {"title": "Ops"}]
+        restore_links(jobs, {"L1": LONG_URL, "L2": "https://x.com/2"})
+        assert [j.get("url") for j in jobs] == [LONG_URL, "https://x.com/2", "/jobs/3", None]
+
+    def test_compact_markdown_reports_total_savings(self):
+        """Test compact_markdown counts pruned and shortened chars."""
+        markdown = f"Cookie settings\n\n- [Engineer]({LONG_URL})"
+        result = compact_markdown(markdown)
+        assert result.original_chars == len(markdown)
+        assert result.text == "- [Engineer](L1)"
+
+
+class TestExtractionUsesCompaction:
+    """Tests for compaction inside extract_jobs_from_markdown."""
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_reference_ids_mapped_back(self, mock_post):
+        """Test Gemini sees reference IDs and jobs get the real URL back."""
+        from openjobs.scraper import extract_jobs_from_markdown
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            'candidates': [{'content': {'parts': [{'text': '[{"title": "Engineer", "url": "L1"}]'}]}}]
+        }
+        mock_post.return_value = mock_response
+
+        markdown = f"# Careers\n\n- [Engineer]({LONG_URL}) - Remote\n\nWe use cookies."
+        jobs = extract_jobs_from_markdown(markdown, api_key='test-key')
+
+        prompt = mock_post.call_args[1]['json']['contents'][0]['parts'][0]['text']
+        assert LONG_URL not in prompt
+        assert 'cookies' not in prompt
+        assert jobs[0]['url'] == LONG_URL
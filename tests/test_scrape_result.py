@@ -0,0 +1,67 @@
+"""Tests for openjobs.scrape_result module."""
+
+from unittest.mock import patch
+
+from openjobs.scrape_result import (
+    CONTENT_HTML,
+    CONTENT_MARKDOWN,
+    RAW_HTML_MARKER,
+    ScrapeAttempt,
+    ScrapeResult,
+)
+
+
+class TestScrapeResult:
+    """Tests for ScrapeResult."""
+
+    def test_truthiness_follows_content(self):
+        """Test empty results are falsy like the old empty string."""
+        assert not ScrapeResult(url='https://example.com')
+        assert ScrapeResult(url='https://example.com', content='# Jobs')
+
+    def test_len_is_content_length(self):
+        """Test len() reports content length."""
+        assert len(ScrapeResult(url='', content='abc')) == 3
+
+    def test_attempt_totals(self):
+        """Test per-attempt timings and sizes are summed."""
+        result = ScrapeResult(url='', attempts=[
+            ScrapeAttempt('firecrawl', 100, 500),
+            ScrapeAttempt('firecrawl_scroll', 250, 1500),
+        ])
+        assert result.duration_ms == 350
+        assert result.chars_fetched == 2000
+
+    def test_to_text_adds_marker_for_html(self):
+        """Test HTML results round-trip through the legacy string form."""
+        result = ScrapeResult(url='', content='<html></html>', content_type=CONTENT_HTML)
+        assert result.to_text() == f"{RAW_HTML_MARKER}<html></html>"
+        assert ScrapeResult(url='', content='# Jobs').to_text() == '# Jobs'
+
+    def test_from_text_detects_marker(self):
+        """Test legacy strings are wrapped with the right content type."""
+        html = ScrapeResult.from_text('<!-- RAW_HTML -->\n<html></html>')
+        assert html.is_html is True
+        assert html.content == '<html></html>'
+
+        markdown = ScrapeResult.from_text('# Jobs')
+        assert markdown.content_type == CONTENT_MARKDOWN
+        assert ScrapeResult.from_text(None).content == ''
+
+
+class TestExtractFromScrapeResult:
+    """Tests for passing ScrapeResult to extract_jobs_from_markdown."""
+
+    @patch('openjobs.scraper._extract_embedded_jobs')
+    def test_streamed_embedded_jobs_skip_rescan(self, mock_extract):
+        """Test jobs found while streaming are used without re-scanning the HTML."""
+        from openjobs.scraper import extract_jobs_from_markdown
+        result = ScrapeResult(
+            url='', content='<html>' * 20, content_type=CONTENT_HTML,
+            embedded_jobs=[{'title': 'Engineer'}]
+        )
+
+        jobs = extract_jobs_from_markdown(result)
+
+        assert jobs == [{'title': 'Engineer'}]
+        mock_extract.assert_not_called()
@@ -8,32 +8,14 @@ from openjobs.scraper import (
     scrape_careers_page,
     scrape_with_firecrawl,
     extract_jobs_from_markdown,
-    RateLimiter,
 )
 
 
-class TestRateLimiter:
-    """Tests for RateLimiter class."""
-
-    def test_rate_limiter_creation(self):
-        """Test rate limiter can be created."""
-        limiter = RateLimiter(requests_per_minute=10)
-        assert limiter.requests_per_minute == 10
-        assert limiter.requests == []
-
-    def test_rate_limiter_wait_under_limit(self):
-        """Test wait() doesn't block when under limit."""
-        limiter = RateLimiter(requests_per_minute=100)
-        # Should not block
-        limiter.wait()
-        assert len(limiter.requests) == 1
-
-
 class TestScrapeWithFirecrawlMocked:
     """Mocked tests for scrape_with_firecrawl."""
 
-    @patch('openjobs.scraper.post_json_with_retry')
-    @patch('openjobs.scraper.firecrawl_rate_limiter')
+    @patch('openjobs.scraper.requests.post')
+    @patch('openjobs.scraper.firecrawl_keys')
     def test_successful_scrape(self, mock_limiter, mock_post):
         """Test successful Firecrawl scrape with enough job content."""
         # Content needs:
@@ -104,7 +86,8 @@ class TestScrapeWithFirecrawlMocked:
         We offer competitive compensation, equity, and a flexible work environment.
         Join a team of passionate individuals who love what they do.
         '''
-        mock_post.return_value = {
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.json.return_value = {
             'data': {
                 'markdown': mock_content
             }
@@ -112,34 +95,40 @@ class TestScrapeWithFirecrawlMocked:
 
         result = scrape_with_firecrawl('https://example.com/careers')
 
-        assert 'Software Engineer' in result
+        assert 'Software Engineer' in result.content
+        assert result.tier == 'firecrawl'
+        assert result.score.has_jobs is True
+        assert len(result.attempts) == 1
         mock_post.assert_called_once()
 
-    @patch('openjobs.scraper.post_json_with_retry')
-    @patch('openjobs.scraper.firecrawl_rate_limiter')
+    @patch('openjobs.scraper.requests.post')
+    @patch('openjobs.scraper.firecrawl_keys')
     def test_empty_response(self, mock_limiter, mock_post):
         """Test handling of empty Firecrawl response."""
-        mock_post.return_value = {}
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.json.return_value = {}
 
         result = scrape_with_firecrawl('https://example.com/careers')
 
-        assert result == ''
+        assert not result
+        assert result.content == ''
 
-    @patch('openjobs.scraper.post_json_with_retry')
-    @patch('openjobs.scraper.firecrawl_rate_limiter')
+    @patch('openjobs.scraper.requests.post')
+    @patch('openjobs.scraper.firecrawl_keys')
     def test_exception_handling(self, mock_limiter, mock_post):
         """Test exception handling in scrape."""
         mock_post.side_effect = Exception("Network error")
 
         result = scrape_with_firecrawl('https://example.com/careers')
 
-        assert result == ''
+        assert not result
+        assert result.content == ''
 
 
 class TestExtractJobsFromMarkdownMocked:
     """Mocked tests for extract_jobs_from_markdown."""
 
-    @patch('openjobs.scraper.requests.post')
+    @patch('openjobs.gemini_client.default_client.session.post')
     def test_successful_extraction(self, mock_post):
         """Test successful job extraction from markdown."""
         mock_response = MagicMock()
@@ -165,7 +154,7 @@ class TestExtractJobsFromMarkdownMocked:
         assert len(result) == 1
         assert result[0]['title'] == 'Engineer'
 
-    @patch('openjobs.scraper.requests.post')
+    @patch('openjobs.gemini_client.default_client.session.post')
     def test_extraction_with_markdown_code_block(self, mock_post):
         """Test extraction handles markdown code blocks in response."""
         mock_response = MagicMock()
@@ -188,7 +177,7 @@ class TestExtractJobsFromMarkdownMocked:
         assert len(result) == 1
         assert result[0]['title'] == 'Designer'
 
-    @patch('openjobs.scraper.requests.post')
+    @patch('openjobs.gemini_client.default_client.session.post')
     def test_extraction_api_error(self, mock_post):
         """Test handling of API error response."""
         mock_response = MagicMock()
@@ -216,7 +205,7 @@ class TestExtractJobsFromMarkdownMocked:
         result = extract_jobs_from_markdown('Hi')
         assert result == []
 
-    @patch('openjobs.scraper.requests.post')
+    @patch('openjobs.gemini_client.default_client.session.post')
     def test_extraction_invalid_json(self, mock_post):
         """Test handling of invalid JSON in response."""
         mock_response = MagicMock()
@@ -236,7 +225,7 @@ class TestExtractJobsFromMarkdownMocked:
 
         assert result == []
 
-    @patch('openjobs.scraper.requests.post')
+    @patch('openjobs.gemini_client.default_client.session.post')
     def test_extraction_filters_invalid_jobs(self, mock_post):
         """Test that jobs without titles are filtered out."""
         mock_response = MagicMock()
@@ -468,29 +457,70 @@ class TestDiscoverCareersUrlMocked:
 
 
 class TestFetchRawHtmlMocked:
-    """Mocked tests for _fetch_raw_html function."""
+    """Mocked tests for fetch_raw_html function."""
 
     @patch('openjobs.scraper.requests.get')
     def test_successful_fetch(self, mock_get):
         """Test successful raw HTML fetch."""
-        from openjobs.scraper import _fetch_raw_html
+        from openjobs.scraper import fetch_raw_html
         mock_response = MagicMock()
-        mock_response.text = '<html><body>Content</body></html>'
+        mock_response.iter_content.return_value = [b'<html><body>', b'Content</body></html>']
+        mock_response.encoding = 'utf-8'
         mock_response.raise_for_status = MagicMock()
         mock_get.return_value = mock_response
 
-        result = _fetch_raw_html('https://example.com')
+        result = fetch_raw_html('https://example.com')
 
         assert '<body>Content</body>' in result
         mock_get.assert_called_once()
+        assert mock_get.call_args[1]['stream'] is True
+        assert 'gzip' in mock_get.call_args[1]['headers']['Accept-Encoding']
+        mock_response.close.assert_called_once()
+
+    @patch('openjobs.scraper.requests.get')
+    def test_fetch_truncates_at_max_bytes(self, mock_get):
+        """Test body is capped at max_bytes."""
+        from openjobs.scraper import fetch_raw_html
+        mock_response = MagicMock()
+        mock_response.iter_content.return_value = iter([b'a' * 600, b'b' * 600, b'c' * 600])
+        mock_response.encoding = 'utf-8'
+        mock_get.return_value = mock_response
+
+        result = fetch_raw_html('https://example.com', max_bytes=1000)
+
+        assert len(result) == 1000
+        assert result.endswith('b')
+
+    @patch('openjobs.scraper.requests.get')
+    def test_fetch_stops_after_complete_jobs_payload(self, mock_get):
+        """Test streaming stops once an embedded jobs array has closed."""
+        from openjobs.scraper import fetch_raw_html
+        consumed = []
+
+        def chunks():
+            for chunk in [b'<script>var d = {"jobs": [{"title": "Desi',
+                          b'gner"}, {"title": "Developer"}]};</script>',
+                          b'<div>' + b'x' * 1000 + b'</div>']:
+                consumed.append(chunk)
+                yield chunk
+
+        mock_response = MagicMock()
+        mock_response.iter_content.return_value = chunks()
+        mock_response.encoding = 'utf-8'
+        mock_get.return_value = mock_response
+
+        result = fetch_raw_html('https://example.com')
+
+        assert len(consumed) == 2
+        assert '"Developer"' in result
 
     @patch('openjobs.scraper.requests.get')
     def test_fetch_failure(self, mock_get):
         """Test failed fetch returns empty string."""
-        from openjobs.scraper import _fetch_raw_html
+        from openjobs.scraper import fetch_raw_html
         mock_get.side_effect = Exception("Network error")
 
-        result = _fetch_raw_html('https://example.com')
+        result = fetch_raw_html('https://example.com')
 
         assert result == ''
 
@@ -511,7 +541,7 @@ class TestHtmlFallbackPath:
         assert result[0]['title'] == 'Test Job'
         mock_extract.assert_called_once()
 
-    @patch('openjobs.scraper.requests.post')
+    @patch('openjobs.gemini_client.default_client.session.post')
     @patch('openjobs.scraper._extract_embedded_jobs')
     def test_html_falls_back_to_gemini_when_no_embedded_jobs(self, mock_extract, mock_post):
         """Test HTML falls back to Gemini when embedded extraction fails."""
@@ -530,3 +560,61 @@ class TestHtmlFallbackPath:
 
         assert len(result) == 1
         assert result[0]['title'] == 'Gemini Job'
+
+
+class TestEmbeddedJobsScanner:
+    """Tests for _EmbeddedJobsScanner streaming detection."""
+
+    def test_marker_split_across_chunks(self):
+        """Test a jobs marker split between chunks is still found."""
+        from openjobs.scraper import _EmbeddedJobsScanner
+        scanner = _EmbeddedJobsScanner()
+        assert scanner.feed(b'<script>{"jo') is False
+        assert scanner.feed(b'bs": [{"title": "Engineer", "tags": ["a"]}]}') is True
+        assert scanner.jobs[0]['title'] == 'Engineer'
+
+    def test_escaped_json_payload(self):
+        """Test escaped React/Next.js payloads are detected."""
+        from openjobs.scraper import _EmbeddedJobsScanner
+        scanner = _EmbeddedJobsScanner()
+        html = b'self.__next_f.push({\\"jobs\\":[{\\"title\\":\\"Engineer\\"}],\\"other\\":1})'
+        assert scanner.feed(html) is True
+        assert scanner.jobs[0]['title'] == 'Engineer'
+
+    def test_unparseable_array_keeps_scanning(self):
+        """Test an array without job titles does not stop the stream."""
+        from openjobs.scraper import _EmbeddedJobsScanner
+        scanner = _EmbeddedJobsScanner()
+        assert scanner.feed(b'{"jobs": []} <p>text</p>') is False
+        assert scanner.feed(b'{"jobs": [{"title": "Analyst"}]}') is True
+
+
+class TestRawHtmlEarlyExitFallback:
+    """Tests for the raw HTML tier when the fetch stops on a jobs payload."""
+
+    @patch('openjobs.scraper._fetch_raw_html_streamed')
+    @patch('openjobs.scraper.firecrawl_request')
+    @patch('openjobs.scraper.firecrawl_keys')
+    def test_short_html_with_jobs_payload_is_kept(self, mock_limiter, mock_firecrawl, mock_fetch):
+        """Test HTML under 5,000 chars is kept when it carries a complete jobs array."""
+        mock_firecrawl.return_value = ''
+        html = '<script>{"jobs": [{"title": "Engineer", "tags": ["a"]}]}</script>'
+        mock_fetch.return_value = (html, [{'title': 'Engineer'}])
+
+        result = scrape_with_firecrawl('https://example.com/careers')
+
+        assert result.is_html
+        assert result.tier == 'raw_html'
+        assert result.embedded_jobs == [{'title': 'Engineer'}]
+        jobs = extract_jobs_from_markdown(result.to_text(), api_key='test-key')
+        assert [j['title'] for j in jobs] == ['Engineer']
+
+    @patch('openjobs.scraper._fetch_raw_html_streamed')
+    @patch('openjobs.scraper.firecrawl_request')
+    @patch('openjobs.scraper.firecrawl_keys')
+    def test_short_html_without_jobs_is_dropped(self, mock_limiter, mock_firecrawl, mock_fetch):
+        """Test short HTML without an embedded payload is still rejected."""
+        mock_firecrawl.return_value = ''
+        mock_fetch.return_value = ('<html><body>Hi</body></html>', [])
+
+        assert not scrape_with_firecrawl('https://example.com/careers')
@@ -0,0 +1,94 @@
+"""Tests for speculative extraction in scrape_careers_page."""
+
+import threading
+from unittest.mock import patch
+
+from openjobs.scrape_result import TIER_FIRECRAWL, TIER_FIRECRAWL_SCROLL
+from openjobs.scraper import _count_validated_jobs, scrape_careers_page
+
+TITLES = ["Backend Engineer", "Product Designer", "Data Analyst", "Account Executive", "Recruiter"]
+FIRST = "# Careers\n\n" + "\n".join(f"- {t}" for t in TITLES)
+RETRY = FIRST + "\n" + "\n".join(f"- Engineer {i}" for i in range(10)) + "\n" + "x" * 2000
+
+
+def _jobs(titles):
+    return [{"title": t} for t in titles]
+
+
+class TestCountValidatedJobs:
+    """Tests for _count_validated_jobs."""
+
+    def test_only_titles_on_page_count(self):
+        """Test invented titles do not count as validated."""
+        jobs = _jobs(["Backend  Engineer", "Chief Vibes Officer"])
+        assert _count_validated_jobs(jobs, FIRST) == 1
+
+
+@patch('openjobs.scraper.is_valid_url', return_value=(True, "OK"))
+@patch('openjobs.scraper.firecrawl_keys')
+@patch('openjobs.scraper._fetch_raw_html_streamed', return_value=("", []))
+class TestSpeculativeExtraction:
+    """Tests for _scrape_and_extract_speculative via scrape_careers_page."""
+
+    def test_first_attempt_clear_win_cancels_retry(self, mock_raw, mock_limiter, mock_valid):
+        """Test a clear attempt 1 result returns without waiting for the retry."""
+        release = threading.Event()
+
+        def firecrawl(url, wait_ms, api_key=None, with_scroll=False):
+            if with_scroll:
+                release.wait(5)
+                return RETRY
+            return FIRST
+
+        try:
+            with patch('openjobs.scraper.firecrawl_request', side_effect=firecrawl), \
+                 patch('openjobs.scraper.extract_jobs_from_markdown', return_value=_jobs(TITLES)) as extract:
+                result = scrape_careers_page('https://acme.com/careers', speculative=True)
+
+            assert [j['title'] for j in result] == TITLES
+            assert extract.call_count == 1
+            assert not release.is_set()
+        finally:
+            release.set()
+        mock_raw.assert_not_called()
+
+    def test_retry_wins_with_more_validated_jobs(self, mock_raw, mock_limiter, mock_valid):
+        """Test the retry result is kept when it yields more validated jobs."""
+        def firecrawl(url, wait_ms, api_key=None, with_scroll=False):
+            return RETRY if with_scroll else FIRST
+
+        def extract(page, prompt=None, api_key=None):
+            if page.tier == TIER_FIRECRAWL:
+                return _jobs(TITLES[:1])
+            return _jobs(TITLES + [f"Engineer {i}" for i in range(3)])
+
+        with patch('openjobs.scraper.firecrawl_request', side_effect=firecrawl), \
+             patch('openjobs.scraper.extract_jobs_from_markdown', side_effect=extract):
+            result = scrape_careers_page('https://acme.com/careers', speculative=True)
+
+        assert len(result) == 8
+
+    def test_unchanged_page_is_not_extracted_twice(self, mock_raw, mock_limiter, mock_valid):
+        """Test the speculative result is reused when the retry was not better."""
+        def firecrawl(url, wait_ms, api_key=None, with_scroll=False):
+            return "" if with_scroll else FIRST
+
+        with patch('openjobs.scraper.firecrawl_request', side_effect=firecrawl), \
+             patch('openjobs.scraper.extract_jobs_from_markdown', return_value=_jobs(TITLES[:2])) as extract:
+            result = scrape_careers_page('https://acme.com/careers', speculative=True)
+
+        assert len(result) == 2
+        assert extract.call_count == 1
+        assert extract.call_args[0][0].tier == TIER_FIRECRAWL
+
+    def test_disabled_extracts_final_page_only(self, mock_raw, mock_limiter, mock_valid):
+        """Test speculative=False extracts once, from the final page."""
+        def firecrawl(url, wait_ms, api_key=None, with_scroll=False):
+            return RETRY if with_scroll else FIRST
+
+        with patch('openjobs.scraper.firecrawl_request', side_effect=firecrawl), \
+             patch('openjobs.scraper.extract_jobs_from_markdown', return_value=_jobs(TITLES)) as extract:
+            scrape_careers_page('https://acme.com/careers', speculative=False)
+
+        assert extract.call_count == 1
+        assert extract.call_args[0][0].tier == TIER_FIRECRAWL_SCROLL
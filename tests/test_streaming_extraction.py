@@ -0,0 +1,124 @@
+"""Tests for streamed job extraction (JobStreamDecoder, iter_* generators)."""
+
+import json
+from unittest.mock import patch, MagicMock
+
+from openjobs.extraction_format import JobStreamDecoder
+from openjobs.key_pool import KeyPool
+from openjobs.scraper import iter_careers_page, iter_jobs_from_markdown
+from openjobs.scrape_result import ScrapeResult
+
+MARKDOWN = "# Careers\n\n## Engineering\n- Engineer - Remote\n- Designer - Berlin\n- Analyst"
+
+
+def _sse_response(chunks, finish_reason='STOP'):
+    """Mock a streamGenerateContent response emitting one event per text chunk."""
+    lines = []
+    for i, chunk in enumerate(chunks):
+        candidate = {'content': {'parts': [{'text': chunk}]}}
+        if i == len(chunks) - 1:
+            candidate['finishReason'] = finish_reason
+        lines.extend([f"data: {json.dumps({'candidates': [candidate]})}", ""])
+    response = MagicMock()
+    response.status_code = 200
+    response.iter_lines.return_value = iter(lines)
+    return response
+
+
+class TestJobStreamDecoder:
+    """Tests for JobStreamDecoder."""
+
+    def test_yields_each_object_when_closed(self):
+        """Test jobs come out as soon as their object closes."""
+        decoder = JobStreamDecoder()
+        assert decoder.feed('```json\n[{"title": "Engineer", "url": "/a]"}, {"title"') == [
+            {"title": "Engineer", "url": "/a]"}
+        ]
+        assert decoder.feed(': "Designer"}') == [{"title": "Designer"}]
+        assert decoder.feed(']\n```') == []
+        assert decoder.done
+
+    def test_compact_rows(self):
+        """Test compact rows are decoded with the tables seen earlier."""
+        decoder = JobStreamDecoder()
+        text = '{"d": ["Eng"], "l": ["Remote", "NYC"], "j": [["A", 0, 1, null], ["B", null, 0, "u"]]}'
+        jobs = [job for char in text for job in decoder.feed(char)]
+        assert jobs == [
+            {"title": "A", "department": "Eng", "location": "NYC", "url": None},
+            {"title": "B", "department": None, "location": "Remote", "url": "u"},
+        ]
+
+    def test_skips_malformed_and_untitled(self):
+        """Test entries without titles are dropped."""
+        decoder = JobStreamDecoder()
+        assert decoder.feed('[{"location": "x"}, {"title": ""}, {"title": "PM"}]') == [{"title": "PM"}]
+
+
+class TestIterJobsFromMarkdown:
+    """Tests for iter_jobs_from_markdown."""
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_streams_jobs(self, mock_post):
+        """Test jobs are yielded from the streaming endpoint."""
+        mock_post.return_value = _sse_response(['[{"title": "Engi', 'neer"}, {"title": "Designer"}]'])
+
+        jobs = iter_jobs_from_markdown(MARKDOWN, api_key='test-key', output_format='json')
+        assert next(jobs) == {"title": "Engineer"}
+        assert list(jobs) == [{"title": "Designer"}]
+
+        args, kwargs = mock_post.call_args
+        assert ':streamGenerateContent?alt=sse' in args[0]
+        assert kwargs['stream'] is True
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_continues_after_max_tokens(self, mock_post):
+        """Test a capped stream is followed by a continuation for the rest."""
+        mock_post.side_effect = [
+            _sse_response(['[{"title": "Engineer"}, {"tit'], 'MAX_TOKENS'),
+            _sse_response(['[{"title": "Engineer"}, {"title": "Analyst"}]']),
+        ]
+
+        jobs = list(iter_jobs_from_markdown(MARKDOWN, api_key='test-key', output_format='json'))
+
+        assert [j['title'] for j in jobs] == ['Engineer', 'Analyst']
+        assert mock_post.call_count == 2
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    def test_api_error_yields_nothing(self, mock_post):
+        """Test an error response ends the generator cleanly."""
+        response = MagicMock()
+        response.status_code = 400
+        response.text = 'error'
+        mock_post.return_value = response
+
+        assert list(iter_jobs_from_markdown(MARKDOWN, api_key='test-key')) == []
+        response.close.assert_called_once()
+
+    def test_embedded_jobs_without_api_call(self):
+        """Test embedded JSON jobs are yielded without calling Gemini."""
+        page = ScrapeResult(url='https://x.com', content='<html></html>', content_type='html',
+                            embedded_jobs=[{"title": "Engineer"}])
+        with patch('openjobs.gemini_client.default_client.session.post') as mock_post:
+            assert list(iter_jobs_from_markdown(page)) == [{"title": "Engineer"}]
+            mock_post.assert_not_called()
+
+
+class TestIterCareersPage:
+    """Tests for iter_careers_page."""
+
+    @patch('openjobs.gemini_client.default_client.session.post')
+    @patch('openjobs.scraper.scrape_with_firecrawl')
+    @patch('openjobs.scraper.is_valid_url', return_value=(True, "OK"))
+    def test_yields_formatted_entries(self, mock_valid, mock_scrape, mock_post):
+        """Test entries carry the same fields as scrape_careers_page."""
+        mock_scrape.return_value = ScrapeResult(url='https://acme.com/careers', content=MARKDOWN)
+        mock_post.return_value = _sse_response(['[{"title": "Engineer", "location": "Remote"}]'])
+
+        with patch('openjobs.scraper.gemini_keys', KeyPool(['test-key'])):
+            entries = list(iter_careers_page('acme.com/careers'))
+
+        assert len(entries) == 1
+        assert entries[0]['company'] == 'acme'
+        assert entries[0]['title'] == 'Engineer'
+        assert entries[0]['job_url'] == 'https://acme.com/careers#job-0'
+        assert entries[0]['source_url'] == 'https://acme.com/careers'
@@ -0,0 +1,150 @@
+"""Tests for openjobs.title_classifier module."""
+
+from unittest.mock import patch
+
+from openjobs import title_classifier
+from openjobs.enrichment_cache import EnrichmentCache
+from openjobs.processor import TAXONOMY_VERSION, classify_job, process_job
+from openjobs.title_classifier import (
+    TitleClassifier,
+    evaluate,
+    main,
+    title_features,
+    train_from_examples,
+)
+
+SENIORITY = ["", "Senior ", "Junior ", "Lead ", "Staff ", "Principal "]
+ROLES = {
+    ("Software Engineering", "Backend"): ["Backend Engineer", "Python Developer", "Java Developer", "API Engineer"],
+    ("Software Engineering", "Frontend"): ["Frontend Engineer", "React Developer", "UI Engineer", "Vue Developer"],
+    ("Data & Analytics", "Data Science"): ["Data Scientist", "Machine Learning Scientist", "Applied Scientist"],
+    ("Design", "Product Design"): ["Product Designer", "UX Designer", "Interaction Designer"],
+    ("Sales", "Account Executive"): ["Account Executive", "Enterprise Account Executive", "Sales Executive"],
+}
+
+
+def _examples():
+    return [(f"{level}{role}", category, subcategory)
+            for (category, subcategory), roles in ROLES.items()
+            for role in roles for level in SENIORITY]
+
+
+class TestTitleClassifier:
+    """Tests for TitleClassifier."""
+
+    def test_features_ignore_case_and_punctuation(self):
+        """Test equivalent spellings of a title hash to the same features."""
+        assert title_features("Senior Backend-Engineer") == title_features("senior backend engineer")
+        assert title_features("") == title_features("  ")
+
+    def test_predicts_unseen_titles(self):
+        """Test titles outside the training set land in the right class."""
+        model = TitleClassifier.train(_examples())
+
+        assert model.predict("Backend Engineer II").subcategory == "Backend"
+        assert model.predict("Senior React Engineer").subcategory == "Frontend"
+        assert model.predict("Head of Product Design").category == "Design"
+
+    def test_calibration_follows_held_out_accuracy(self):
+        """Test noisier held-out labels fit a higher temperature, i.e. lower confidence."""
+        examples = _examples()
+        model = TitleClassifier.train(examples[::2])
+        held_out = examples[1::2]
+        noisy = [(title, "Design", "Product Design") if i % 4 == 0 else (title, category, subcategory)
+                 for i, (title, category, subcategory) in enumerate(held_out)]
+
+        clean_temperature = model.calibrate(held_out)
+        assert model.calibrate(noisy) > clean_temperature
+
+    def test_train_from_examples(self):
+        """Test the held-out evaluation reports accuracy and avoided calls."""
+        model, evaluation = train_from_examples(_examples(), threshold=0.5)
+
+        assert len(model.labels) == len(ROLES)
+        assert evaluation.accuracy > 0.8
+        assert evaluation.avoided_ratio > 0
+        assert evaluate(model, [("Backend Engineer", "Design", "Product Design")]).accuracy == 0
+
+    def test_save_and_load(self, tmp_path):
+        """Test a saved model predicts the same after loading."""
+        path = str(tmp_path / "model.json")
+        model = TitleClassifier.train(_examples(), "v1", temperature=3.0)
+        model.save(path)
+        loaded = TitleClassifier.load(path)
+
+        assert loaded.taxonomy_version == "v1"
+        assert loaded.predict("Data Scientist") == model.predict("Data Scientist")
+
+
+class TestClassifyJobLocally:
+    """Tests for the local title model in classify_job."""
+
+    def _install(self, monkeypatch, tmp_path, taxonomy_version=TAXONOMY_VERSION):
+        path = str(tmp_path / "model.json")
+        TitleClassifier.train(_examples(), taxonomy_version, temperature=1.0).save(path)
+        monkeypatch.setattr(title_classifier, "TITLE_MODEL_PATH", path)
+
+    @patch("openjobs.processor._call_gemini")
+    def test_confident_title_skips_gemini(self, mock_gemini, monkeypatch, tmp_path):
+        """Test a title the model is sure of is classified without a call."""
+        self._install(monkeypatch, tmp_path)
+
+        result = classify_job("Senior Backend Engineer")
+
+        mock_gemini.assert_not_called()
+        assert result == {"category": "Software Engineering", "subcategory": "Backend",
+                          "similar_job_title": "Senior Backend Engineer"}
+        assert title_classifier.stats == {"local": 1, "deferred": 0}
+
+    @patch("openjobs.processor._call_gemini")
+    def test_unsure_title_defers_to_gemini(self, mock_gemini, monkeypatch, tmp_path):
+        """Test a title below the threshold is still sent to Gemini."""
+        self._install(monkeypatch, tmp_path)
+        monkeypatch.setattr(title_classifier, "LOCAL_CLASSIFIER_THRESHOLD", 1.01)
+        mock_gemini.return_value = {"category": "Design", "subcategory": "Other", "similar_job_title": "Designer"}
+
+        assert classify_job("Senior Backend Engineer")["category"] == "Design"
+        assert title_classifier.stats == {"local": 0, "deferred": 1}
+
+    @patch("openjobs.processor._call_gemini")
+    def test_local_labels_are_not_training_data(self, mock_gemini, monkeypatch, tmp_path):
+        """Test a locally classified job is cached without counting as a Gemini label or saved call."""
+        self._install(monkeypatch, tmp_path)
+        cache = EnrichmentCache()
+        job = {"title": "Senior Backend Engineer", "job_url": "https://acme.com/jobs/1"}
+
+        process_job(job, fields=["category", "subcategory"], cache=cache)
+        process_job(job, fields=["category", "subcategory"], cache=cache)
+
+        mock_gemini.assert_not_called()
+        assert cache.stats["hits"] == 1 and cache.stats["saved_calls"] == 0
+        assert list(cache.labelled_titles(TAXONOMY_VERSION)) == []
+
+    @patch("openjobs.processor._call_gemini")
+    def test_other_taxonomy_is_ignored(self, mock_gemini, monkeypatch, tmp_path):
+        """Test a model trained on an older taxonomy is not used."""
+        self._install(monkeypatch, tmp_path, taxonomy_version="old")
+        mock_gemini.return_value = {"category": "Design", "subcategory": "Other", "similar_job_title": "Designer"}
+
+        classify_job("Senior Backend Engineer")
+
+        mock_gemini.assert_called_once()
+
+
+def test_training_script(tmp_path, capsys):
+    """Test the script trains from cached Gemini labels and reports avoided calls."""
+    cache_path = str(tmp_path / "enrichment.db")
+    cache = EnrichmentCache(cache_path)
+    for i, (title, category, subcategory) in enumerate(_examples()):
+        cache.put(f"k{i}", {"category": category, "subcategory": subcategory}, api_calls=2,
+                  taxonomy_version=TAXONOMY_VERSION, title=title)
+    cache.put("stale", {"category": "Design", "subcategory": "Other"}, api_calls=2,
+              taxonomy_version="old", title="Backend Engineer")
+
+    out = str(tmp_path / "model.json")
+    main(["--cache", cache_path, "--out", out])
+
+    report = capsys.readouterr().out
+    assert f"Trained on {len(_examples())} titles" in report
+    assert "Calls avoided at 0.90" in report
+    assert TitleClassifier.load(out).taxonomy_version == TAXONOMY_VERSION
@@ -0,0 +1,126 @@
+"""Tests for openjobs.url_rules module."""
+
+import json
+
+import pytest
+from openjobs.url_rules import (
+    DEFAULT_RULES_PATH,
+    DEFAULT_URL_RULES,
+    UrlClassifier,
+    classify_url,
+    load_url_rules,
+    WAIT_TIER_DEFAULT,
+    WAIT_TIER_SLOW,
+)
+
+
+class TestClassifyUrl:
+    """Tests for classify_url with the packaged rules."""
+
+    def test_plain_careers_page(self):
+        """Test an ordinary careers page is not skipped."""
+        result = classify_url("https://example.com/about")
+        assert result.skip is False
+        assert result.wait_tier == WAIT_TIER_DEFAULT
+        assert result.needs_scroll is False
+
+    def test_skip_domain(self):
+        """Test blocked domains are skipped."""
+        result = classify_url("https://www.linkedin.com/company/acme/jobs")
+        assert result.skip is True
+        assert result.skip_reason == "linkedin.com"
+
+    def test_skip_domain_in_query_string_not_skipped(self):
+        """Test a blocked domain in the query string does not block the page."""
+        result = classify_url("https://acme.com/careers?ref=linkedin.com")
+        assert result.skip is False
+
+    def test_skip_domain_requires_label_boundary(self):
+        """Test suffix matching respects label boundaries."""
+        assert classify_url("https://notlinkedin.com/jobs").skip is False
+
+    def test_skip_extension(self):
+        """Test file extensions are matched on the path only."""
+        assert classify_url("https://example.com/files/job.PDF").skip_reason == ".pdf"
+        assert classify_url("https://example.com/careers?file=x.pdf").skip is False
+
+    def test_workday_subdomain_skipped(self):
+        """Test Workday-hosted job boards are skipped."""
+        assert classify_url("https://acme.wd5.myworkdayjobs.com/en-US/careers").skip is True
+
+    def test_slow_domain(self):
+        """Test ATS domains get the slow wait tier."""
+        assert classify_url("https://jobs.lever.co/acme").wait_tier == WAIT_TIER_SLOW
+        assert classify_url("https://boards.greenhouse.io/acme").wait_tier == WAIT_TIER_SLOW
+
+    def test_slow_subdomain(self):
+        """Test careers./jobs. subdomains get the slow wait tier."""
+        assert classify_url("https://careers.acme.com/").wait_tier == WAIT_TIER_SLOW
+        assert classify_url("https://acme.com/careers.html").wait_tier == WAIT_TIER_DEFAULT
+
+    def test_heavy_spa_needs_scroll(self):
+        """Test heavy SPA hosts need scroll actions."""
+        assert classify_url("https://retool.com/careers").needs_scroll is True
+        assert classify_url("https://example.com/retool").needs_scroll is False
+
+    def test_trailing_dot_host(self):
+        """Test fully qualified hostnames match their bare form."""
+        assert classify_url("https://linkedin.com./x").skip_reason == "linkedin.com"
+
+    def test_url_without_scheme(self):
+        """Test URLs without scheme are classified by host."""
+        assert classify_url("linkedin.com/jobs").skip is True
+
+
+class TestUrlClassifier:
+    """Tests for building classifiers from rules."""
+
+    def test_custom_rules(self):
+        """Test a classifier built from explicit rules."""
+        classifier = UrlClassifier({
+            "skip": {"domains": ["example.org"], "extensions": ["doc"]},
+            "heavy_spa": {"host_keywords": ["spa"]},
+        })
+        assert classifier.classify("https://sub.example.org/").skip_reason == "example.org"
+        assert classifier.classify("https://x.com/cv.doc").skip_reason == ".doc"
+        assert classifier.classify("https://myspa.io/jobs").needs_scroll is True
+
+    def test_filter(self):
+        """Test filter yields only scrapable URLs."""
+        classifier = UrlClassifier({"skip": {"domains": ["indeed.com"]}})
+        urls = ["https://indeed.com/q", "https://acme.com/jobs", "", "https://de.indeed.com/"]
+        assert list(classifier.filter(urls)) == ["https://acme.com/jobs"]
+
+    def test_load_rules_from_file(self, tmp_path):
+        """Test rules can be loaded from a config file."""
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({"skip": {"domains": ["blocked.test"]}}))
+
+        classifier = UrlClassifier.from_config(str(path))
+
+        assert classifier.classify("https://blocked.test/careers").skip is True
+        assert classifier.classify("https://linkedin.com/").skip is False
+
+    def test_load_rules_missing_file_uses_defaults(self, tmp_path):
+        """Test a missing rules file falls back to built-in defaults."""
+        rules = load_url_rules(str(tmp_path / "missing.json"))
+        classifier = UrlClassifier(rules)
+
+        assert classifier.classify("https://example.com/x.pdf").skip is True
+        assert classifier.classify("https://acme.wd1.myworkdayjobs.com/jobs").skip is True
+        assert classifier.classify("https://jobs.lever.co/acme").wait_tier == WAIT_TIER_SLOW
+
+    def test_defaults_match_packaged_config(self):
+        """Test built-in defaults stay in sync with config/url_rules.json."""
+        with open(DEFAULT_RULES_PATH) as f:
+            assert json.load(f) == DEFAULT_URL_RULES
+
+
+@pytest.mark.parametrize("url", [
+    "https://facebook.com/acme",
+    "https://uk.indeed.com/jobs",
+    "https://example.com/static/app.js",
+])
+def test_packaged_skip_rules(url):
+    """Test packaged skip rules cover former substring patterns."""
+    assert classify_url(url).skip is True